@@ -0,0 +1,112 @@
+"""
+Micro-benchmark of the per-call overhead of the P4ConnectionManager
+wrapped (`_connect_` prefixed) methods.
+
+The server is replaced by an in-process fake connection, so the timings
+only include the python dispatch overhead (attribute lookup, argument
+processing, connection leasing and result handling), not p4 latency.
+
+Requires `p4python` and `qtpy` (as installed in the AYON tray), usage:
+
+```
+python benchmarks/p4_call_overhead.py [--client-dir path/to/client] [--number 100000]
+```
+
+Pass the `client` dir of another checkout to compare against it.
+"""
+import argparse
+import os
+import socket
+import sys
+import timeit
+import types
+
+
+CURRENT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeP4:
+    """In process stand-in for a connected P4.P4 instance."""
+
+    def __init__(self):
+        self.client = "benchmark_ws"
+        self.progress = None
+        self.errors = []
+        self.warnings = []
+
+    def connected(self):
+        return True
+
+    def run_clients(self, *args):
+        return [{"client": self.client, "Host": socket.gethostname(), "Root": "", "Stream": ""}]
+
+    def run_info(self):
+        return [{"clientRoot": ""}]
+
+    def run(self, cmd, *args, **kwargs):
+        return [{"cmd": cmd}]
+
+
+class FakeConnectionPool:
+    def __init__(self):
+        self.template = FakeP4()
+        self._p4 = FakeP4()
+
+    def acquire(self):
+        return self._p4
+
+    def release(self, p4, discard=False):
+        pass
+
+
+def import_api(client_dir):
+    # Import the api without the addon's package init, as that requires
+    # the rest of AYON which is not needed to run the api:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, client_dir)
+    package = types.ModuleType("version_control")
+    package.__path__ = [os.path.join(client_dir, "version_control")]
+    sys.modules["version_control"] = package
+
+    from version_control.backends.perforce import api
+    return api
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--client-dir", default=os.path.join(CURRENT_ROOT, "client"))
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    api = import_api(os.path.abspath(args.client_dir))
+    manager = api.P4ConnectionManager()
+    manager._connection_pool = FakeConnectionPool()
+    manager.get_info()
+
+    def _direct():
+        manager._connect_run_command("info")
+
+    def _wrapped_no_args():
+        manager.get_info()
+
+    def _wrapped_with_args():
+        manager.run_command("info")
+
+    print(f"client dir: {args.client_dir}")
+    manager._p4 = manager._connection_pool.acquire()
+    direct = timeit.timeit(_direct, number=args.number) / args.number
+    manager._p4 = None
+    print(f"{'direct _connect_run_command':<32}{direct * 1e6:8.2f} us/call")
+    for name, function in (
+        ("get_info()", _wrapped_no_args),
+        ("run_command('info')", _wrapped_with_args),
+    ):
+        duration = timeit.timeit(function, number=args.number) / args.number
+        print(
+            f"{name:<32}{duration * 1e6:8.2f} us/call "
+            f"({(duration - direct) * 1e6:.2f} us overhead)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Scale benchmark of the `get_stat` and `get_latest` recovery paths, which
+remap the results when some of the queried files don't exist on the server.
+
+The server is replaced by an in-process fake connection that reports every
+other path as missing, so the timings only include the python remapping.
+The remapped results are checked by `tests/test_p4_missing_paths.py`.
+
+Requires `p4python` and `qtpy` (as installed in the AYON tray), usage:
+
+```
+python benchmarks/p4_missing_paths.py [--client-dir path/to/client] [--count 20000]
+```
+
+Pass the `client` dir of another checkout to compare against it.
+"""
+import argparse
+import os
+import sys
+import time
+import types
+
+
+CURRENT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_api(client_dir):
+    # Import the api without the addon's package init, as that requires
+    # the rest of AYON which is not needed to run the api:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, client_dir)
+    package = types.ModuleType("version_control")
+    package.__path__ = [os.path.join(client_dir, "version_control")]
+    sys.modules["version_control"] = package
+
+    from version_control.backends.perforce import api
+    return api
+
+
+def make_fake_p4(p4_exception, missing_paths):
+    class FakeP4:
+        """In process stand-in for a connected P4.P4 instance."""
+
+        def __init__(self):
+            self.client = "benchmark_ws"
+            self.errors = []
+            self.warnings = []
+
+        def _flatten(self, args):
+            for arg in args:
+                if isinstance(arg, (list, tuple)):
+                    yield from self._flatten(arg)
+                else:
+                    yield arg
+
+        def run_fstat(self, *args):
+            paths = [arg for arg in self._flatten(args) if not arg.startswith("-")]
+            self.warnings = [f"{path} - no such file(s)." for path in paths if path in missing_paths]
+            if self.warnings:
+                raise p4_exception("no such file(s).")
+
+            return [{"depotFile": path} for path in paths]
+
+        def run_sync(self, *args):
+            paths = [arg for arg in self._flatten(args) if not arg.startswith("-")]
+            self.warnings = [
+                f"{path} - no such file(s)." if path in missing_paths else f"{path} - file(s) up-to-date."
+                for path in paths
+            ]
+            raise p4_exception("no such file(s).")
+
+    return FakeP4()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--client-dir", default=os.path.join(CURRENT_ROOT, "client"))
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+
+    api = import_api(os.path.abspath(args.client_dir))
+    import P4
+
+    paths = tuple(f"//benchmark/file_{index}.ma" for index in range(args.count))
+    missing_paths = set(paths[::2])
+    manager = api.P4ConnectionManager()
+    manager._p4 = make_fake_p4(P4.P4Exception, missing_paths)
+
+    print(f"client dir: {args.client_dir}")
+    print(f"paths: {len(paths)} ({len(missing_paths)} missing)")
+
+    start = time.perf_counter()
+    manager._run_fstat(paths, [])
+    duration = time.perf_counter() - start
+    print(f"{'_run_fstat':<24}{duration * 1e3:10.2f} ms")
+
+    start = time.perf_counter()
+    manager._connect_get_latest(paths)
+    duration = time.perf_counter() - start
+    print(f"{'_connect_get_latest':<24}{duration * 1e3:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Benchmark of the encodings of the tray bridge's responses, for a
+`get_changes` response of 100k change lists.
+
+Each encoding is timed on its own (encode, decode and size) and end to
+end, through an aiohttp server on localhost and a `requests` session as
+used by `PerforceRestStub`, where the server encodes the response for
+every call. `json indent=4` is the encoding used before content
+negotiation was added. msgpack and orjson are used when installed.
+
+Requires `aiohttp` and `requests` (as installed in the AYON tray), usage:
+
+```
+python benchmarks/rest_encoding.py [--changes 100000] [--number 5]
+```
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+
+import requests
+from aiohttp import web
+
+
+CURRENT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_rest_encoding(client_dir):
+    # Import the module without the addon's package init, as that requires
+    # the rest of AYON which is not needed to encode:
+    sys.path.insert(0, client_dir)
+    package = types.ModuleType("version_control")
+    package.__path__ = [os.path.join(client_dir, "version_control")]
+    sys.modules["version_control"] = package
+
+    from version_control.rest.perforce import rest_encoding
+    return rest_encoding
+
+
+def make_changes(count):
+    # `p4 changes -l` records, as returned by `get_changes`:
+    return [
+        {
+            "change": str(change),
+            "time": str(1600000000 + change * 60),
+            "user": f"user_{change % 50}",
+            "client": f"user_{change % 50}_workspace_{change % 7}",
+            "status": "submitted",
+            "changeType": "public",
+            "path": "//streams/main/...",
+            "desc": f"Change {change}: update assets of shot sh{change % 400:04d}\n",
+        }
+        for change in range(1, count + 1)
+    ]
+
+
+def get_variants(rest_encoding):
+    def _legacy_encode(data):
+        return json.dumps(data, indent=4).encode("utf-8")
+
+    variants = [
+        ("json indent=4 (previous)", _legacy_encode, json.loads, "application/json"),
+        ("json compact", rest_encoding.encode, rest_encoding.decode, rest_encoding.CONTENT_TYPE_JSON),
+    ]
+    if rest_encoding.msgpack is not None:
+        variants.append(
+            (
+                "msgpack",
+                lambda data: rest_encoding.encode(data, rest_encoding.CONTENT_TYPE_MSGPACK),
+                lambda body: rest_encoding.decode(body, rest_encoding.CONTENT_TYPE_MSGPACK),
+                rest_encoding.CONTENT_TYPE_MSGPACK,
+            )
+        )
+    return variants
+
+
+def best_of(function, number):
+    durations = []
+    for _ in range(number):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def start_server(payload, variants, rest_encoding, socket_path):
+    encoders = {name: (encode, content_type) for name, encode, _, content_type in variants}
+
+    async def _handle(request):
+        encode, content_type = encoders[request.match_info["variant"]]
+        body = encode(payload)
+        headers = {}
+        if request.query.get("gzip"):
+            body = gzip.compress(body, compresslevel=rest_encoding.GZIP_LEVEL)
+            headers["Content-Encoding"] = "gzip"
+        return web.Response(body=body, content_type=content_type, headers=headers)
+
+    loop = asyncio.new_event_loop()
+    app = web.Application()
+    app.router.add_route("POST", "/perforce/{variant}", _handle)
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    sites = [web.TCPSite(runner, "localhost", 0)]
+    if socket_path:
+        sites.append(web.UnixSite(runner, socket_path))
+    for site in sites:
+        loop.run_until_complete(site.start())
+
+    port = sites[0]._server.sockets[0].getsockname()[1]
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return port
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--client-dir", default=os.path.join(CURRENT_ROOT, "client"))
+    parser.add_argument("--changes", type=int, default=100000)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    rest_encoding = import_rest_encoding(os.path.abspath(args.client_dir))
+    from version_control.rest.perforce.rest_transport import UnixSocketAdapter
+    from version_control.rest.perforce.rest_transport import is_unix_socket_supported
+
+    payload = make_changes(args.changes)
+    variants = get_variants(rest_encoding)
+    print(f"{args.changes} changes, orjson: {rest_encoding.orjson is not None}, msgpack: {rest_encoding.msgpack is not None}")
+
+    print(f"\n{'encoding':<28}{'size':>10}{'gzipped':>10}{'encode':>10}{'gzip':>10}{'decode':>10}")
+    for name, encode, decode, _ in variants:
+        body = encode(payload)
+        compressed = gzip.compress(body, compresslevel=rest_encoding.GZIP_LEVEL)
+        encode_time = best_of(lambda: encode(payload), args.number)
+        gzip_time = best_of(lambda: gzip.compress(body, compresslevel=rest_encoding.GZIP_LEVEL), args.number)
+        decode_time = best_of(lambda: decode(body), args.number)
+        print(
+            f"{name:<28}{len(body) / 1e6:>8.1f}MB{len(compressed) / 1e6:>8.1f}MB"
+            f"{encode_time * 1e3:>8.0f}ms{gzip_time * 1e3:>8.0f}ms{decode_time * 1e3:>8.0f}ms"
+        )
+
+    socket_path = None
+    if is_unix_socket_supported():
+        socket_path = os.path.join(tempfile.mkdtemp(), "benchmark.sock")
+    port = start_server(payload, variants, rest_encoding, socket_path)
+
+    transports = [("tcp", requests.Session(), f"http://localhost:{port}")]
+    if socket_path:
+        session = requests.Session()
+        session.mount("http+unix://", UnixSocketAdapter(socket_path))
+        transports.append(("unix", session, "http+unix://localhost"))
+
+    print(f"\n{'end to end':<28}{'transport':>10}{'gzip':>8}{'total':>10}")
+    for name, _, decode, _ in variants:
+        for transport, session, url in transports:
+            for compressed in (False, True):
+                def _call():
+                    response = session.post(
+                        f"{url}/perforce/{name}",
+                        params={"gzip": "1"} if compressed else None,
+                        json={},
+                    )
+                    decode(response.content)
+
+                duration = best_of(_call, args.number)
+                print(f"{name:<28}{transport:>10}{str(compressed):>8}{duration * 1e3:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
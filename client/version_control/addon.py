@@ -92,7 +92,8 @@ class VersionControlAddon(AYONAddon, ITrayService, IPluginPaths):
             "port": version_settings["port"],
             "username": local_setting["username"],
             "password": local_setting["password"],
-            "workspace_name": workspace_name
+            "workspace_name": workspace_name,
+            "parallel_sync": version_settings.get("parallel_sync")
         }
 
     def sync_to_version(self, conn_info, change_id):
@@ -105,7 +106,8 @@ class VersionControlAddon(AYONAddon, ITrayService, IPluginPaths):
                                password=conn_info["password"],
                                workspace=conn_info["workspace_dir"])
         PerforceRestStub.sync_to_version(
-            f"{conn_info['workspace_dir']}/...", change_id)
+            f"{conn_info['workspace_dir']}/...", change_id,
+            parallel=conn_info.get("parallel_sync"))
         return
 
     def tray_exit(self):
@@ -15,6 +15,7 @@ _typing = False
 if _typing:
     import datetime
 
+    from typing import Any
     from typing import Callable
     from typing import Sequence
     from typing import Union
@@ -286,6 +287,12 @@ class VersionControl(ABC):
         # type: (T_P4PATH) -> bool
         raise NotImplementedError()
 
+    @staticmethod
+    @abstractmethod
+    def get_folder_freshness(path):
+        # type: (T_P4PATH) -> dict[str, Any] | None
+        raise NotImplementedError()
+
     @staticmethod
     @abstractmethod
     def is_checkedout(path):
@@ -306,14 +313,14 @@ class VersionControl(ABC):
 
     @staticmethod
     @abstractmethod
-    def sync_latest_version(path):
-        # type: (T_P4PATH) -> bool
+    def sync_latest_version(path, parallel=None):
+        # type: (T_P4PATH, dict[str, Any] | bool | None) -> bool
         raise NotImplementedError()
 
     @staticmethod
     @abstractmethod
-    def sync_to_version(path, version):
-        # type: (T_P4PATH, int) -> bool
+    def sync_to_version(path, version, parallel=None):
+        # type: (T_P4PATH, int, dict[str, Any] | bool | None) -> bool
         raise NotImplementedError()
 
     @staticmethod
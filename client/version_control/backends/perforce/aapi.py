@@ -0,0 +1,189 @@
+"""
+An asyncio facade over the P4 api, for use from the tray's aiohttp routes.
+
+Each call runs on a dedicated thread pool rather than the event loop, and
+long transfers (syncs and submits) run on a pool of their own, so cheap
+status queries stay responsive whilst a multi-GB sync is running.
+Cancelling an awaited call, or it timing out, cancels the running p4
+command as well:
+
+```
+from version_control.backends.perforce import aapi
+
+result = await aapi.get_latest(paths)
+result = await aapi.is_latest(path, timeout=10)
+result = await aapi.run(VersionControlPerforce.sync_to_version, path, version)
+```
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import functools
+import threading
+
+from . import api
+
+_typing = False
+if _typing:
+    from typing import Any
+    from typing import Callable
+    from typing import Union
+del _typing
+
+
+# The number of P4 calls that can run at the same time on each pool, their
+# sum should not exceed the max size of the p4 connection pool:
+QUERY_WORKER_COUNT = 4
+TRANSFER_WORKER_COUNT = 2
+
+# Calls that can transfer large amounts of data, which
+# run on the transfer pool rather than the query pool:
+TRANSFER_FUNCTIONS = frozenset(
+    (
+        "get_latest",
+        "get_revision",
+        "submit_change_list",
+        "sync",
+        "sync_latest_version",
+        "sync_to_version",
+        "unsync",
+    )
+)
+
+# Api attributes that can't be called through the facade:
+_EXCLUDED_ATTRIBUTES = frozenset(
+    (
+        "P4ConnectionManager",
+        "P4ParallelSync",
+        "P4PathDateData",
+        "cancellable",
+        "exceptions",
+        "holding_connection",
+        "host_name",
+        "is_offline",
+        "iter_files",
+        "iter_stat",
+        "iter_sync",
+        "using_progress",
+        "workspace_as",
+    )
+)
+
+_executors: dict[bool, concurrent.futures.ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _get_executor(transfer: bool) -> concurrent.futures.ThreadPoolExecutor:
+    with _executors_lock:
+        executor = _executors.get(transfer)
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=TRANSFER_WORKER_COUNT if transfer else QUERY_WORKER_COUNT,
+                thread_name_prefix="P4TransferWorker" if transfer else "P4QueryWorker",
+            )
+            _executors[transfer] = executor
+
+    return executor
+
+
+def _run_cancellable(
+    function: Union[str, Callable[..., Any]], event: threading.Event, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> Any:
+    # Each worker thread has its own P4ConnectionManager and the module
+    # level api attributes are bound to the calling thread's manager,
+    # so api functions given by name must be looked up in the worker:
+    manager = api._get_connection_manager()
+    if isinstance(function, str):
+        function = getattr(manager, function)
+
+    with manager.cancellable(event):
+        return function(*args, **kwargs)
+
+
+async def run(
+    function: Union[str, Callable[..., Any]],
+    *args: Any,
+    timeout: float | None = None,
+    transfer: bool | None = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Run the blocking `function` (or the api function of that name)
+    on the worker pools, returning its result.
+
+    If `timeout` is given and the call has not finished within that many
+    seconds, the p4 command is cancelled and `asyncio.TimeoutError` is raised.
+    `transfer` chooses the pool to run on, by default calls in
+    `TRANSFER_FUNCTIONS` run on the transfer pool.
+    """
+
+    if transfer is None:
+        name = function if isinstance(function, str) else getattr(function, "__name__", "")
+        transfer = name in TRANSFER_FUNCTIONS
+
+    event = threading.Event()
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(
+        _get_executor(transfer), functools.partial(_run_cancellable, function, event, args, kwargs)
+    )
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        # The executor can't interrupt a running call,
+        # so cancel its p4 command instead:
+        event.set()
+        raise
+
+
+def submit(
+    function: Union[str, Callable[..., Any]],
+    *args: Any,
+    event: threading.Event | None = None,
+    transfer: bool | None = None,
+    **kwargs: Any,
+) -> concurrent.futures.Future:
+    """
+    Start the blocking `function` (or the api function of that name) on the
+    worker pools without awaiting it, i.e. for long running jobs.
+    Setting `event` cancels the running p4 command.
+    """
+
+    if transfer is None:
+        name = function if isinstance(function, str) else getattr(function, "__name__", "")
+        transfer = name in TRANSFER_FUNCTIONS
+
+    return _get_executor(transfer).submit(
+        _run_cancellable, function, event or threading.Event(), args, kwargs
+    )
+
+
+def shutdown() -> None:
+    """
+    Shut down the worker pools, cancelling any calls that haven't started.
+    """
+
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        _executors.clear()
+
+
+def __getattr__(attribute_name: str) -> Callable[..., Any]:
+    """
+    Get an async version of the api function of the given name,
+    that takes an additional `timeout` keyword argument.
+    """
+
+    if attribute_name.startswith("_") or attribute_name in _EXCLUDED_ATTRIBUTES or attribute_name not in api.__all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {attribute_name!r}")
+
+    async def _call(*args: Any, timeout: float | None = None, **kwargs: Any) -> Any:
+        return await run(attribute_name, *args, timeout=timeout, **kwargs)
+
+    _call.__name__ = _call.__qualname__ = attribute_name
+    return _call
+
+
+__all__ = ("run", "submit", "shutdown", "QUERY_WORKER_COUNT", "TRANSFER_WORKER_COUNT", "TRANSFER_FUNCTIONS")
@@ -18,15 +18,23 @@ from qtpy import QtCore
 import socket
 import sys
 import threading
+import time
 import typing
 
+from . import p4_cache
+from . import p4_change_index
+from . import p4_client_view
+from . import p4_describe_cache
 from . import p4_errors
+from . import p4_freshness
+from . import p4_pool
+from . import p4_progress
+from . import p4_stream
+from . import p4_workspace_index
 #from . import p4_offline
 import P4
 
 from contextlib import contextmanager
-from functools import lru_cache
-from types import MethodType
 
 _typing = False
 if _typing:
@@ -77,6 +85,17 @@ class P4ProgressSignaller(QtCore.QObject):
 
 
 class P4ProgressHandler(P4.Progress):
+    """
+    A `P4.Progress` that feeds a `P4ProgressAggregator`, rather than
+    signalling every update: P4 reports every position change, which
+    on large syncs would flood the Qt event loop.
+
+    The signals of the `signaller` are emitted from the aggregated
+    snapshots, at most `max_rate` times per second. Consumers without
+    a Qt object can subscribe to the `aggregator` instead, in which
+    case the signaller is never created.
+    """
+
     TYPES = ["Unknown", "Submit", "Sync", "Clone"]
 
     def __init__(
@@ -85,14 +104,21 @@ class P4ProgressHandler(P4.Progress):
         total_set_fn: Callable[[int], None] | None = None,
         updated_fn: Callable[[int], None] | None = None,
         completed_fn: Callable[[str, int], None] | None = None,
+        aggregator: p4_progress.P4ProgressAggregator | None = None,
+        max_rate: float = p4_progress.DEFAULT_MAX_RATE,
     ):
         super().__init__()
 
         self._signaller = None
-        self._current_file = ""
+        self._signalled_description: tuple[str, int] | None = None
+        self._signalled_total: int | None = None
+        self._signalled_failed = 0
+
+        self.aggregator = aggregator if aggregator is not None else p4_progress.P4ProgressAggregator(max_rate)
+        self.aggregator.subscribe(self._on_snapshot)
 
-        signaller = self.signaller
-        if signaller:
+        if started_fn or total_set_fn or updated_fn or completed_fn:
+            signaller = self.signaller
             signaller.started.connect(started_fn) if started_fn else None
             signaller.total_set.connect(total_set_fn) if total_set_fn else None
             signaller.updated.connect(updated_fn) if updated_fn else None
@@ -109,20 +135,51 @@ class P4ProgressHandler(P4.Progress):
 
     def setDescription(self, description: str, units: int):
         super().setDescription(description, units)
-        self._current_file = description
-        self.signaller.started.emit(description, units)
+        self.aggregator.started(description, units)
 
     def setTotal(self, total: int):
         super().setTotal(total)
-        self.signaller.total_set.emit(total)
+        self.aggregator.set_total(total)
 
     def update(self, position: int):
         super().update(position)
-        self.signaller.updated.emit(position)
+        self.aggregator.update(position)
 
     def done(self, fail: int):
         super().done(fail)
-        self.signaller.completed.emit(self._current_file, fail)
+        self.aggregator.completed(fail)
+
+    def flush(self) -> p4_progress.P4ProgressSnapshot | None:
+        """
+        Publish the progress held back by the rate limit, i.e. once the command has finished.
+        """
+
+        return self.aggregator.flush()
+
+    def _on_snapshot(self, snapshot: p4_progress.P4ProgressSnapshot) -> None:
+        signaller = self._signaller
+        if signaller is None:
+            return
+
+        # Only the latest of the progresses started since the last snapshot is signalled:
+        if snapshot.started_delta:
+            description = (snapshot.description, snapshot.units)
+            if description != self._signalled_description:
+                self._signalled_description = description
+                self._signalled_total = None
+                signaller.started.emit(*description)
+
+        if snapshot.total and snapshot.total != self._signalled_total:
+            self._signalled_total = snapshot.total
+            signaller.total_set.emit(snapshot.total)
+
+        if snapshot.delta:
+            signaller.updated.emit(snapshot.position)
+
+        if snapshot.completed_delta:
+            fail = int(snapshot.failed > self._signalled_failed)
+            self._signalled_failed = snapshot.failed
+            signaller.completed.emit(snapshot.description, fail)
 
     def _get_signaller(self) -> P4ProgressSignaller:
         return P4ProgressSignaller()
@@ -133,6 +190,66 @@ class P4ConnectionManagerSignaller(QtCore.QObject):
     disconnected = QtCore.Signal()
 
 
+class _ConnectMethod:
+    """
+    Descriptor exposing a `_connect_` prefixed method without its prefix,
+    wrapped with `P4ConnectionManager.__run_connect__`.
+
+    The signature of the method is inspected once, when the class is
+    created, and the wrapped method is bound and cached on the instance
+    the first time it is accessed, so later access is a plain
+    instance attribute lookup.
+    """
+
+    __slots__ = ("function", "name", "path_index")
+
+    def __init__(self, function: Callable[..., Any], name: str):
+        self.function = function
+        self.name = name
+        self.path_index = self._get_path_index(function)
+
+    @staticmethod
+    def _get_path_index(function: Callable[..., Any]) -> int | None:
+        """
+        Get the index of the `path` argument, excluding `self`.
+        Path pre processing is only run on functions with a `path` argument.
+        """
+
+        arg_names = tuple(inspect.signature(function).parameters)[1:]
+        if "path" not in arg_names:
+            return None
+
+        return arg_names.index("path")
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        wrapped = instance.__run_connect__(self.function.__get__(instance, owner), self.path_index)
+        instance.__dict__[self.name] = wrapped
+        return wrapped
+
+
+class _P4ConnectionManagerMeta(type):
+    """
+    Metaclass that exposes every `_connect_` prefixed method of the class
+    as a `_ConnectMethod` without the prefix, i.e. `_connect_sync` as `sync`.
+    """
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        for attribute_name, attribute in tuple(namespace.items()):
+            if not attribute_name.startswith("_connect_") or not inspect.isfunction(attribute):
+                continue
+
+            public_name = attribute_name.replace("_connect_", "", 1)
+            if public_name in namespace:
+                continue
+
+            namespace[public_name] = _ConnectMethod(attribute, public_name)
+
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+
 @dataclasses.dataclass(frozen=False)
 class P4PathDateData:
     path: pathlib.Path | None = None
@@ -143,7 +260,60 @@ class P4PathDateData:
         self.date = date
 
 
-class P4ConnectionManager:
+@dataclasses.dataclass
+class P4ParallelSync:
+    """
+    The options of `p4 sync --parallel`, which transfers files over
+    multiple threads. Requires `net.parallel.max` to be set on the server.
+
+    - `threads`: The number of threads to transfer files on, less than 2 disables parallel sync.
+    - `batch`: The number of files transferred per batch.
+    - `batch_size`: The number of bytes transferred per batch, 0 uses the server default.
+    - `min_size`: The minimum number of bytes a sync must transfer to run in parallel,
+        0 uses the server default.
+    """
+
+    enabled: bool = False
+    threads: int = 4
+    batch: int = 8
+    batch_size: int = 0
+    min_size: int = 0
+
+    @classmethod
+    def from_value(cls, value: P4ParallelSync | dict[str, Any] | bool | None) -> P4ParallelSync | None:
+        """
+        Get the parallel sync options from a settings dict (i.e. the
+        `parallel_sync` project settings) or a bool to enable or disable
+        parallel sync with the default options.
+        """
+
+        if value is None or isinstance(value, cls):
+            return value
+
+        if isinstance(value, bool):
+            return cls(enabled=value)
+
+        fields = {field.name for field in dataclasses.fields(cls)}
+        options = {key: _value for key, _value in value.items() if key in fields}
+        options.setdefault("enabled", True)
+        return cls(**options)
+
+    def to_arg(self) -> str | None:
+        if not self.enabled or self.threads < 2:
+            return None
+
+        options = [f"threads={self.threads}"]
+        if self.batch > 0:
+            options.append(f"batch={self.batch}")
+        if self.batch_size > 0:
+            options.append(f"batchsize={self.batch_size}")
+        if self.min_size > 0:
+            options.append(f"minsize={self.min_size}")
+
+        return f"--parallel={','.join(options)}"
+
+
+class P4ConnectionManager(metaclass=_P4ConnectionManagerMeta):
     """
     This class is the core of this module.
 
@@ -154,25 +324,33 @@ class P4ConnectionManager:
     mechanisms to reduce boiler plate code.
     The main mechanism is the handling of methods
     which require a p4 connection.
-    Any attribute that both has `_connect_` as a prefix
-    and is a method, will lazily wrap said method with
-    `__run_connect__` and remove the `_connect_` prefix.
+    Any method that has `_connect_` as a prefix is exposed
+    without the prefix, wrapped with `__run_connect__`.
+    This is done once, when the class is created, by
+    `_P4ConnectionManagerMeta`.
 
     For example: `_connect_sync` will be accessed with `sync`.
 
     This offers multiple benefits:
 
     - core methods are marked as private.
-    - wrapping of methods is handled lazily, thus is performant.
+    - the wrapper's argument metadata is computed once per class
+      and the wrapped method is bound once per instance, thus is performant.
     - reduced verbosity of calling core method names.
 
+    It is recommended to use the full method name when
+    calling from within the object (include `_connect_` prefix).
+    This avoids unneccesary connection checks, providing a slight
+    performance boost. I.E:
+    `self._connect_checkout` rather than `self.checkout`
+
     The `__run_connect__` wrapper works in conjunction with the
-    `__connect__` context manager to automatically manage the
-    p4.connect and p4.disconnect functionality.
+    `__connect__` context manager to automatically lease a connected
+    p4 instance from the manager's `P4ConnectionPool` and hand it
+    back once the outermost call has finished.
     This is especially useful for nested `_connect_`
-    method calls, as P4Python throws an exception if
-    `p4.connect()` is called when an connection is already
-    active.
+    method calls, as they share the same leased connection, and avoids
+    paying for a connection handshake on every top level call.
 
     # *** Any method that requires a connection to p4,
     # must be declared with the prefix: `_connect_` ***
@@ -188,8 +366,42 @@ class P4ConnectionManager:
     `p4.client` be their standard workspace, BUT if it fails, then
     the function will be run on all the other workspaces until it
     either succeeds or there are no workspaces left.
+
+    If a batch of paths spans multiple workspaces, and the function
+    returns a result per path (see `_path_aligned_functions`), the
+    paths are instead grouped by the workspace that owns them and
+    the function is run once per workspace, merging the results.
     """
 
+    # The functions that return a result per given path (in the same order),
+    # so a batch of paths that spans multiple workspaces can be run once
+    # per workspace, then merged back together:
+    _path_aligned_functions = frozenset(
+        (
+            "_connect_checked_out_by",
+            "_connect_exists_on_server",
+            "_connect_get_attribute",
+            "_connect_get_current_client_revision",
+            "_connect_get_current_revision_info",
+            "_connect_get_current_server_revision",
+            "_connect_get_folder_freshness",
+            "_connect_get_latest",
+            "_connect_get_local_path",
+            "_connect_get_path_info",
+            "_connect_get_path_locations",
+            "_connect_get_stat",
+            "_connect_get_version_info",
+            "_connect_is_checked_out",
+            "_connect_is_checked_out_by_user",
+            "_connect_is_latest",
+            "_connect_sync",
+        )
+    )
+
+    # Seconds the clients of the user are kept for, before they're listed
+    # again to pick up workspaces that were created or changed elsewhere:
+    clients_cache_ttl: float = 300.0
+
     # Magic Methods:
     def __init__(
         self,
@@ -197,13 +409,33 @@ class P4ConnectionManager:
         started_fn: Callable[[str, int], None] | None = None,
         total_set_fn: Callable[[int], None] | None = None,
         updated_fn: Callable[[int], None] | None = None,
-        completed_fn: Callable[[str, int], None] | None = None
+        completed_fn: Callable[[str, int], None] | None = None,
+        connection_pool: p4_pool.P4ConnectionPool | None = None,
+        stat_cache: p4_cache.P4StatCache | None = None,
+        workspace_index: p4_workspace_index.P4WorkspaceRootIndex | None = None,
+        client_views: p4_client_view.P4ClientViewCache | None = None,
+        change_index: p4_change_index.P4PendingChangeIndex | None = None,
+        change_files_cache: p4_describe_cache.P4ChangeFilesCache | None = None,
+        parallel_sync: P4ParallelSync | None = None,
     ):
 
         super().__init__()
 
         self._p4 = None
+        self._connection_pool = connection_pool or p4_pool.P4ConnectionPool()
+        # The stat cache is shared by all managers by default, so a file
+        # modified via one manager can't leave stale results in another:
+        self._stat_cache = stat_cache or _stat_cache
+        self._workspace_index = workspace_index or _workspace_index
+        self._client_views = client_views or _client_views
+        self._change_index = change_index or _change_index
+        self._change_files_cache = change_files_cache or _change_files_cache
+        self._parallel_sync = parallel_sync or _parallel_sync
+        self._progress_handler = None
+        self._cancel_event: threading.Event | None = None
         self._connection_depth: int = 0
+        # The depth of the lease held by `holding_connection`, if any:
+        self._held_depth: int = 0
         self._host_name: str = ""
 
         self._is_offline = False
@@ -218,6 +450,7 @@ class P4ConnectionManager:
         self._path_existence_errors: set[str] = set()
         self.__workspace_cache__: list[str] = []
         self.__clients_cache__: dict[str, dict[str, Any]] | None = None
+        self.__clients_cache_key__: tuple[Any, ...] | None = None
         self._workspace_errors: set[str] = set()
 
         self._signaller = P4ConnectionManagerSignaller()
@@ -231,64 +464,22 @@ class P4ConnectionManager:
             updated_fn=updated_fn,
             completed_fn=completed_fn,
         )
-        self.p4.progress = self._progress_handler
-
-    def __getattribute__(self, attribute_name) -> Any:
-        """
-        This is a custom handler for attribute access.
-
-        It allows methods that need wrapping with
-        `__run_connect__` to be wrapped when first called.
-        The alternative was for `__run_connect__` to exist
-        outside of P4ConnectionManager, which seemed janky.
-
-        A method with the prefix `_connect_` will be wrapped
-        with `__run_connect__` when first called and then assigned
-        back to the instance without the `_connect_` prefix.
-        This provides lazy creation and exposure of core methods.
-        For example:
-        This will expose the wrapped version of: `_connect_checkout`,
-        saving it as an attribute on the `P4ConnectionManager`
-        instance, to provide a quicker look up if accessed again:
-
-        ```
-        cm = P4ConnectionManager()
-        cm.checkout
-        ```
-
-        It is recommended to use the full method name when
-        calling from within the object (include `_connect_` prefix).
-        This avoids unneccesary connection checks, providing a slight
-        performance boost. I.E:
-        `self._connect_checkout` rather than `self.checkout`
-        """
-        try:
-            attribute = object.__getattribute__(self, attribute_name)
-            return attribute
-
-        except AttributeError:
-            attribute_name = f"_connect_{attribute_name}"
-            try:
-                attribute = object.__getattribute__(self, attribute_name)
-                if isinstance(attribute, MethodType):
-                    __run_connect__ = object.__getattribute__(self, "__run_connect__")
-                    attribute = __run_connect__(attribute)
-                    object.__setattr__(self, attribute_name.replace("_connect_", ""), attribute)
-
-                return attribute
-
-            except AttributeError:
-                _attribute_name = attribute_name.replace("_connect_", "")
-                class_name = object.__getattribute__(self, "__class__").__name__
-                raise AttributeError(f"{class_name} has no attribute: {_attribute_name}")
 
     # Properties:
     @property
     def p4(self) -> P4.P4:
+        """
+        The connection leased for the current call, or the connection
+        pool's settings template when no connection is leased.
+        """
         if self._p4 is None:
-            self._p4 = P4.P4()
+            return self._connection_pool.template
         return self._p4
 
+    @property
+    def connection_pool(self) -> p4_pool.P4ConnectionPool:
+        return self._connection_pool
+
     @property
     def host_name(self) -> str:
         if not self._host_name:
@@ -312,16 +503,63 @@ class P4ConnectionManager:
 
     @property
     def _clients_cache(self) -> dict[str, dict[str, Any]]:
-        if self.__clients_cache__ is None:
+        """
+        The user's clients on this host, listed again once they're older
+        than `clients_cache_ttl` or the server or user has changed.
+        """
+
+        key = (self.p4.port, self.p4.user)
+        if (
+            self.__clients_cache__ is None
+            or self.__clients_cache_key__ is None
+            or self.__clients_cache_key__[:2] != key
+            or time.monotonic() - self.__clients_cache_key__[2] > self.clients_cache_ttl
+        ):
             host_name = self.host_name.lower()
             self.__clients_cache__ = {
                 client["client"]: client
                 for client in self.p4.run_clients("--me")
                 if client["Host"].lower() == host_name
             }
+            self.__clients_cache_key__ = (*key, time.monotonic())
 
         return self.__clients_cache__
 
+    def clear_clients_cache(self) -> None:
+        """
+        Forget the listed clients, so they're listed again on the next call.
+        """
+
+        self.__clients_cache__ = None
+        self.__clients_cache_key__ = None
+
+    @property
+    def _workspace_root_index(self) -> p4_workspace_index.P4WorkspaceRootIndex:
+        """
+        The index of this host's workspace roots, rebuilt
+        only if the user's clients on this host have changed.
+        """
+
+        clients = self._clients_cache
+        signature = tuple(
+            sorted(
+                (name, client.get("Root", ""), client.get("Stream", ""))
+                for name, client in clients.items()
+            )
+        )
+        index = self._workspace_index
+        if not index.is_current(signature):
+            roots = {}
+            for workspace in clients:
+                try:
+                    roots[workspace] = self._get_workspace_roots(workspace)
+                except (AssertionError, P4.P4Exception) as error:
+                    print(f"Skipping workspace: {workspace} - {error}")
+
+            index.build(roots, signature)
+
+        return index
+
     @property
     def _workspace_cache(self):
         if not self.__workspace_cache__:
@@ -333,8 +571,9 @@ class P4ConnectionManager:
     @contextmanager
     def __connect__(self) -> Generator[P4.P4 | None, None, None]:
         """
-        Context manager that connects to if not already connected p4,
-        yielding the instance of p4 and closing the connection when done.
+        Context manager that leases a connected p4 instance from the
+        connection pool if one is not already leased, yielding the
+        instance of p4 and handing it back to the pool when done.
         """
 
         if self._is_offline:
@@ -342,9 +581,9 @@ class P4ConnectionManager:
                 yield
                 return
 
-        if not self.p4.connected():
+        if self._p4 is None:
             try:
-                self.p4.connect()
+                self._p4 = self._connection_pool.acquire()
                 if self._is_offline:
                     self._signaller.connected.emit()
                     self._is_offline = False
@@ -361,18 +600,58 @@ class P4ConnectionManager:
                 yield
                 return
 
+            if self._progress_handler is not None:
+                self._p4.progress = self._progress_handler
+
+            if self._cancel_event is not None:
+                self._p4.handler = p4_stream.P4CancelHandler(self._cancel_event)
+
         self._connection_depth += 1
-        yield self.p4
+        try:
+            yield self._p4
+        except BaseException:
+            self._connection_depth -= 1
+            if self._connection_depth == 0:
+                self._end_lease(process_errors=False)
+            elif self._connection_depth == self._held_depth:
+                self._clear_errors()
+            raise
+
         self._connection_depth -= 1
         if self._connection_depth == 0:
-            self.__clients_cache__ = None
-            self._process_errors()
-            self._process_warnings()
-            self.p4.disconnect()
+            self._end_lease()
+        elif self._connection_depth == self._held_depth:
+            # Each command run whilst the lease is held is processed on its own,
+            # as the errors and warnings of p4 only hold those of its last command:
+            self._end_command()
+
+    def _end_command(self, process_errors: bool = True) -> None:
+        """
+        Process the errors and warnings of the last command run on the leased connection.
+        """
+
+        try:
+            if process_errors:
+                self._process_errors()
+                self._process_warnings()
+        finally:
             self._clear_errors()
 
-    def __run_connect__(self, function):
-        # type: (Callable[..., Any]) -> Callable[..., Any]
+    def _end_lease(self, process_errors: bool = True) -> None:
+        """
+        Process the errors and warnings of the current lease and
+        hand the leased connection back to the connection pool.
+        """
+
+        p4 = self._p4
+        try:
+            self._end_command(process_errors=process_errors)
+        finally:
+            self._p4 = None
+            self._connection_pool.release(p4)
+
+    def __run_connect__(self, function, path_index=None):
+        # type: (Callable[..., Any], int | None) -> Callable[..., Any]
         """
         Decorator that connects to p4 before running a function.
 
@@ -388,13 +667,16 @@ class P4ConnectionManager:
 
         The intention is for this to work with P4ConnectionManager,
         it will not work with standard functions.
+
+        `path_index` is the index of the function's `path` argument,
+        as precomputed by `_ConnectMethod`.
         """
 
         @functools.wraps(function)
         def _connect(*args, **kwargs):
             # type: (Any, Any) -> Any
             workspace_override = None
-            args_info = self._get_path_arg_info(function, args) if args else (None, False)
+            args_info = self._get_path_arg_info(path_index, args) if args else (None, False)
             paths, compile_result = args_info
             paths, args, kwargs, workspace_override = self._split_args(paths, args, kwargs)
 
@@ -405,13 +687,19 @@ class P4ConnectionManager:
                     )
                 else:
                     self._update_workspace_cache(workspace_override or self.p4.client)
-                    for workspace in self._workspace_cache:
-                        with self.workspace_as(workspace):
-                            self.__run_function__(
-                                function, paths, workspace, compile_result, args, kwargs
-                            )
-                            if self._break_run_loop:
-                                break
+                    routes = self._route_paths(function, paths)
+                    if routes:
+                        self.__run_function_routed__(
+                            function, paths, routes, compile_result, args, kwargs
+                        )
+                    else:
+                        for workspace in self._workspace_cache:
+                            with self.workspace_as(workspace):
+                                self.__run_function__(
+                                    function, paths, workspace, compile_result, args, kwargs
+                                )
+                                if self._break_run_loop:
+                                    break
 
             if compile_result:
                 return self.result
@@ -439,7 +727,7 @@ class P4ConnectionManager:
             if paths and not self._are_paths_valid(paths, workspace):
                 return
 
-            is_get_stat = function == self._connect_get_stat
+            is_get_stat = function.__name__ == "_connect_get_stat"
             result = function(*args, **kwargs)  # type: Any
             if is_get_stat:
                 result = (result, ) if paths and len(paths) == 1 and paths[0].endswith("...") else result
@@ -478,6 +766,42 @@ class P4ConnectionManager:
 
         return
 
+    def __run_function_routed__(self, function, paths, routes, compile_result, args, kwargs):
+        # type: (Callable[..., Any], tuple[str, ...], dict[str, list[int]], bool, tuple[Any], dict[str, Any]) -> None  # noqa
+        """
+        Run the function once per workspace with the paths owned by that
+        workspace, merging the results back in the original path order.
+        """
+
+        result = [None] * len(paths)  # type: list[Any]
+        run_successfully = False
+        for workspace, indices in routes.items():
+            workspace_paths = tuple(paths[index] for index in indices)
+            workspace_args = (workspace_paths, *args[1:])
+            with self.workspace_as(workspace):
+                self.__run_function__(
+                    function, workspace_paths, workspace, False, workspace_args, kwargs
+                )
+
+            run_successfully = run_successfully or self._run_successfully
+            workspace_result = self.result
+            if not isinstance(workspace_result, (list, tuple)):
+                continue
+
+            if len(workspace_result) != len(indices):
+                # The results can't be put back in the order of the paths, returning them
+                # would leave some paths without a result as if the call succeeded:
+                raise p4_errors.P4ResultMappingError(
+                    function.__name__, workspace, len(workspace_result), len(indices)
+                )
+
+            for index, data in zip(indices, workspace_result):
+                result[index] = data
+
+        self.result = self._compile_result(compile_result, paths, result)
+        self._run_successfully = run_successfully
+        self._break_run_loop = True
+
     def __run_function_offline__(self, function, paths, compile_result, args, kwargs):
         # type: (Callable[..., Any], tuple[str, ...] | None, bool, tuple[Any], dict[str, Any]) -> None
         self.result = None
@@ -563,6 +887,46 @@ class P4ConnectionManager:
         valid_paths = self._get_valid_path_objects(paths)
         return self._get_correct_p4_paths(valid_paths)
 
+    def _get_sync_args(self, parallel: P4ParallelSync | dict[str, Any] | bool | None = None) -> list[str]:
+        """
+        Get the sync arguments for the given parallel sync options,
+        falling back to the manager's default options if None.
+        """
+
+        parallel_sync = P4ParallelSync.from_value(parallel) or self._parallel_sync
+        parallel_arg = parallel_sync.to_arg()
+        return [parallel_arg] if parallel_arg else []
+
+    @staticmethod
+    def _get_paths_from_warnings(warnings: Iterable[str], suffix: str) -> set[str]:
+        """
+        Get the paths of the p4 warnings that end with the given suffix,
+        i.e. `" - no such file(s)."`.
+        """
+
+        suffix_length = len(suffix)
+        return {str(warning)[:-suffix_length] for warning in warnings if str(warning).endswith(suffix)}
+
+    @staticmethod
+    def _merge_missing_results(result: list[Any], missing_indices: Iterable[int], missing_value: Any) -> list[Any]:
+        """
+        Insert `missing_value` into `result` at each of the given (ascending)
+        indices, as successive `list.insert` calls would, in a single pass.
+        """
+
+        merged = []
+        result_index = 0
+        for missing_index in missing_indices:
+            count = missing_index - len(merged)
+            if count > 0:
+                merged.extend(result[result_index:result_index + count])
+                result_index += count
+
+            merged.append(missing_value)
+
+        merged.extend(result[result_index:])
+        return merged
+
     def _split_args(self, paths, args, kwargs):
         # type: (tuple[str, ...] | None, tuple[Any, ...], dict[str, Any]) -> tuple[tuple[str,...] | None, tuple[Any, ...], dict[str, Any], str | None]  # noqa
         if paths:
@@ -583,6 +947,112 @@ class P4ConnectionManager:
 
         return paths, args, kwargs, workspace
 
+    def _route_paths(self, function, paths):
+        # type: (Callable[..., Any], tuple[str, ...] | None) -> dict[str, list[int]] | None
+        """
+        Partition the indices of the given paths by the workspace that owns
+        each path, returning None if the paths don't need to (or can't) be
+        split between workspaces.
+        """
+
+        if not paths or len(paths) < 2:
+            return None
+
+        function_name = function.__name__
+        if function_name not in self._path_aligned_functions:
+            return None
+
+        if function_name == "_connect_get_stat" and any(path.endswith("...") for path in paths):
+            # Folders return a record per file, so can't be mapped back:
+            return None
+
+        index = self._workspace_root_index
+        workspace_order = {workspace: order for order, workspace in enumerate(self._workspace_cache)}
+        routes = {}  # type: dict[str, list[int]]
+        for path_index, path in enumerate(paths):
+            workspaces = index.get_workspaces(path)
+            if not workspaces:
+                return None
+
+            # Prefer the workspace that was most recently used:
+            workspace = min(
+                workspaces, key=lambda _workspace: workspace_order.get(_workspace, len(workspace_order))
+            )
+            routes.setdefault(workspace, []).append(path_index)
+
+        if len(routes) < 2:
+            return None
+
+        return routes
+
+    def _get_client_view_map(self, workspace: str) -> p4_client_view.P4ClientViewMap | None:
+        """
+        Get the compiled view of the given workspace, only
+        fetching its spec from the server if it has changed.
+        """
+
+        client = self._clients_cache.get(workspace)
+        if not client:
+            return None
+
+        signature = (client.get("Update"), client.get("Root"), client.get("Stream"))
+        view_map = self._client_views.get(workspace, signature)
+        if view_map is not None:
+            return view_map
+
+        spec = self.p4.run_client("-o", workspace)[0]
+        info = self.p4.run_info()[0]
+        view_map = p4_client_view.P4ClientViewMap(
+            workspace,
+            spec.get("Root", ""),
+            spec.get("View", []),
+            case_sensitive=info.get("caseHandling") == "sensitive",
+        )
+        self._client_views.set(workspace, signature, view_map)
+        return view_map
+
+    def _where(self, path: str | Sequence[str]) -> list[dict[str, str]]:
+        """
+        Translate the given local or depot paths using the current
+        workspace's view, like `p4 where`. Falls back to running `p4 where`
+        if any of the paths is unmapped or can't be resolved locally,
+        so errors and warnings are the same as the server's.
+        """
+
+        paths = make_tuple_if_not(path)
+        try:
+            view_map = self._get_client_view_map(self.p4.client)
+        except (AssertionError, P4.P4Exception):
+            view_map = None
+
+        if view_map is not None and view_map.is_compiled:
+            result = view_map.where_many(paths)
+            if all(isinstance(data, dict) for data in result):
+                return result
+
+        return self.p4.run_where(path)
+
+    def _get_change_index_key(self) -> tuple[str, str]:
+        return self.p4.user or self._connect_get_user_name(), self.p4.client
+
+    def _refresh_change_index(self) -> None:
+        user, client = self._get_change_index_key()
+        # -l: Include the full descriptions.
+        changes = self.p4.run_changes(["-l", "-u", user, "-c", client, "-s", "pending"])
+        self._change_index.refresh(user, client, changes)
+
+    def _index_saved_change(self, save_change_result: list[str], description: str, files: list[str] | None) -> None:
+        """
+        Add the change list created by `p4 change -i` to the pending change index.
+        """
+
+        for line in save_change_result:
+            words = str(line).split()
+            if len(words) == 3 and words[0] == "Change" and words[2] == "created.":
+                user, client = self._get_change_index_key()
+                self._change_index.set(user, client, int(words[1]), description, files)
+                return
+
     def _are_paths_valid(self, paths, workspace):
         # type: (tuple[Any, ...], str) -> bool
         paths = make_tuple_if_not(paths)
@@ -594,9 +1064,8 @@ class P4ConnectionManager:
 
         return False
 
-    @lru_cache(maxsize=64)
     def _get_workspace_roots(self, workspace: str) -> tuple[str, str]:
-        """Get the roots of the given workspace"""
+        """Get the client and depot roots of the given workspace"""
 
         if workspace not in self._clients_cache:
             # @sharkmob-shea.richardson:
@@ -612,72 +1081,34 @@ class P4ConnectionManager:
             f"'Root' not found for workspace: '{workspace}'' - it is likely a dead!:\n{client}"
         )
         client_root = client["Root"]
-        server_info = self._connect_get_path_info([f"{client_root}\\..."])[0]
-        server_root = server_info["depotFile"].rstrip("...")
+        stream = client.get("Stream")
+        if stream:
+            # A stream workspace maps the stream to its root, so
+            # this saves asking the server with a `p4 where`:
+            server_root = f"{stream}/"
+        else:
+            with self.workspace_as(workspace):
+                server_info = self._connect_get_path_info([f"{client_root}\\..."])[0]
+            server_root = server_info["depotFile"].rstrip("...")
+
         return (
             str(pathlib.Path(client_root)).lower(),
             str(pathlib.Path(server_root)).lower()
         )
 
-    @lru_cache(maxsize=64)
-    def _is_path_under_root(
-        self, path: Union[str, pathlib.Path], client_root: str, server_root: str
-    ) -> bool:
-        path = str(path).lower()
-        if path.startswith(server_root):
-            return True
-
-        elif path.startswith(client_root):
-            return True
-
-        return False
-
-    # @lru_cache(maxsize=64)
     def _are_paths_under_root(self, workspace: str, paths: tuple[str | pathlib.Path]):
-        client_root, server_root = self._get_workspace_roots(workspace)
-        for path in paths:
-            if self._is_path_under_root(path, client_root, server_root):
-                continue
-
-            return False
+        if workspace not in self._clients_cache:
+            raise P4.P4Exception(f"Invalid workspace name provided: '{workspace}'")
 
-        return True
+        index = self._workspace_root_index
+        return all(index.is_under_workspace(path, workspace) for path in paths)
 
-    @lru_cache(maxsize=64)
     def _is_path_under_any_root(self, path: Union[str, pathlib.Path]):
-        for workspace in self._workspace_cache:
-            with self.workspace_as(workspace):
-                client_root, server_root = self._get_workspace_roots(workspace)
-                if self._is_path_under_root(path, client_root, server_root):
-                    return True
-        return False
-
-    @functools.lru_cache(maxsize=64)
-    def _args_has_path_or_workspace(self, signature):
-        # type: (inspect.Signature) -> bool
-        """
-        Test if the function to be wrapped has an argument
-        called `path`, returning True if so and False if not.
-        This will determine if path pre processing functions
-        should be run on the functions args or not.
-
-        This is cached to provide the best possible performance.
-        """
-
-        if "path" not in signature.parameters and "workspace" not in signature.parameters:
-            return False
-
-        return True
-
-    @functools.lru_cache(maxsize=64)
-    def _get_path_index_from_args(self, signature):
-        # type: (inspect.Signature) -> int | None
-        arg_names = tuple(signature.parameters)
-        path_index = None
-        if "path" in arg_names:
-            path_index = arg_names.index("path")
+        with self.__connect__() as p4:
+            if p4 is None:
+                return False
 
-        return path_index
+            return self._workspace_root_index.is_under_any_workspace(path)
 
     def _set_retry_p4_connection(self, value: bool):
         self._retry_p4_connection = value
@@ -705,21 +1136,16 @@ class P4ConnectionManager:
             self._workspace_cache.pop(index)
             self._workspace_cache.insert(0, workspace)
 
-    def _get_path_arg_info(self, function, args):
-        # type: (Callable[..., Any], tuple[Any, ...]) -> tuple[tuple[str] | None, bool]
-        signature = inspect.signature(function)
-        compile_result = False
-        if not self._args_has_path_or_workspace(signature):
-            return None, compile_result
-
-        path = None   # type: tuple[str] | None
-        path_index = self._get_path_index_from_args(signature)
-        if path_index is not None:
-            _path = args[path_index]
-            compile_result = isinstance(_path, (list, tuple))
-            _path = make_tuple_if_not(_path)
-            path = tuple(dict.fromkeys(_path).keys())
-
+    @staticmethod
+    def _get_path_arg_info(path_index, args):
+        # type: (int | None, tuple[Any, ...]) -> tuple[tuple[str] | None, bool]
+        if path_index is None:
+            return None, False
+
+        _path = args[path_index]
+        compile_result = isinstance(_path, (list, tuple))
+        _path = make_tuple_if_not(_path)
+        path = tuple(dict.fromkeys(_path).keys())
         return path, compile_result
 
     def _is_p4_exception(self, error):
@@ -952,14 +1378,31 @@ class P4ConnectionManager:
         Override P4CONFIG values.
         """
         conn_manager = _get_connection_manager()
-        if conn_manager.p4.user != username:
-            conn_manager.p4.user = username
-            conn_manager.p4.password = password
-            conn_manager.p4.port = f"{host}:{port}"
-        conn_manager.p4.connect()
-        conn_manager.p4.run_login(password=password)
-        conn_manager.p4.client = workspace_name
-        conn_manager.__workspace_cache__ = self._connect_get_workspaces()
+        template = conn_manager.connection_pool.template
+        port = f"{host}:{port}"
+        if (
+            template.user != username
+            or template.password != password
+            or template.port != port
+            or template.client != workspace_name
+        ):
+            template.user = username
+            template.password = password
+            template.port = port
+            template.client = workspace_name
+            # Existing connections use the old settings:
+            conn_manager.connection_pool.clear()
+
+        conn_manager.clear_clients_cache()
+        # The records may be those of another user or server:
+        conn_manager.clear_stat_cache()
+
+        with conn_manager.__connect__() as p4:
+            if p4 is None:
+                raise p4_errors.P4ServerConnectionError(f"Unable to connect to: {port}")
+
+            p4.run_login(password=password)
+            conn_manager.__workspace_cache__ = conn_manager._connect_get_workspaces()
 
     # Connect Methods:
     def _connect_add(
@@ -975,7 +1418,9 @@ class P4ConnectionManager:
             if not pathlib.Path(_path).exists():
                 raise p4_errors.P4PathDoesNotExistError(_path)
 
-        result = self.p4.run_add(path)
+        with self._stat_cache.invalidating(path):
+            result = self.p4.run_add(path)
+
         if change_description:
 
             def _get_path_to_reopen(data):
@@ -998,7 +1443,8 @@ class P4ConnectionManager:
                 files_to_reopen.append(path_to_reopen)
 
             if files_to_reopen:
-                self.p4.run_reopen(["-c", "default"], files_to_reopen)
+                with self._stat_cache.invalidating(files_to_reopen):
+                    self.p4.run_reopen(["-c", "default"], files_to_reopen)
 
             self._connect_create_change_list(change_description, files=path)
 
@@ -1011,11 +1457,6 @@ class P4ConnectionManager:
 
     def _connect_add_to_change_list(self, path: T_PthStrLst, description: str) -> bool:
         change_dict = self._connect_get_existing_change_list(description)
-        user_name = self._connect_get_user_name()
-        client = self.p4.client
-        changes: list[dict[str, Any]] = self.p4.run_changes(
-            ["-u", user_name, "-c", client, "-s", "pending"]
-        )
         exists = self._connect_exists_on_server(path)
         paths_to_add = [path[index] for index, exist in enumerate(exists) if not exist]
         if paths_to_add:
@@ -1024,30 +1465,25 @@ class P4ConnectionManager:
         depot_paths = self._connect_get_server_path(path)
 
         self._connect_checkout(path)
-        _depot_paths = set((path for path in depot_paths if path))
-        paths_to_reopen = []  # type: list[str]
-        changes = self.p4.run_describe([change["change"] for change in changes])
-        for change in changes:
-            if "depotFile" not in change:
-                continue
-
-            if change["desc"] == description:
-                continue
-
-            intersection = _depot_paths.intersection(
-                set(change["depotFile"])
-            )
-            if not intersection:
-                continue
-
-            paths_to_reopen.extend(intersection)
+        # Files opened in any of the other pending change lists need to be
+        # reopened in the default change list before they can be moved.
+        # fstat reports the change list each file is opened in, so there's
+        # no need to describe every pending change list:
+        _depot_paths = [path for path in depot_paths if path]
+        change = change_dict["Change"]
+        paths_to_reopen = [
+            data["depotFile"]
+            for data in (self._run_fstat(_depot_paths, ["-T", "depotFile,change"]) if _depot_paths else [])
+            if data and data.get("change") not in (None, "default", change)
+        ]  # type: list[str]
 
         if paths_to_reopen:
-            self.p4.run_reopen(
-                ["-c", "default"], paths_to_reopen
-            )
+            with self._stat_cache.invalidating(paths_to_reopen):
+                self.p4.run_reopen(
+                    ["-c", "default"], paths_to_reopen
+                )
 
-        files = [info["depotFile"] for info in self.p4.run_where(path)]
+        files = [info["depotFile"] for info in self._where(path)]
         change_files = (
             change_dict["Files"]
             if "Files" in change_dict
@@ -1057,7 +1493,9 @@ class P4ConnectionManager:
         change_files = list(set(change_files))
         change_dict["Files"] = change_files
 
-        _result = self.p4.save_change(change_dict)
+        with self._stat_cache.invalidating(change_files):
+            _result = self.p4.save_change(change_dict)
+        self._change_index.set_files(*self._get_change_index_key(), int(change), change_files)
         result = self._process_result(
             _result,
             "",
@@ -1083,7 +1521,8 @@ class P4ConnectionManager:
         if paths_to_sync:
             self._connect_sync(paths_to_sync)
 
-        edit_result = self.p4.run_edit(path)
+        with self._stat_cache.invalidating(path):
+            edit_result = self.p4.run_edit(path)
         if change_description:
             self._connect_create_change_list(change_description, files=path)
 
@@ -1153,7 +1592,7 @@ class P4ConnectionManager:
                 if files_to_reopen
                 else files
             )
-            _files = [info["depotFile"] for info in self.p4.run_where(files)]
+            _files = [info["depotFile"] for info in self._where(files)]
 
         if change_dict:
             change_files = (
@@ -1173,21 +1612,83 @@ class P4ConnectionManager:
             change_dict["Files"] = _files
 
         if files_to_reopen:
-            self.p4.run_reopen(
-                ["-c", description], files_to_reopen
-            )
+            with self._stat_cache.invalidating(files_to_reopen):
+                self.p4.run_reopen(
+                    ["-c", description], files_to_reopen
+                )
 
         change_dict["Description"] = description
-        save_change_result = self.p4.save_change(change_dict)
+        with self._stat_cache.invalidating(change_dict.get("Files")):
+            save_change_result = self.p4.save_change(change_dict)
+        self._index_saved_change(save_change_result, description, change_dict.get("Files"))
         result = self._process_result(
             save_change_result, "", "", true_pattern="created."
         )
 
         return result
 
-    def _connect_get_changes(self):
-        change_list = self._connect_run_command("changes",
-                                                "-s", "submitted")
+    def _connect_get_change_files(
+        self, change: int, offset: int = 0, limit: int | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Get a page of the files of a change list, listed with `p4 describe -s`.
+        The files of submitted change lists are cached, as they never change.
+        """
+
+        server = self.p4.port
+        files = self._change_files_cache.get(server, change)
+        if files is None:
+            result = self.p4.run_describe("-s", str(int(change)))
+            if not result:
+                return None
+
+            describe = result[0]
+            files = p4_describe_cache.P4ChangeFiles.from_describe(describe)
+            if describe.get("status") == "submitted":
+                self._change_files_cache.set(server, files)
+
+        return {
+            "change": files.change,
+            "files": files.get_page(offset, limit),
+            "offset": offset,
+            "total": len(files),
+        }
+
+    def _connect_get_changes(
+        self,
+        file_spec: str | None = None,
+        since: int | None = None,
+        before: int | None = None,
+        limit: int | None = None,
+    ):
+        """
+        Get the submitted change lists, newest first, optionally scoped to
+        the files of `file_spec` (i.e. a stream's `//stream/main/...`), to the
+        changes newer than `since` and/or older than `before`, and to at
+        most `limit` change lists; all of which are applied by the server.
+
+        `file_spec` is passed to p4 as is, rather than as a `path` argument,
+        so it isn't routed to a workspace or checked as a local path.
+        """
+
+        args: list[str] = ["-s", "submitted"]
+        if limit:
+            args += ["-m", str(int(limit))]
+
+        if since is not None:
+            args += ["-e", str(int(since) + 1)]
+
+        if file_spec is not None or before is not None:
+            spec = str(file_spec) if file_spec is not None else "//..."
+            if before is not None:
+                if int(before) <= 1:
+                    return
+
+                spec = f"{spec}@1,@{int(before) - 1}"
+
+            args.append(spec)
+
+        change_list = self._connect_run_command("changes", *args)
         if not change_list:
             return
 
@@ -1209,13 +1710,15 @@ class P4ConnectionManager:
         if not change_dict:
             return
 
-        return change_dict["change"]
+        return change_dict["Change"]
 
     def _connect_create_workspace(self, name: str, root: str, stream: str):
         client = self.p4.fetch_client()
         client["Client"] = name
         client["Root"] = root
         client["Stream"] = stream
+        self._client_views.invalidate(name)
+        self.clear_clients_cache()
         return self.p4.save_client(client)
 
     def _connect_delete(
@@ -1227,11 +1730,12 @@ class P4ConnectionManager:
         Delete the given file if it exists on the server.
         """
 
-        if change_description:
-            change_number = self._connect_create_change_list(change_description)
-            result = self.p4.run_delete(["-c", change_number, path])
-        else:
-            result = self.p4.run_delete(path)
+        with self._stat_cache.invalidating(path):
+            if change_description:
+                change_number = self._connect_create_change_list(change_description)
+                result = self.p4.run_delete(["-c", change_number, path])
+            else:
+                result = self.p4.run_delete(path)
 
         return self._process_result(result, "action", "edit")
 
@@ -1244,9 +1748,13 @@ class P4ConnectionManager:
         change_id = int(change_list["Change"])
         files = "Files" in change_list and change_list["Files"]
         if files and force:
-            self.p4.run_reopen(["-c", "default"], files)
+            with self._stat_cache.invalidating(files):
+                self.p4.run_reopen(["-c", "default"], files)
 
         change_result = self.p4.run_change(["-d", change_id])  # type: list[str]
+        if any(f"Change {change_id} deleted." in str(line) for line in change_result):
+            self._change_index.remove(*self._get_change_index_key(), change_id)
+
         result = self._process_result(
             change_result,
             "",
@@ -1263,8 +1771,24 @@ class P4ConnectionManager:
         # returned files from the fstat query, to avoid getting
         # info on all sub files recursively. This is done by
         # passing in the -m (max) argument and setting it as 1:
-        stat = self._connect_get_stat(path, ["-m 1"])
-        result = [True if "depotFile" in data else False for data in stat]
+        if len(path) < 2:
+            stat = self._connect_get_stat(path, ["-m 1"])
+            return [True if data and "depotFile" in data else False for data in stat]
+
+        # `-m` limits the records of all the paths together, so files are
+        # queried together and only directories are queried one at a time:
+        result = [False] * len(path)
+        file_indices = [index for index, _path in enumerate(path) if not _path.endswith("...")]
+        if file_indices:
+            stat = self._connect_get_stat([path[index] for index in file_indices])
+            for index, data in zip(file_indices, stat):
+                result[index] = bool(data and "depotFile" in data)
+
+        for index, _path in enumerate(path):
+            if _path.endswith("..."):
+                stat = self._connect_get_stat([_path], ["-m 1"])
+                result[index] = any(data and "depotFile" in data for data in stat)
+
         return result
 
     def _connect_get_attribute(
@@ -1334,21 +1858,41 @@ class P4ConnectionManager:
         return result
 
     def _connect_get_existing_change_list(self, description: str) -> dict[str, Any]:
-        user_name = self._connect_get_user_name()
-        client = self.p4.client
-        changes: list[dict[str, Any]] = self.p4.run_changes(
-            ["-u", user_name, "-c", client, "-s", "pending"]
-        )
-
-        if not changes:
-            raise P4.P4Exception("No changelists found!")
+        """
+        Get the spec of the current user and client's pending change list
+        with the given description, looked up in the pending change index.
+        """
 
         description = description.strip()
-        for change_data in self.p4.run_describe([change["change"] for change in changes]):
-            if description != change_data["desc"].strip():
-                continue
-
-            return self.p4.fetch_change(change_data["change"])
+        user, client = self._get_change_index_key()
+        index = self._change_index
+        refreshed = False
+        if not index.is_loaded(user, client):
+            self._refresh_change_index()
+            refreshed = True
+
+        while True:
+            change = index.get(user, client, description)
+            if change is not None:
+                change_spec = self.p4.fetch_change(change)
+                if (
+                    change_spec.get("Status") == "pending" and
+                    change_spec.get("Description", "").strip() == description
+                ):
+                    index.set_files(user, client, change, change_spec.get("Files"))
+                    return change_spec
+
+                # The change list was submitted or edited outside of the api:
+                index.remove(user, client, change)
+
+            if refreshed:
+                break
+
+            self._refresh_change_index()
+            refreshed = True
+
+        if not index.count(user, client):
+            raise P4.P4Exception("No changelists found!")
 
         raise P4.P4Exception(f'No changelist with description: "{description}" found!')
 
@@ -1380,82 +1924,136 @@ class P4ConnectionManager:
         extensions: Iterable[str] | None = None,
         fstat_args: Iterable[str] | None = None,
     ) -> list[tuple[P4PathDateData]]:
-        result: list[tuple[P4PathDateData]] = []
+        return [
+            tuple(
+                self._iter_files_in_folder_in_date_order(
+                    _path, name_pattern=name_pattern, extensions=extensions, fstat_args=fstat_args
+                )
+            )
+            for _path in path
+        ]
+
+    def _iter_files_in_folder_in_date_order(
+        self,
+        path: str,
+        name_pattern: str | None = None,
+        extensions: Iterable[str] | None = None,
+        fstat_args: Iterable[str] | None = None,
+    ) -> Iterator[P4PathDateData]:
+        """
+        Stream the files directly in the given folder, in date order,
+        filtering the fstat records as they arrive from the server.
+        Must be run from within a `_connect_` method.
+        """
+
+        if not path.endswith("..."):
+            raise AttributeError(
+                "get_files_in_folder_in_date_order can only be run on folders!"
+            )
+
         fstat_args = list(fstat_args) if fstat_args else []
         # -Sd: Sort by date.
         # -Rc: Limit output to files mapped into the current workspace.
         fstat_args.extend(("-Sd", "-Rc"))
-        for _path in path:
-            if not _path.endswith("..."):
-                raise AttributeError(
-                    "get_files_in_folder_in_date_order can only be run on folders!"
-                )
+        if name_pattern:
+            name_pattern = name_pattern.lower()
 
-            stat = self._connect_get_stat((_path, ), args=fstat_args)
-            if name_pattern:
-                name_pattern = name_pattern.lower()
-
-            _extensions = None
-            if extensions is not None:
-                _extensions = set(
-                    (
-                        extension.lower()
-                        if extension.startswith(".")
-                        else ".{}".format(extension).lower()
-                        for extension in extensions
-                    )
+        _extensions = None
+        if extensions is not None:
+            _extensions = set(
+                (
+                    extension.lower()
+                    if extension.startswith(".")
+                    else ".{}".format(extension).lower()
+                    for extension in extensions
                 )
+            )
 
-            local_path = self._connect_get_local_path((_path, ))
-            if not local_path:
-                continue
+        local_path = self._connect_get_local_path((path, ))
+        if not local_path:
+            return
 
-            _local_path = local_path[0]
-            parent_path_client = pathlib.Path(_local_path)
-            path_result: list[P4PathDateData] = []
-            for data in stat:
-                path_date_data = P4PathDateData()
-                if not data:
-                    path_date_data.set_data(None, None)
+        parent_path_client = pathlib.Path(local_path[0])
 
-                else:
+        def _is_file_valid(data: dict[str, Any]) -> bool:
+            local_path = pathlib.Path(data["clientFile"])
+            if not local_path.parent == parent_path_client:
+                return False
 
-                    local_path = pathlib.Path(data["clientFile"])
-                    if not local_path.parent == parent_path_client:
-                        continue
+            if name_pattern and name_pattern not in local_path.stem.lower():
+                return False
 
-                    if name_pattern and name_pattern not in local_path.stem.lower():
-                        continue
+            if _extensions and local_path.suffix.lower() not in _extensions:
+                return False
 
-                    if _extensions and local_path.suffix.lower() not in _extensions:
-                        continue
+            return True
 
-                    if "action" in data and data["action"] == "add":
-                        # @sharkmob-shea.richardson:
-                        # As the file has been marked for add,
-                        # all we have to go on is the last time
-                        # the file was modified locally:
-                        mod_time = local_path.stat().st_mtime
-                        mod_date = datetime.datetime.fromtimestamp(mod_time)
-                        path_date_data.set_data(local_path, mod_date)
+        stream = p4_stream.P4RecordStream(
+            self.p4, "fstat", (fstat_args, path), record_filter=_is_file_valid, cancel_event=self._cancel_event
+        )
+        for data in stream:
+            path_date_data = P4PathDateData()
+            local_path = pathlib.Path(data["clientFile"])
+            if "action" in data and data["action"] == "add":
+                # @sharkmob-shea.richardson:
+                # As the file has been marked for add,
+                # all we have to go on is the last time
+                # the file was modified locally:
+                mod_time = local_path.stat().st_mtime
+                mod_date = datetime.datetime.fromtimestamp(mod_time)
+                path_date_data.set_data(local_path, mod_date)
+
+            else:
+                mod_time = int(data["headTime"])
+                mod_date = datetime.datetime.fromtimestamp(mod_time)
+                path_date_data.set_data(local_path, mod_date)
+
+            yield path_date_data
+
+        if not stream.record_count and any("no such file(s)." in warning for warning in stream.warnings):
+            # The folder doesn't exist on the server:
+            path_date_data = P4PathDateData()
+            path_date_data.set_data(None, None)
+            yield path_date_data
+
+    def _connect_get_folder_freshness(self, path: T_PthStrLst) -> list[p4_freshness.P4FolderFreshness | None]:
+        """
+        Get how many files under each of the given folders are behind the
+        server and their size, with a single fstat query for all folders.
+        """
 
-                    else:
-                        mod_time = int(data["headTime"])
-                        mod_date = datetime.datetime.fromtimestamp(mod_time)
-                        path_date_data.set_data(local_path, mod_date)
+        for _path in path:
+            if not _path.endswith("..."):
+                raise AttributeError("get_folder_freshness can only be run on folders!")
 
-                path_result.append(path_date_data)
+        counter = p4_freshness.P4FolderFreshnessCounter(path)
+        # -Rc: Limit output to files mapped into the current workspace.
+        # -Ol: Include the file sizes.
+        args = ["-Rc", "-Ol", "-T", ",".join(p4_freshness.FSTAT_FIELDS)]
+        stream = p4_stream.P4RecordStream(
+            self.p4, "fstat", (args, list(path)), record_filter=counter.add_record, cancel_event=self._cancel_event
+        )
+        try:
+            for _ in stream:
+                pass
+        except Exception as error:
+            if not self._is_p4_exception(error):
+                raise
 
-            result.append(tuple(path_result))
+            return [None] * len(path)
 
-        return result
+        missing_folders = self._get_paths_from_warnings(stream.warnings, " - no such file(s).")
+        return counter.get_results(missing_folders)
 
     def _connect_get_info(self):
         return self.p4.run_info()
 
-    def _connect_get_latest(self, path: T_PthStrLst) -> list[bool | None]:
+    def _connect_get_latest(
+        self, path: T_PthStrLst, parallel: P4ParallelSync | dict[str, Any] | bool | None = None
+    ) -> list[bool | None]:
         try:
-            sync_result = self.p4.run_sync(path)
+            with self._stat_cache.invalidating(path):
+                sync_result = self.p4.run_sync(self._get_sync_args(parallel), path)
             result = self._process_result(sync_result, "action", ("updated", "added"), set_none=True)
             return result
         except Exception as error:
@@ -1467,39 +2065,27 @@ class P4ConnectionManager:
 
             # @sharkmob-shea.richardson:
             # Sync has failed, potentially due to one or more of the files
-            # not existing on p4. Let's filter those files out of `path`
-            # and try sync again:
-            warnings = self.p4.warnings.copy()  # type: list[str]
+            # not existing on p4. Let's find those files in `path` and
+            # mark their results as `None`:
+            warnings = self.p4.warnings  # type: list[str]
             result = [True] * len(path)  # type: list[bool | None]
-            latest_paths = tuple(
-                (
-                    (warning.replace(" - file(s) up-to-date.", ""), warnings.remove(warning))[0]
-                    for warning in reversed(warnings)
-                    if "file(s) up-to-date." in warning
-                )
-            )
+            latest_count = sum(1 for warning in warnings if warning.endswith(" - file(s) up-to-date."))
 
             # @sharkmob-shea.richardson:
             # All paths are already latest, so lets exit:
-            if len(latest_paths) == len(path):
+            if latest_count == len(path):
                 return result
 
-            local_paths = tuple(
-                (
-                    (warning.replace(" - no such file(s).", ""), warnings.remove(warning))[0]
-                    for warning in reversed(warnings)
-                    if "no such file(s)." in warning
-                )
-            )
-            if local_paths:
-                for _path in local_paths:
-                    index = path.index(_path)
-                    result[index] = None
+            missing_paths = self._get_paths_from_warnings(warnings, " - no such file(s).")
+            if missing_paths:
+                for index, _path in enumerate(path):
+                    if _path in missing_paths:
+                        result[index] = None
 
             return result
 
     def _connect_get_local_path(self, path: T_PthStrLst) -> tuple[str]:
-        return tuple((data["path"].rstrip("...") for data in self.p4.run_where(path)))
+        return tuple((data["path"].rstrip("...") for data in self._where(path)))
 
     def _connect_get_newest_file_in_folder(
         self,
@@ -1507,27 +2093,30 @@ class P4ConnectionManager:
         name_pattern: str | None = None,
         extensions: Iterable[str] | None = None,
     ):
-        paths = self._connect_get_files_in_folder_in_date_order(
-            path, name_pattern=name_pattern, extensions=extensions
-        )
-        if not paths:
+        if not path:
             return
 
-        if not paths[0]:
-            return
-
-        return paths[0][-1]
+        # -r: Reverse the date order, so the newest file is the first record
+        # and the command can be stopped as soon as it arrived:
+        files = self._iter_files_in_folder_in_date_order(
+            path[0], name_pattern=name_pattern, extensions=extensions, fstat_args=("-r", )
+        )
+        try:
+            return next(files, None)
+        finally:
+            files.close()
 
     def _connect_get_path_locations(self, path: T_PthStrLst) -> P4ReturnType:
         return self._connect_get_path_info(path)
 
     def _connect_get_path_info(self, path: T_PthStrLst) -> P4ReturnType:
-        return self.p4.run_where(path)
+        return self._where(path)
 
     def _connect_get_revision(
         self,
         path: T_PthStrLst,
         revision: int | tuple[int],
+        parallel: P4ParallelSync | dict[str, Any] | bool | None = None,
     ) -> list[bool]:
         if not isinstance(revision, (list, tuple)):
             revision = tuple([revision] * len(path))
@@ -1538,7 +2127,8 @@ class P4ConnectionManager:
 
         paths = [f"{_path}@{_revision}"
                  for _path, _revision in zip(path, revision)]
-        sync_result = self.p4.run_sync(paths)
+        with self._stat_cache.invalidating(path):
+            sync_result = self.p4.run_sync(self._get_sync_args(parallel), paths)
         result = self._process_result(
             sync_result,
             "action",
@@ -1559,13 +2149,46 @@ class P4ConnectionManager:
         # return self._connect_run_command(command, path)
 
     def _connect_get_server_path(self, path: T_PthStrLst) -> list[str | None]:
-        return [data["depotFile"] if data else None for data in self.p4.run_where(path) if data]
+        return [data["depotFile"] if data else None for data in self._where(path) if data]
 
     def _connect_get_stat(
         self, path: str | Sequence[str], args: P4ArgsType = None
     ) -> list[dict[str, str]]:
+        """
+        Get the fstat records of the given paths.
+        Records of single files are served from the stat cache
+        if they were queried within the cache's ttl.
+        """
+
+        args = list(args or [])
+        paths = make_tuple_if_not(path)
+        stat_cache = self._stat_cache
+        if not stat_cache.enabled or not all(stat_cache.is_cacheable(_path) for _path in paths):
+            return self._run_fstat(path, args)
+
+        server = (self.p4.port, self.p4.client)
+        cached_stat = [stat_cache.get(_path, args, server) for _path in paths]
+        missing_paths = tuple(_path for _path, data in zip(paths, cached_stat) if data is None)
+        if not missing_paths:
+            return cached_stat
+
+        stat = self._run_fstat(missing_paths, args)
+        if len(stat) != len(missing_paths):
+            # The records can't be mapped back to their paths:
+            return self._run_fstat(path, args) if len(missing_paths) != len(paths) else stat
+
+        stat_iter = iter(stat)
+        for index, data in enumerate(cached_stat):
+            if data is not None:
+                continue
 
-        args = args or []
+            data = next(stat_iter)
+            stat_cache.set(paths[index], args, data, server)
+            cached_stat[index] = data
+
+        return cached_stat
+
+    def _run_fstat(self, path: Sequence[str], args: list[str]) -> list[dict[str, str]]:
         try:
             # @sharkmob-shea.richardson:
             # We query fstat of all the given paths.
@@ -1577,26 +2200,14 @@ class P4ConnectionManager:
             if not self._is_p4_exception(error):
                 raise
 
-            def _cull_no_such_file_warnings(index, warning, warnings_count):
-                # type: (int, str, int) -> str
-                index = warnings_count - index
-                self.p4.warnings.pop(index)
-                return warning.replace(" - no such file(s).", "")
-
             # @sharkmob-shea.richardson:
             # fstat has failed, potentially due to one or more of the files
             # not existing on p4. Let's filter those files out of `path`
             # and try fstat again:
-            path = typing.cast(T_StrTuple, path)
-            warnings = tuple(reversed(self.p4.warnings))
-            warnings_count = len(warnings) - 1
-            excluded_paths = (
-                _cull_no_such_file_warnings(index, warning, warnings_count)
-                for index, warning in enumerate(warnings)
-                if "no such file(s)." in warning
-            )  # type: Generator[str, None, None]
-            exclude_data = {path.index(excluded_path): excluded_path for excluded_path in excluded_paths}
-            p4_path = tuple(filter(lambda i: i not in exclude_data.values(), path))
+            path = typing.cast(T_StrTuple, make_tuple_if_not(path))
+            missing_paths = self._get_paths_from_warnings(self.p4.warnings, " - no such file(s).")
+            missing_indices = [index for index, _path in enumerate(path) if _path in missing_paths]
+            p4_path = tuple(_path for _path in path if _path not in missing_paths)
             stat: list[dict[str, Any]] = self.p4.run_fstat([args, p4_path]) if p4_path else []
 
             # @sharkmob-shea.richardson:
@@ -1604,9 +2215,7 @@ class P4ConnectionManager:
             # the files that don't exist in perforce to allow
             # the results to be mapped correctly when returned
             # from __connect__
-            empty_dict = {}
-            for index in sorted((exclude_data.keys())):
-                stat.insert(index, empty_dict)
+            stat = self._merge_missing_results(stat, missing_indices, {})
 
         return stat
 
@@ -1687,28 +2296,9 @@ class P4ConnectionManager:
             files.append(_path)
 
         if folders:
-            def _is_folder_latest(folder):
-                # type: (str) -> bool | None
-                # @sharkmob-shea.richardson
-                # We have to test each folder individually else P4
-                # condenses all the returned statistics into one.
-                # This makes it impossible to work out which folders
-                # need syncing and which do not.
-                try:
-                    sync_result = self.p4.run_sync(("-N"), folder)[0]
-                except Exception as error:
-                    if not self._is_p4_exception(error):
-                        raise
-
-                    return None
-
-                change_count_str = sync_result.split("=")[1]  # type: str
-                change_count_str = change_count_str.split(",")[0]
-                change_counts = (bool(int(value)) for value in change_count_str.split("/"))
-                return not any(change_counts)
-
-            for folder in folders:
-                result[folder] = _is_folder_latest(folder)
+            freshness = self._connect_get_folder_freshness(folders)
+            for folder, folder_freshness in zip(folders, freshness):
+                result[folder] = None if folder_freshness is None else folder_freshness.is_latest
 
         stat = self._connect_get_stat(files)
         valid_states = {"add", "move/add", "edit"}
@@ -1778,7 +2368,8 @@ class P4ConnectionManager:
         for source, target in zip(path, target_path):
             _args = args.copy()
             _args.extend((source, target))
-            result = self.p4.run_move(_args)
+            with self._stat_cache.invalidating((source, target)):
+                result = self.p4.run_move(_args)
             move_result.append(result[0])
 
         result = self._process_result(
@@ -1791,7 +2382,8 @@ class P4ConnectionManager:
         return result
 
     def _connect_revert(self, path: T_PthStrLst) -> list[bool] | None:
-        revert_result: list[dict[str, Any]] = self.p4.run_revert(path)
+        with self._stat_cache.invalidating(path):
+            revert_result: list[dict[str, Any]] = self.p4.run_revert(path)
         _revert_result = (data for data in revert_result if data["clientFile"] in path or data["depotFile"] in path)
         result = self._process_result(
             _revert_result,
@@ -1806,28 +2398,32 @@ class P4ConnectionManager:
         return result
 
     def _connect_set_attribute(self, path: T_PthStrLst, name: str, value: Any):
-        attrubute_result = self.p4.run_attribute(("-n", name, "-v", value), path)
+        with self._stat_cache.invalidating(path):
+            attrubute_result = self.p4.run_attribute(("-n", name, "-v", value), path)
         result = self._process_result(attrubute_result, "status", "set")
         return result
 
     def _connect_submit_change_list(self, change_description: str) -> int | None:
         change_list_spec = self._connect_get_existing_change_list(change_description)
-        result = self.p4.run_submit(change_list_spec)
+        with self._stat_cache.invalidating(change_list_spec.get("Files")):
+            result = self.p4.run_submit(change_list_spec)
+        self._change_index.remove(*self._get_change_index_key(), int(change_list_spec["Change"]))
         if not result:
             return None
 
         return int(result[0]["change"])
 
-    def _connect_sync(self, path):
+    def _connect_sync(self, path, parallel=None):
         """
         Synonym for get_latest
         """
 
-        return self._connect_get_latest(path)
+        return self._connect_get_latest(path, parallel=parallel)
 
     def _connect_unsync(self, path: T_PthStrLst):
         _path = [f"{p}#none" for p in path] if isinstance(path, (list, tuple)) else f"{path}#none"
-        sync_result = self.p4.run_sync(_path)
+        with self._stat_cache.invalidating(path):
+            sync_result = self.p4.run_sync(_path)
         result = self._process_result(sync_result, "action", "deleted")
         return result
 
@@ -1838,12 +2434,242 @@ class P4ConnectionManager:
 
         change_list_spec["Description"] = new_description
         change_result = self.p4.save_change(change_list_spec)
+        self._change_index.set(
+            *self._get_change_index_key(),
+            int(change_list_spec["Change"]),
+            new_description,
+            change_list_spec.get("Files"),
+        )
         result = self._process_result(
             change_result, "", "", true_pattern=f"Change {change_list_spec['Change']} updated."
         )
         return result
 
     # Public Methods:
+    def configure_stat_cache(self, ttl: float | None = None, max_size: int | None = None) -> None:
+        """
+        Set the time in seconds that fstat results are cached for and the
+        maximum number of cached results. A `ttl` of 0 disables the cache.
+        """
+
+        if ttl is not None:
+            self._stat_cache.ttl = ttl
+            if not ttl:
+                self._stat_cache.clear()
+
+        if max_size is not None:
+            self._stat_cache.max_size = max_size
+
+    def configure_parallel_sync(
+        self,
+        enabled: bool | None = None,
+        threads: int | None = None,
+        batch: int | None = None,
+        batch_size: int | None = None,
+        min_size: int | None = None,
+    ) -> None:
+        """
+        Set the default parallel sync options used by `get_latest`,
+        `get_revision` and `sync` when none are passed to them.
+        """
+
+        options = {
+            "enabled": enabled, "threads": threads, "batch": batch, "batch_size": batch_size, "min_size": min_size
+        }
+        for name, value in options.items():
+            if value is not None:
+                setattr(self._parallel_sync, name, value)
+
+    def clear_stat_cache(self) -> None:
+        self._stat_cache.clear()
+
+    def get_stat_cache_info(self) -> p4_cache.StatCacheInfo:
+        """
+        Get the hit and miss counts, size and settings of the stat cache.
+        """
+
+        return self._stat_cache.info()
+
+    def _iter_records(
+        self,
+        command: str,
+        path: P4PathType,
+        args: P4ArgsType = None,
+        record_filter: Callable[[dict[str, Any]], bool] | None = None,
+        workspace_override: str | None = None,
+        revision: int | str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream the tagged records of `p4 <command> [args] path[@revision]`,
+        running the command once per workspace that owns the given paths.
+
+        The records are streamed on a connection leased from the pool for
+        the duration of the iteration, so other api calls can still be made
+        whilst iterating. Closing the generator, or setting the event of
+        `cancellable`, cancels the command.
+        """
+
+        paths = self._get_clean_p4_paths(make_tuple_if_not(path))
+        if not paths:
+            return
+
+        # Resolve the workspaces up front, so the manager's own
+        # connection isn't held whilst the records are being consumed:
+        with self.__connect__() as p4:
+            if p4 is None:
+                return
+
+            if workspace_override:
+                paths_by_workspace = {workspace_override: list(paths)}
+            else:
+                index = self._workspace_root_index
+                paths_by_workspace = {}  # type: dict[str, list[str]]
+                for _path in paths:
+                    workspace = index.get_workspace(_path) or p4.client
+                    paths_by_workspace.setdefault(workspace, []).append(_path)
+
+        args = list(args or [])
+        for workspace, workspace_paths in paths_by_workspace.items():
+            if revision is not None:
+                workspace_paths = [f"{_path}@{revision}" for _path in workspace_paths]
+
+            with self._connection_pool.lease() as p4:
+                p4.client = workspace
+                if self._progress_handler is not None:
+                    p4.progress = self._progress_handler
+
+                # The stream is the connection's output handler whilst it runs,
+                # so it checks the manager's cancel event (see `cancellable`):
+                stream = p4_stream.P4RecordStream(
+                    p4,
+                    command,
+                    (args, workspace_paths),
+                    record_filter=record_filter,
+                    cancel_event=self._cancel_event,
+                )
+                yield from stream
+
+    def iter_stat(
+        self,
+        path: P4PathType,
+        args: P4ArgsType = None,
+        record_filter: Callable[[dict[str, Any]], bool] | None = None,
+        workspace_override: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterate the fstat records of the given paths (i.e. `//depot/folder/...`),
+        only yielding the records for which `record_filter` returns True.
+        Unlike `get_stat`, paths that don't exist on the server are skipped.
+        """
+
+        return self._iter_records(
+            "fstat", path, args=args, record_filter=record_filter, workspace_override=workspace_override
+        )
+
+    def iter_files(
+        self,
+        path: P4PathType,
+        args: P4ArgsType = None,
+        record_filter: Callable[[dict[str, Any]], bool] | None = None,
+        workspace_override: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterate the `p4 files` records of the given paths,
+        only yielding the records for which `record_filter` returns True.
+        """
+
+        return self._iter_records(
+            "files", path, args=args, record_filter=record_filter, workspace_override=workspace_override
+        )
+
+    def iter_sync(
+        self,
+        path: P4PathType,
+        args: P4ArgsType = None,
+        record_filter: Callable[[dict[str, Any]], bool] | None = None,
+        workspace_override: str | None = None,
+        parallel: P4ParallelSync | dict[str, Any] | bool | None = None,
+        revision: int | str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Sync the given paths, to `revision` if given (i.e. a change number),
+        yielding a record for each file as it is synced.
+        Closing the generator early cancels the rest of the sync.
+        """
+
+        paths = make_tuple_if_not(path)
+        args = self._get_sync_args(parallel) + list(args or [])
+        with self._stat_cache.invalidating(paths):
+            yield from self._iter_records(
+                "sync",
+                paths,
+                args=args,
+                record_filter=record_filter,
+                workspace_override=workspace_override,
+                revision=revision,
+            )
+
+    @contextmanager
+    def using_progress(self, progress_handler: P4.Progress) -> Iterator[None]:
+        """
+        Context manager that reports the progress of the p4 commands run
+        by this manager (including streamed ones) to `progress_handler`.
+        """
+
+        previous_handler = self._progress_handler
+        self._progress_handler = progress_handler
+        if self._p4 is not None:
+            self._p4.progress = progress_handler
+
+        try:
+            yield
+        finally:
+            self._progress_handler = previous_handler
+            if self._p4 is not None:
+                self._p4.progress = previous_handler
+
+    @contextmanager
+    def holding_connection(self) -> Iterator[P4.P4 | None]:
+        """
+        Context manager that holds one leased connection for all the p4
+        commands run by this manager in the body, rather than leasing a
+        connection for each of them, yielding the leased p4 instance.
+        """
+
+        with self.__connect__() as p4:
+            previous_depth = self._held_depth
+            self._held_depth = self._connection_depth
+            try:
+                yield p4
+            finally:
+                self._held_depth = previous_depth
+
+    @contextmanager
+    def cancellable(self, event: threading.Event) -> Iterator[None]:
+        """
+        Context manager that cancels the p4 commands run by this manager
+        once `event` is set (i.e. from another thread), raising
+        a `P4CancelledError` when the body finishes.
+        """
+
+        if event.is_set():
+            raise p4_errors.P4CancelledError("Cancelled before it started")
+
+        previous_event = self._cancel_event
+        self._cancel_event = event
+        if self._p4 is not None:
+            self._p4.handler = p4_stream.P4CancelHandler(event)
+
+        try:
+            yield
+        finally:
+            self._cancel_event = previous_event
+            if self._p4 is not None:
+                self._p4.handler = p4_stream.P4CancelHandler(previous_event) if previous_event else None
+
+        if event.is_set():
+            raise p4_errors.P4CancelledError("Cancelled")
+
     @contextmanager
     def workspace_as(self, workspace: str) -> Iterator[None]:
         """Context manager that connects to if not already connected p4,
@@ -1883,25 +2709,51 @@ class P4ConnectionManager:
             return False
 
 
+_stat_cache = p4_cache.P4StatCache()
+_parallel_sync = P4ParallelSync()
+_workspace_index = p4_workspace_index.P4WorkspaceRootIndex()
+_client_views = p4_client_view.P4ClientViewCache()
+_change_index = p4_change_index.P4PendingChangeIndex()
+_change_files_cache = p4_describe_cache.P4ChangeFilesCache()
 _connection_manager = None
+_connection_manager_lock = threading.Lock()
+_thread_local = threading.local()
 
 
 def _get_connection_manager() -> P4ConnectionManager:
-    # this doesn't work with REST api where thread is not main
-    #if threading.current_thread() is not threading.main_thread():
-        # # Generate a new P4ConnectionManager per thread:
-        # return P4ConnectionManager()
+    """
+    Get the P4ConnectionManager for the current thread.
+
+    The main thread uses the module level P4ConnectionManager, any other
+    thread (i.e. the REST api workers) gets its own P4ConnectionManager,
+    as the result and error state of a manager is per call and must not be
+    shared between concurrent calls.
+    All the managers share the main manager's connection pool, so the
+    login settings and warm connections are shared between threads.
+    """
 
     global _connection_manager
-    if _connection_manager is None:
-        _connection_manager = P4ConnectionManager()
+    with _connection_manager_lock:
+        if _connection_manager is None:
+            _connection_manager = P4ConnectionManager()
+
+    if threading.current_thread() is threading.main_thread():
+        return _connection_manager
+
+    connection_manager = getattr(_thread_local, "connection_manager", None)
+    if connection_manager is None:
+        connection_manager = P4ConnectionManager(
+            connection_pool=_connection_manager.connection_pool
+        )
+        _thread_local.connection_manager = connection_manager
 
-    return _connection_manager
+    return connection_manager
 
 
 __all__ = (
     "_get_connection_manager",
     "P4ConnectionManager",
+    "P4ParallelSync",
     "P4PathDateData",
     "exceptions",  # type: ignore
     "login",  # type: ignore
@@ -1913,7 +2765,14 @@ __all__ = (
     "delete_change_list",  # type: ignore
     "exceptions",  # type: ignore
     "get_attribute",  # type: ignore
+    "cancellable",  # type: ignore
+    "holding_connection",  # type: ignore
     "checked_out_by",  # type: ignore
+    "clear_clients_cache",  # type: ignore
+    "clear_stat_cache",  # type: ignore
+    "configure_parallel_sync",  # type: ignore
+    "configure_stat_cache",  # type: ignore
+    "get_change_files",  # type: ignore
     "get_changes",  # type: ignore
     "get_last_change_list",  # type: ignore
     "get_change_list_number",  # type: ignore
@@ -1923,6 +2782,7 @@ __all__ = (
     "get_current_server_revision",  # type: ignore
     "get_existing_change_list",  # type: ignore
     "get_files",  # type: ignore
+    "get_folder_freshness",  # type: ignore
     "get_info",  # type: ignore
     "get_latest",  # type: ignore
     "get_local_path",  # type: ignore
@@ -1932,6 +2792,7 @@ __all__ = (
     "get_revision_history",  # type: ignore
     "get_server_path",  # type: ignore
     "get_stat",  # type: ignore
+    "get_stat_cache_info",  # type: ignore
     "get_streams",  # type: ignore
     "get_user_name",  # type: ignore
     "get_workspaces",  # type: ignore
@@ -1941,6 +2802,9 @@ __all__ = (
     "is_latest",  # type: ignore
     "is_offline",  # type: ignore
     "is_stream_valid",  # type: ignore
+    "iter_files",  # type: ignore
+    "iter_stat",  # type: ignore
+    "iter_sync",  # type: ignore
     "move",  # type: ignore
     "revert",  # type: ignore
     "run_command",  # type: ignore
@@ -1950,6 +2814,7 @@ __all__ = (
     "test_connection",  # type: ignore
     "unsync",  # type: ignore
     "update_change_list_description",  # type: ignore
+    "using_progress",  # type: ignore
     "workspace_as",  # type: ignore
 )
 
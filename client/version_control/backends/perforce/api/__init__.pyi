@@ -1,13 +1,18 @@
 import dataclasses
 import datetime
 import pathlib
+import threading
 from contextlib import contextmanager
-from typing import Any, Iterator, Iterable, Union, overload
+from typing import Any, Callable, Iterator, Iterable, Union, overload
 from typing_extensions import Literal
 
+import P4
 import qtpy import QtCore
 
+from . import p4_cache
 from . import p4_errors
+from . import p4_freshness
+from . import p4_pool
 
 
 class P4ConnectionManagerSignaller(QtCore.QObject):
@@ -24,8 +29,25 @@ class P4PathDateData:
         ...
 
 
+@dataclasses.dataclass
+class P4ParallelSync:
+    enabled: bool = False
+    threads: int = 4
+    batch: int = 8
+    batch_size: int = 0
+    min_size: int = 0
+
+    @classmethod
+    def from_value(cls, value: P4ParallelSync | dict[str, Any] | bool | None) -> P4ParallelSync | None:
+        ...
+
+    def to_arg(self) -> str | None:
+        ...
+
+
 class P4ConnectionManager:
     _signaller: P4ConnectionManagerSignaller = ...
+    clients_cache_ttl: float = ...
 
     @property
     def is_offline(self) -> bool:
@@ -39,6 +61,12 @@ class P4ConnectionManager:
         """
         ...
 
+    @property
+    def connection_pool(self) -> p4_pool.P4ConnectionPool:
+        """ The pool of warm p4 connections leased to each top level call.
+        """
+        ...
+
     @overload
     def add(
         self,
@@ -539,6 +567,73 @@ class P4ConnectionManager:
     ) -> dict[str, int | None]:
         ...
 
+    def get_change_files(
+        self,
+        change: int,
+        offset: int = 0,
+        limit: int | None = None,
+        workspace_override: str | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Get a page of the files of a change list, as listed by `p4 describe -s`.
+        The files of submitted change lists are cached, as they never change,
+        so paging through a large change list only describes it once.
+
+        Arguments:
+        ----------
+            - `change`: The change list number.
+            - `offset` (optional): The index of the first file of the page.
+            - `limit` (optional): The maximum number of files of the page,
+                if `None` all the files from `offset` are returned.
+            - `workspace_override` (optional): If provided, uses the specific workspace
+                to first run the command under. If `None`, will use the current workspace
+                define by the local perforce settings. If the function fails, will
+                iterate over all other workspaces, running the function to see
+                if it will run successfully.
+                Defaults to `None`
+
+        Returns:
+        --------
+            - A dictionary with the `change` number, the `files` of the page (each with its
+                `depotFile`, `action`, `rev` and `type`), the page's `offset` and the `total`
+                number of files of the change list. `None` if the change list has no record.
+        """
+        ...
+
+    def get_changes(
+        self,
+        file_spec: str | None = None,
+        since: int | None = None,
+        before: int | None = None,
+        limit: int | None = None,
+        workspace_override: str | None = None
+    ) -> list[dict[str, Any]] | None:
+        """
+        Get the submitted change lists, newest first. The scope and the paging are
+        applied by the server, so only the requested change lists are transferred.
+
+        Arguments:
+        ----------
+            - `file_spec` (optional): Only get the change lists that affect the files of this p4
+                file spec, i.e. `//streams/main/...` for the changes of a stream.
+            - `since` (optional): Only get the change lists newer than this change number,
+                for refreshing a list of changes that is already known.
+            - `before` (optional): Only get the change lists older than this change number,
+                which is the cursor of the next (older) page of changes.
+            - `limit` (optional): The maximum number of change lists to get.
+            - `workspace_override` (optional): If provided, uses the specific workspace
+                to first run the command under. If `None`, will use the current workspace
+                define by the local perforce settings. If the function fails, will
+                iterate over all other workspaces, running the function to see
+                if it will run successfully.
+                Defaults to `None`
+
+        Returns:
+        --------
+            - A list of the change list records, `None` if there are no matching change lists.
+        """
+        ...
+
     def get_existing_change_list(
         self,
         description: str,
@@ -613,6 +708,46 @@ class P4ConnectionManager:
     ) -> dict[str, tuple[pathlib.Path]]:
         ...
 
+    @overload
+    def get_folder_freshness(
+        self,
+        path: str | pathlib.Path,
+        workspace_override: str | None = None
+    ) -> p4_freshness.P4FolderFreshness | None:
+        """
+        Get how far behind the server the files under the given folder(s) are,
+        using a single fstat query for all the folders.
+
+        Arguments:
+        ----------
+            - `path`: The folder path(s) to query, must end with `...`.
+            - `workspace_override` (optional): If provided, uses the specific workspace
+                to first run the command under. If `None`, will use the current workspace
+                define by the local perforce settings. If the function fails, will
+                iterate over all other workspaces, running the function to see
+                if it will run successfully.
+                Defaults to `None`
+
+        Returns:
+        --------
+            - If a single folder is provided:
+                A `P4FolderFreshness` with the number of files a sync would add,
+                update and delete and the number of bytes it would transfer,
+                or `None` if the folder does not exist on the server.
+            - If a list of folders are provided:
+                A dictionary where each key is the path and each value is
+                a `P4FolderFreshness` or `None`.
+        """
+        ...
+
+    @overload
+    def get_folder_freshness(
+        self,
+        path: Iterable[str | pathlib.Path],
+        workspace_override: str | None = None
+    ) -> dict[str, p4_freshness.P4FolderFreshness | None]:
+        ...
+
     @overload
     def get_files_in_folder_in_date_order(
         self,
@@ -677,6 +812,7 @@ class P4ConnectionManager:
     def get_latest(
         self,
         path: str | pathlib.Path,
+        parallel: P4ParallelSync | dict[str, Any] | bool | None = None,
         workspace_override: str | None = None
     ) -> bool | None:
         """
@@ -685,6 +821,9 @@ class P4ConnectionManager:
         Arguments:
         ----------
             - `path`: The file path(s) to get latest on.
+            - `parallel` (optional): The `p4 sync --parallel` options, a `P4ParallelSync`,
+                a `parallel_sync` settings dict or a bool. If `None`, uses the options set
+                with `configure_parallel_sync`.
             - `workspace_override` (optional): If provided, uses the specific workspace
                 to first run the command under. If `None`, will use the current workspace
                 define by the local perforce settings. If the function fails, will
@@ -708,6 +847,7 @@ class P4ConnectionManager:
     def get_latest(
         self,
         path: Iterable[str | pathlib.Path],
+        parallel: P4ParallelSync | dict[str, Any] | bool | None = None,
         workspace_override: str | None = None
     ) -> dict[str, bool | None]:
         ...
@@ -865,6 +1005,7 @@ class P4ConnectionManager:
         self,
         path: Iterable[str | pathlib.Path],
         revision: Iterable[int] | int,
+        parallel: P4ParallelSync | dict[str, Any] | bool | None = None,
         workspace_override: str | None = None
     ) -> list[bool]:
         """
@@ -899,6 +1040,7 @@ class P4ConnectionManager:
         self,
         path: str | pathlib.Path,
         revision: int,
+        parallel: P4ParallelSync | dict[str, Any] | bool | None = None,
         workspace_override: str | None = None
     ) -> bool:
         """ """
@@ -1001,6 +1143,102 @@ class P4ConnectionManager:
         """ """
         ...
 
+    def configure_parallel_sync(
+        self,
+        enabled: bool | None = None,
+        threads: int | None = None,
+        batch: int | None = None,
+        batch_size: int | None = None,
+        min_size: int | None = None,
+    ) -> None:
+        """
+        Set the default `p4 sync --parallel` options used by `get_latest`,
+        `get_revision` and `sync` when none are passed to them.
+        Options that are `None` are left unchanged.
+
+        Arguments:
+        ----------
+            - `enabled` (optional): Whether to sync in parallel.
+            - `threads` (optional): The number of threads to transfer files on.
+            - `batch` (optional): The number of files transferred per batch.
+            - `batch_size` (optional): The number of bytes transferred per batch.
+            - `min_size` (optional): The minimum number of bytes a sync must
+                transfer to run in parallel.
+        """
+        ...
+
+    def configure_stat_cache(self, ttl: float | None = None, max_size: int | None = None) -> None:
+        """
+        Configure the fstat cache shared by the read api (`get_stat`, `is_latest`, etc.)
+
+        Arguments:
+        ----------
+            - `ttl` (optional): The time in seconds that fstat results are cached for.
+                A value of `0` disables the cache.
+            - `max_size` (optional): The maximum number of cached fstat results.
+        """
+        ...
+
+    def clear_clients_cache(self) -> None:
+        """
+        Forget the listed clients of the user, so they're listed again on the next call.
+        They're otherwise listed again once older than `clients_cache_ttl` seconds.
+        """
+        ...
+
+    def clear_stat_cache(self) -> None:
+        """
+        Remove all cached fstat results.
+        """
+        ...
+
+    @contextmanager
+    def cancellable(self, event: threading.Event) -> Iterator[None]:
+        """
+        Context manager that cancels the p4 commands run by the connection
+        manager once `event` is set (i.e. from another thread).
+
+        Arguments:
+        ----------
+            - `event`: The event that cancels the running p4 command when set.
+
+        Raises:
+        -------
+            - `P4CancelledError` if `event` is set before the body has finished.
+        """
+        ...
+
+    @contextmanager
+    def holding_connection(self) -> Iterator[P4.P4 | None]:
+        """
+        Context manager that holds one leased connection for all the p4
+        commands run by the connection manager in the body, rather than
+        leasing a connection for each of them.
+
+        Returns:
+        --------
+            The leased p4 instance, `None` if offline.
+        """
+        ...
+
+    @contextmanager
+    def using_progress(self, progress_handler: P4.Progress) -> Iterator[None]:
+        """
+        Context manager that reports the progress of the p4 commands run by the
+        connection manager, including streamed ones, to `progress_handler`.
+
+        Arguments:
+        ----------
+            - `progress_handler`: The `P4.Progress` instance (i.e. a `P4ProgressHandler`).
+        """
+        ...
+
+    def get_stat_cache_info(self) -> p4_cache.StatCacheInfo:
+        """
+        Get the hits, misses, max_size, size and ttl of the fstat cache.
+        """
+        ...
+
     def get_streams(self) -> tuple[str]:
         """
         Get a list of all streams available to the current user and host.
@@ -1225,6 +1463,82 @@ class P4ConnectionManager:
         """
         ...
 
+    def iter_files(
+        self,
+        path: str | pathlib.Path | Iterable[str | pathlib.Path],
+        args: Iterable[str] | None = None,
+        record_filter: Callable[[dict[str, Any]], bool] | None = None,
+        workspace_override: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterate the `p4 files` records of the given paths.
+
+        Arguments:
+        ----------
+            - `path`: The path or paths to query, folders should end with `...`.
+            - `args` (optional): Additional arguments for the p4 command.
+            - `record_filter` (optional): Only yield the records this returns `True` for.
+            - `workspace_override` (optional): Run the command in this workspace.
+
+        Returns:
+        --------
+            - A generator of the p4 records, closing it cancels the command.
+        """
+        ...
+
+    def iter_stat(
+        self,
+        path: str | pathlib.Path | Iterable[str | pathlib.Path],
+        args: Iterable[str] | None = None,
+        record_filter: Callable[[dict[str, Any]], bool] | None = None,
+        workspace_override: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Lazily iterate the fstat records of the given paths.
+        Paths that don't exist on the server are skipped.
+
+        Arguments:
+        ----------
+            - `path`: The path or paths to query, folders should end with `...`.
+            - `args` (optional): Additional arguments for the p4 command.
+            - `record_filter` (optional): Only yield the records this returns `True` for.
+            - `workspace_override` (optional): Run the command in this workspace.
+
+        Returns:
+        --------
+            - A generator of the p4 records, closing it cancels the command.
+        """
+        ...
+
+    def iter_sync(
+        self,
+        path: str | pathlib.Path | Iterable[str | pathlib.Path],
+        args: Iterable[str] | None = None,
+        record_filter: Callable[[dict[str, Any]], bool] | None = None,
+        workspace_override: str | None = None,
+        parallel: P4ParallelSync | dict[str, Any] | bool | None = None,
+        revision: int | str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Sync the given paths, to `revision` if given (i.e. a change number),
+        yielding a record for each file as it is synced.
+        Closing the generator early cancels the rest of the sync.
+
+        Arguments:
+        ----------
+            - `path`: The path or paths to query, folders should end with `...`.
+            - `args` (optional): Additional arguments for the p4 command.
+            - `record_filter` (optional): Only yield the records this returns `True` for.
+            - `workspace_override` (optional): Run the command in this workspace.
+            - `parallel` (optional): The parallel sync options, see `get_latest`.
+            - `revision` (optional): The revision or change number to sync to, the latest if `None`.
+
+        Returns:
+        --------
+            - A generator of the p4 records, closing it cancels the command.
+        """
+        ...
+
     @overload
     def move(
         self,
@@ -1557,6 +1871,23 @@ def delete_change_list(
     ...
 
 
+@contextmanager
+def cancellable(event: threading.Event) -> Iterator[None]:
+    """
+    Context manager that cancels the p4 commands run by the connection
+    manager once `event` is set (i.e. from another thread).
+
+    Arguments:
+    ----------
+        - `event`: The event that cancels the running p4 command when set.
+
+    Raises:
+    -------
+        - `P4CancelledError` if `event` is set before the body has finished.
+    """
+    ...
+
+
 @overload
 def checked_out_by(
     path: str | pathlib.Path,
@@ -1836,6 +2167,73 @@ def get_current_server_revision(
     ...
 
 
+def get_change_files(
+    change: int,
+    offset: int = 0,
+    limit: int | None = None,
+    workspace_override: str | None = None
+) -> dict[str, Any] | None:
+    """
+    Get a page of the files of a change list, as listed by `p4 describe -s`.
+    The files of submitted change lists are cached, as they never change,
+    so paging through a large change list only describes it once.
+
+    Arguments:
+    ----------
+        - `change`: The change list number.
+        - `offset` (optional): The index of the first file of the page.
+        - `limit` (optional): The maximum number of files of the page,
+            if `None` all the files from `offset` are returned.
+        - `workspace_override` (optional): If provided, uses the specific workspace
+            to first run the command under. If `None`, will use the current workspace
+            define by the local perforce settings. If the function fails, will
+            iterate over all other workspaces, running the function to see
+            if it will run successfully.
+            Defaults to `None`
+
+    Returns:
+    --------
+        - A dictionary with the `change` number, the `files` of the page (each with its
+            `depotFile`, `action`, `rev` and `type`), the page's `offset` and the `total`
+            number of files of the change list. `None` if the change list has no record.
+    """
+    ...
+
+
+def get_changes(
+    file_spec: str | None = None,
+    since: int | None = None,
+    before: int | None = None,
+    limit: int | None = None,
+    workspace_override: str | None = None
+) -> list[dict[str, Any]] | None:
+    """
+    Get the submitted change lists, newest first. The scope and the paging are
+    applied by the server, so only the requested change lists are transferred.
+
+    Arguments:
+    ----------
+        - `file_spec` (optional): Only get the change lists that affect the files of this p4
+            file spec, i.e. `//streams/main/...` for the changes of a stream.
+        - `since` (optional): Only get the change lists newer than this change number,
+            for refreshing a list of changes that is already known.
+        - `before` (optional): Only get the change lists older than this change number,
+            which is the cursor of the next (older) page of changes.
+        - `limit` (optional): The maximum number of change lists to get.
+        - `workspace_override` (optional): If provided, uses the specific workspace
+            to first run the command under. If `None`, will use the current workspace
+            define by the local perforce settings. If the function fails, will
+            iterate over all other workspaces, running the function to see
+            if it will run successfully.
+            Defaults to `None`
+
+    Returns:
+    --------
+        - A list of the change list records, `None` if there are no matching change lists.
+    """
+    ...
+
+
 def get_existing_change_list(
     description: str,
     workspace_override: str | None = None
@@ -1910,6 +2308,46 @@ def get_files(
     ...
 
 
+@overload
+def get_folder_freshness(
+    path: str | pathlib.Path,
+    workspace_override: str | None = None
+) -> p4_freshness.P4FolderFreshness | None:
+    """
+    Get how far behind the server the files under the given folder(s) are,
+    using a single fstat query for all the folders.
+
+    Arguments:
+    ----------
+        - `path`: The folder path(s) to query, must end with `...`.
+        - `workspace_override` (optional): If provided, uses the specific workspace
+            to first run the command under. If `None`, will use the current workspace
+            define by the local perforce settings. If the function fails, will
+            iterate over all other workspaces, running the function to see
+            if it will run successfully.
+            Defaults to `None`
+
+    Returns:
+    --------
+        - If a single folder is provided:
+            A `P4FolderFreshness` with the number of files a sync would add,
+            update and delete and the number of bytes it would transfer,
+            or `None` if the folder does not exist on the server.
+        - If a list of folders are provided:
+            A dictionary where each key is the path and each value is
+            a `P4FolderFreshness` or `None`.
+    """
+    ...
+
+
+@overload
+def get_folder_freshness(
+    path: Iterable[str | pathlib.Path],
+    workspace_override: str | None = None
+) -> dict[str, p4_freshness.P4FolderFreshness | None]:
+    ...
+
+
 @overload
 def get_files_in_folder_in_date_order(
     path: str | pathlib.Path,
@@ -1974,6 +2412,7 @@ def get_info() -> Any:
 @overload
 def get_latest(
     path: str | pathlib.Path,
+    parallel: P4ParallelSync | dict[str, Any] | bool | None = None,
     workspace_override: str | None = None
 ) -> bool | None:
     """
@@ -1982,6 +2421,9 @@ def get_latest(
     Arguments:
     ----------
         - `path`: The file path(s) to get latest on.
+        - `parallel` (optional): The `p4 sync --parallel` options, a `P4ParallelSync`,
+            a `parallel_sync` settings dict or a bool. If `None`, uses the options set
+            with `configure_parallel_sync`.
         - `workspace_override` (optional): If provided, uses the specific workspace
             to first run the command under. If `None`, will use the current workspace
             define by the local perforce settings. If the function fails, will
@@ -2005,6 +2447,7 @@ def get_latest(
 @overload
 def get_latest(
     path: Iterable[str | pathlib.Path],
+    parallel: P4ParallelSync | dict[str, Any] | bool | None = None,
     workspace_override: str | None = None
 ) -> dict[str, bool | None]:
     ...
@@ -2161,6 +2604,7 @@ def get_path_info(
 def get_revision(
     path: Iterable[str | pathlib.Path],
     revision: Iterable[int] | int,
+    parallel: P4ParallelSync | dict[str, Any] | bool | None = None,
     workspace_override: str | None = None
 ) -> list[bool]:
     """
@@ -2195,6 +2639,7 @@ def get_revision(
 def get_revision(
     path: str | pathlib.Path,
     revision: int,
+    parallel: P4ParallelSync | dict[str, Any] | bool | None = None,
     workspace_override: str | None = None
 ) -> bool:
     """ """
@@ -2298,6 +2743,65 @@ def get_stat(
     ...
 
 
+def configure_parallel_sync(
+    enabled: bool | None = None,
+    threads: int | None = None,
+    batch: int | None = None,
+    batch_size: int | None = None,
+    min_size: int | None = None,
+) -> None:
+    """
+    Set the default `p4 sync --parallel` options used by `get_latest`,
+    `get_revision` and `sync` when none are passed to them.
+    Options that are `None` are left unchanged.
+
+    Arguments:
+    ----------
+        - `enabled` (optional): Whether to sync in parallel.
+        - `threads` (optional): The number of threads to transfer files on.
+        - `batch` (optional): The number of files transferred per batch.
+        - `batch_size` (optional): The number of bytes transferred per batch.
+        - `min_size` (optional): The minimum number of bytes a sync must
+            transfer to run in parallel.
+    """
+    ...
+
+
+def configure_stat_cache(ttl: float | None = None, max_size: int | None = None) -> None:
+    """
+    Configure the fstat cache shared by the read api (`get_stat`, `is_latest`, etc.)
+
+    Arguments:
+    ----------
+        - `ttl` (optional): The time in seconds that fstat results are cached for.
+            A value of `0` disables the cache.
+        - `max_size` (optional): The maximum number of cached fstat results.
+    """
+    ...
+
+
+def clear_clients_cache() -> None:
+    """
+    Forget the listed clients of the user, so they're listed again on the next call.
+    They're otherwise listed again once older than `clients_cache_ttl` seconds.
+    """
+    ...
+
+
+def clear_stat_cache() -> None:
+    """
+    Remove all cached fstat results.
+    """
+    ...
+
+
+def get_stat_cache_info() -> p4_cache.StatCacheInfo:
+    """
+    Get the hits, misses, max_size, size and ttl of the fstat cache.
+    """
+    ...
+
+
 def get_streams() -> tuple[str]:
     """
     Get a list of all streams available to the current user and host.
@@ -2519,6 +3023,82 @@ def is_stream_valid(stream: str) -> bool:
     ...
 
 
+def iter_files(
+    path: str | pathlib.Path | Iterable[str | pathlib.Path],
+    args: Iterable[str] | None = None,
+    record_filter: Callable[[dict[str, Any]], bool] | None = None,
+    workspace_override: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Lazily iterate the `p4 files` records of the given paths.
+
+    Arguments:
+    ----------
+        - `path`: The path or paths to query, folders should end with `...`.
+        - `args` (optional): Additional arguments for the p4 command.
+        - `record_filter` (optional): Only yield the records this returns `True` for.
+        - `workspace_override` (optional): Run the command in this workspace.
+
+    Returns:
+    --------
+        - A generator of the p4 records, closing it cancels the command.
+    """
+    ...
+
+
+def iter_stat(
+    path: str | pathlib.Path | Iterable[str | pathlib.Path],
+    args: Iterable[str] | None = None,
+    record_filter: Callable[[dict[str, Any]], bool] | None = None,
+    workspace_override: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Lazily iterate the fstat records of the given paths.
+    Paths that don't exist on the server are skipped.
+
+    Arguments:
+    ----------
+        - `path`: The path or paths to query, folders should end with `...`.
+        - `args` (optional): Additional arguments for the p4 command.
+        - `record_filter` (optional): Only yield the records this returns `True` for.
+        - `workspace_override` (optional): Run the command in this workspace.
+
+    Returns:
+    --------
+        - A generator of the p4 records, closing it cancels the command.
+    """
+    ...
+
+
+def iter_sync(
+    path: str | pathlib.Path | Iterable[str | pathlib.Path],
+    args: Iterable[str] | None = None,
+    record_filter: Callable[[dict[str, Any]], bool] | None = None,
+    workspace_override: str | None = None,
+    parallel: P4ParallelSync | dict[str, Any] | bool | None = None,
+    revision: int | str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Sync the given paths, to `revision` if given (i.e. a change number),
+    yielding a record for each file as it is synced.
+    Closing the generator early cancels the rest of the sync.
+
+    Arguments:
+    ----------
+        - `path`: The path or paths to query, folders should end with `...`.
+        - `args` (optional): Additional arguments for the p4 command.
+        - `record_filter` (optional): Only yield the records this returns `True` for.
+        - `workspace_override` (optional): Run the command in this workspace.
+        - `parallel` (optional): The parallel sync options, see `get_latest`.
+        - `revision` (optional): The revision or change number to sync to, the latest if `None`.
+
+    Returns:
+    --------
+        - A generator of the p4 records, closing it cancels the command.
+    """
+    ...
+
+
 @overload
 def move(
     path: str | pathlib.Path,
@@ -2661,7 +3241,11 @@ def submit_change_list(name: str) -> int | None:
 
 
 @overload
-def sync(path: str | pathlib.Path, workspace_override: str | None = None) -> bool:
+def sync(
+    path: str | pathlib.Path,
+    parallel: P4ParallelSync | dict[str, Any] | bool | None = None,
+    workspace_override: str | None = None
+) -> bool:
     """
     Synonym for get_latest
     """
@@ -2669,7 +3253,11 @@ def sync(path: str | pathlib.Path, workspace_override: str | None = None) -> boo
 
 
 @overload
-def sync(path: Iterable[str | pathlib.Path], workspace_override: str | None = None) -> dict[str, bool]:
+def sync(
+    path: Iterable[str | pathlib.Path],
+    parallel: P4ParallelSync | dict[str, Any] | bool | None = None,
+    workspace_override: str | None = None
+) -> dict[str, bool]:
     ...
 
 
@@ -2743,6 +3331,33 @@ def update_change_list_description(
     ...
 
 
+@contextmanager
+def holding_connection() -> Iterator[P4.P4 | None]:
+    """
+    Context manager that holds one leased connection for all the p4
+    commands run by the connection manager in the body, rather than
+    leasing a connection for each of them.
+
+    Returns:
+    --------
+        The leased p4 instance, `None` if offline.
+    """
+    ...
+
+
+@contextmanager
+def using_progress(progress_handler: P4.Progress) -> Iterator[None]:
+    """
+    Context manager that reports the progress of the p4 commands run by the
+    connection manager, including streamed ones, to `progress_handler`.
+
+    Arguments:
+    ----------
+        - `progress_handler`: The `P4.Progress` instance (i.e. a `P4ProgressHandler`).
+    """
+    ...
+
+
 @contextmanager
 def workspace_as(workspace: str) -> Iterator[None]:
     """
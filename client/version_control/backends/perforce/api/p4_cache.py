@@ -0,0 +1,191 @@
+"""
+A short lived cache of `p4 fstat` results.
+
+Most of the read api (`is_latest`, `checked_out_by`, `exists_on_server`, etc.)
+is built on `get_stat`, and a single DCC operation will often query the
+same file several times in quick succession. Caching the results for a
+few seconds avoids repeating identical server round trips, whilst any
+api call that modifies a file invalidates the cached results for it.
+"""
+from __future__ import annotations
+
+import collections
+import threading
+import time
+
+from contextlib import contextmanager
+
+_typing = False
+if _typing:
+    from typing import Any
+    from typing import Iterable
+    from typing import Iterator
+
+    # The `(port, client)`, normalized path and fstat args of a record:
+    StatCacheKey = tuple[tuple[str, str] | None, str, tuple[str, ...]]
+del _typing
+
+
+StatCacheInfo = collections.namedtuple(
+    "StatCacheInfo", ("hits", "misses", "max_size", "size", "ttl")
+)
+
+# Paths containing these can match multiple files or
+# specific revisions, so their results are never cached:
+_UNCACHEABLE_TOKENS = ("...", "*", "@", "#", "%%")
+
+
+class P4StatCache:
+    """
+    A thread safe, bounded LRU cache of fstat records keyed by server,
+    path and fstat arguments, where each record expires `ttl` seconds after
+    it was cached. A `ttl` of 0 disables the cache.
+
+    The server is the `(port, client)` of the connection that ran the fstat,
+    as the same local path has different records on another server or
+    in another workspace.
+
+    Each record is indexed by the path it was queried with as well as its
+    `depotFile` and `clientFile`, so it can be invalidated by either
+    its local or depot path.
+    """
+
+    def __init__(self, max_size: int = 4096, ttl: float = 5.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: collections.OrderedDict[
+            StatCacheKey, tuple[float, dict[str, Any], tuple[str, ...]]
+        ] = collections.OrderedDict()
+        self._keys_by_alias: dict[str, set[StatCacheKey]] = {}
+        self._lock = threading.RLock()
+
+    # Private Methods:
+    @staticmethod
+    def _normalize(path: Any) -> str:
+        return str(path).replace("\\", "/").lower()
+
+    def _make_key(self, path: str, args: Iterable[str], server: tuple[str, str] | None) -> StatCacheKey:
+        return server, self._normalize(path), tuple(str(arg) for arg in args)
+
+    def _pop_entry(self, key: StatCacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        for alias in entry[2]:
+            keys = self._keys_by_alias.get(alias)
+            if keys is None:
+                continue
+
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_alias[alias]
+
+    # Public Methods:
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @classmethod
+    def is_cacheable(cls, path: str) -> bool:
+        return not any(token in path for token in _UNCACHEABLE_TOKENS)
+
+    def get(
+        self, path: str, args: Iterable[str], server: tuple[str, str] | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Get the cached fstat record for the given path and fstat args,
+        as queried on the given `(port, client)`.
+        An empty dict is a cached record of a file that does not
+        exist on the server, `None` means there is no cached record.
+        """
+
+        key = self._make_key(path, args, server)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            cached_time, data, _ = entry
+            if time.monotonic() - cached_time > self.ttl:
+                self._pop_entry(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def set(
+        self, path: str, args: Iterable[str], data: dict[str, Any], server: tuple[str, str] | None = None
+    ) -> None:
+        if not self.enabled:
+            return
+
+        key = self._make_key(path, args, server)
+        aliases = {key[1]}
+        for alias_key in ("depotFile", "clientFile"):
+            if data and alias_key in data:
+                aliases.add(self._normalize(data[alias_key]))
+
+        with self._lock:
+            self._pop_entry(key)
+            self._entries[key] = (time.monotonic(), data, tuple(aliases))
+            for alias in aliases:
+                self._keys_by_alias.setdefault(alias, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                self._pop_entry(next(iter(self._entries)))
+
+    def invalidate(self, paths: Iterable[str] | str | None) -> None:
+        """
+        Remove the cached records of the given local or depot paths, on every server.
+        Folder paths (ending with `...`) invalidate every record under them.
+        """
+
+        if not paths:
+            return
+
+        if isinstance(paths, str):
+            paths = (paths,)
+
+        with self._lock:
+            if not self._entries:
+                return
+
+            for path in paths:
+                alias = self._normalize(path)
+                if alias.endswith("..."):
+                    prefix = alias[:-3]
+                    aliases = [_alias for _alias in self._keys_by_alias if _alias.startswith(prefix)]
+                else:
+                    aliases = [alias]
+
+                for _alias in aliases:
+                    for key in tuple(self._keys_by_alias.get(_alias, ())):
+                        self._pop_entry(key)
+
+    @contextmanager
+    def invalidating(self, paths: Iterable[str] | str | None) -> Iterator[None]:
+        """
+        Context manager that invalidates the given paths once the body
+        has run, even if it raised, as the files may have been modified.
+        """
+
+        try:
+            yield
+        finally:
+            self.invalidate(paths)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_alias.clear()
+
+    def info(self) -> StatCacheInfo:
+        with self._lock:
+            return StatCacheInfo(self.hits, self.misses, self.max_size, len(self._entries), self.ttl)
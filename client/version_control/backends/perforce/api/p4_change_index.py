@@ -0,0 +1,121 @@
+"""
+An in memory index of the user's pending change lists, by description.
+
+Change lists are looked up by their description throughout the api (and
+several times per publish instance), which would otherwise need the server
+to list and describe every pending change list on each lookup. The index
+is loaded with a single `p4 changes -l` query, refreshed when a lookup
+misses or finds a stale entry, and updated locally whenever the api
+creates, edits, submits or deletes a change list.
+"""
+from __future__ import annotations
+
+import threading
+
+_typing = False
+if _typing:
+    from typing import Any
+    from typing import Iterable
+del _typing
+
+
+class _PendingChange:
+    __slots__ = ("change", "description", "files")
+
+    def __init__(self, change: int, description: str, files: list[str] | None = None):
+        self.change = change
+        self.description = description
+        self.files = files
+
+
+class P4PendingChangeIndex:
+    """
+    The pending change lists of each user and client, indexed both by
+    change number and by (stripped) description. If several change lists
+    share a description, the newest one is returned, as `p4 changes` would.
+    """
+
+    def __init__(self):
+        self._changes: dict[tuple[str, str], dict[int, _PendingChange]] = {}
+        self._changes_by_description: dict[tuple[str, str], dict[str, list[int]]] = {}
+        self._lock = threading.RLock()
+
+    # Private Methods:
+    @staticmethod
+    def _key(user: str, client: str) -> tuple[str, str]:
+        return user.lower(), client.lower()
+
+    def _rebuild_descriptions(self, key: tuple[str, str]) -> None:
+        by_description: dict[str, list[int]] = {}
+        for change in sorted(self._changes.get(key, {}), reverse=True):
+            description = self._changes[key][change].description
+            by_description.setdefault(description, []).append(change)
+
+        self._changes_by_description[key] = by_description
+
+    # Public Methods:
+    def is_loaded(self, user: str, client: str) -> bool:
+        with self._lock:
+            return self._key(user, client) in self._changes
+
+    def refresh(self, user: str, client: str, changes: Iterable[dict[str, Any]]) -> None:
+        """
+        Update the index from the records of `p4 changes -l -s pending`,
+        keeping the known files of the change lists that haven't changed.
+        """
+
+        key = self._key(user, client)
+        with self._lock:
+            current = self._changes.get(key, {})
+            updated: dict[int, _PendingChange] = {}
+            for data in changes:
+                change = int(data["change"])
+                description = data.get("desc", "").strip()
+                pending_change = current.get(change)
+                if pending_change is None or pending_change.description != description:
+                    pending_change = _PendingChange(change, description)
+
+                updated[change] = pending_change
+
+            self._changes[key] = updated
+            self._rebuild_descriptions(key)
+
+    def get(self, user: str, client: str, description: str) -> int | None:
+        key = self._key(user, client)
+        with self._lock:
+            changes = self._changes_by_description.get(key, {}).get(description.strip())
+            return changes[0] if changes else None
+
+    def get_files(self, user: str, client: str, change: int) -> list[str] | None:
+        with self._lock:
+            pending_change = self._changes.get(self._key(user, client), {}).get(int(change))
+            return None if pending_change is None else pending_change.files
+
+    def count(self, user: str, client: str) -> int:
+        with self._lock:
+            return len(self._changes.get(self._key(user, client), {}))
+
+    def set(self, user: str, client: str, change: int, description: str, files: list[str] | None = None) -> None:
+        key = self._key(user, client)
+        with self._lock:
+            self._changes.setdefault(key, {})[int(change)] = _PendingChange(
+                int(change), description.strip(), files
+            )
+            self._rebuild_descriptions(key)
+
+    def set_files(self, user: str, client: str, change: int, files: list[str] | None) -> None:
+        with self._lock:
+            pending_change = self._changes.get(self._key(user, client), {}).get(int(change))
+            if pending_change is not None:
+                pending_change.files = list(files) if files is not None else None
+
+    def remove(self, user: str, client: str, change: int) -> None:
+        key = self._key(user, client)
+        with self._lock:
+            if self._changes.get(key, {}).pop(int(change), None) is not None:
+                self._rebuild_descriptions(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._changes.clear()
+            self._changes_by_description.clear()
@@ -0,0 +1,241 @@
+"""
+Translate between depot and local paths using a workspace's client view,
+without asking the server with a `p4 where`.
+
+The view of a client spec (`p4 client -o`) is compiled into a list of
+prefix mappings that answer `where` queries in process. Only the common
+case is handled locally: views made of `...` folder mappings, exclusions
+and exact file mappings. Anything that needs the server to resolve it
+(i.e. `*` or `%%n` wildcards, overlay mappings or a folder that is only
+partially mapped) is reported as `AMBIGUOUS`, so the caller can fall back
+to `p4 where`.
+
+As with `p4 where`, depot and client paths use the Perforce escapes of
+`@ # % *` (`%40 %23 %25 %2A`), whilst local paths are not escaped.
+"""
+from __future__ import annotations
+
+import re
+import shlex
+import threading
+
+_typing = False
+if _typing:
+    from typing import Any
+    from typing import Iterable
+del _typing
+
+
+# Returned by `P4ClientViewMap.where` when the path can only be resolved by the server:
+AMBIGUOUS = object()
+
+_UNSUPPORTED_WILDCARDS = ("*", "%%")
+
+# Characters of local paths that are escaped in depot and client paths,
+# `%` is escaped first so the other escapes aren't escaped again:
+_ESCAPES = (("%", "%25"), ("@", "%40"), ("#", "%23"), ("*", "%2A"))
+_UNESCAPE_REGEX = re.compile(r"%(25|40|23|2A)", re.IGNORECASE)
+_UNESCAPED = {"25": "%", "40": "@", "23": "#", "2A": "*"}
+# Characters of depot paths that are revision specifiers or wildcards rather than a file name:
+_DEPOT_SPECIFIERS = ("@", "#", "*", "%%")
+
+
+def escape(path: str) -> str:
+    for character, escaped in _ESCAPES:
+        path = path.replace(character, escaped)
+
+    return path
+
+
+def unescape(path: str) -> str:
+    return _UNESCAPE_REGEX.sub(lambda match: _UNESCAPED[match.group(1).upper()], path)
+
+
+class _ViewLine:
+    __slots__ = ("exclude", "overlay", "is_folder", "depot", "client", "local", "depot_key", "local_key")
+
+    def __init__(self, exclude, overlay, is_folder, depot, client, local, depot_key, local_key):
+        # type: (bool, bool, bool, str, str, str, str, str) -> None
+        self.exclude = exclude
+        self.overlay = overlay
+        self.is_folder = is_folder
+        self.depot = depot
+        self.client = client
+        self.local = local
+        self.depot_key = depot_key
+        self.local_key = local_key
+
+
+class P4ClientViewMap:
+    """
+    The compiled view of a single workspace.
+
+    `where` returns a record like those of `p4 where` (`depotFile`,
+    `clientFile` and `path`), `None` if the path is not mapped by the view
+    or `AMBIGUOUS` if the server needs to resolve it. If the view can't be
+    compiled at all, `is_compiled` is False and every path is `AMBIGUOUS`.
+    """
+
+    def __init__(self, client_name: str, root: str, view: Iterable[str], case_sensitive: bool = False):
+        self.client_name = client_name
+        self.root = root.rstrip("\\/")
+        self.case_sensitive = case_sensitive
+        self.is_compiled = True
+
+        # Local paths use the separator of the workspace root:
+        is_windows_root = self.root[1:2] == ":" or self.root.startswith("\\\\")
+        self._separator = "\\" if is_windows_root else "/"
+        self._lines: list[_ViewLine] = []
+        self._has_overlays = False
+        for view_line in view:
+            line = self._compile_line(view_line)
+            if line is None:
+                self.is_compiled = False
+                self._lines.clear()
+                break
+
+            self._has_overlays = self._has_overlays or line.overlay
+            self._lines.append(line)
+
+        # Later lines take precedence over earlier ones:
+        self._lines.reverse()
+
+    # Private Methods:
+    def _key(self, path: str) -> str:
+        path = path.replace("\\", "/")
+        return path if self.case_sensitive else path.lower()
+
+    def _compile_line(self, view_line: str) -> _ViewLine | None:
+        try:
+            parts = shlex.split(view_line)
+        except ValueError:
+            return None
+
+        if len(parts) != 2:
+            return None
+
+        depot, client = parts
+        exclude = depot.startswith("-")
+        overlay = depot.startswith("+")
+        depot = depot.lstrip("-+")
+
+        client_prefix = f"//{self.client_name}/"
+        if not client.lower().startswith(client_prefix.lower()):
+            return None
+
+        is_folder = depot.endswith("...")
+        if is_folder != client.endswith("..."):
+            return None
+
+        depot_prefix = depot[:-3] if is_folder else depot
+        client_rel = client[len(client_prefix):-3] if is_folder else client[len(client_prefix):]
+        for part in (depot_prefix, client_rel):
+            if "..." in part or any(wildcard in part for wildcard in _UNSUPPORTED_WILDCARDS):
+                return None
+
+        local_rel = unescape(client_rel).replace("/", self._separator)
+        local = f"{self.root}{self._separator}{local_rel}"
+        return _ViewLine(
+            exclude,
+            overlay,
+            is_folder,
+            depot_prefix,
+            f"{client_prefix}{client_rel}",
+            local,
+            self._key(depot_prefix),
+            self._key(local),
+        )
+
+    @staticmethod
+    def _matches(line_key: str, is_folder: bool, path_key: str) -> bool:
+        return path_key.startswith(line_key) if is_folder else path_key == line_key
+
+    # Public Methods:
+    def where(self, path: str) -> dict[str, str] | None | object:
+        if not self.is_compiled:
+            return AMBIGUOUS
+
+        is_depot_path = path.startswith("//")
+        is_folder = path.endswith("...")
+        path_body = path[:-3] if is_folder else path
+        if is_depot_path and any(specifier in path_body for specifier in _DEPOT_SPECIFIERS):
+            return AMBIGUOUS
+        path_key = self._key(path_body)
+        if is_folder and path_key and not path_key.endswith("/"):
+            # A folder without a trailing separator, i.e. `C:/ws/folder...`:
+            return AMBIGUOUS
+
+        match = None
+        for line in self._lines:
+            line_key = line.depot_key if is_depot_path else line.local_key
+            if is_folder and line_key.startswith(path_key) and line_key != path_key:
+                # The folder is only partially mapped by this line, so
+                # `p4 where` would return a record per mapping:
+                return AMBIGUOUS
+
+            if match is None and self._matches(line_key, line.is_folder, path_key):
+                if is_folder and not line.is_folder:
+                    return AMBIGUOUS
+
+                match = line
+                if not is_folder and not self._has_overlays:
+                    break
+
+            elif match is not None and line.overlay and self._matches(line_key, line.is_folder, path_key):
+                # Multiple depot files can map to the same client file:
+                return AMBIGUOUS
+
+        if match is None or match.exclude:
+            return None
+
+        if match.overlay:
+            return AMBIGUOUS
+
+        match_key = match.depot_key if is_depot_path else match.local_key
+        relative_path = path_body[len(match_key):].replace("\\", "/")
+        if is_depot_path:
+            escaped_path, local_path = relative_path, unescape(relative_path)
+        else:
+            escaped_path, local_path = escape(relative_path), relative_path
+
+        suffix = "..." if is_folder else ""
+        return {
+            "depotFile": f"{match.depot}{escaped_path}{suffix}",
+            "clientFile": f"{match.client}{escaped_path}{suffix}",
+            "path": f"{match.local}{local_path.replace('/', self._separator)}{suffix}",
+        }
+
+    def where_many(self, paths: Iterable[str]) -> list[dict[str, str] | None | object]:
+        return [self.where(path) for path in paths]
+
+
+class P4ClientViewCache:
+    """
+    The compiled view maps of the user's workspaces, each one
+    recompiled only once its spec (signature) has changed.
+    """
+
+    def __init__(self):
+        self._maps: dict[str, tuple[Any, P4ClientViewMap]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, workspace: str, signature: Any) -> P4ClientViewMap | None:
+        with self._lock:
+            entry = self._maps.get(workspace)
+
+        if entry is None or entry[0] != signature:
+            return None
+
+        return entry[1]
+
+    def set(self, workspace: str, signature: Any, view_map: P4ClientViewMap) -> None:
+        with self._lock:
+            self._maps[workspace] = (signature, view_map)
+
+    def invalidate(self, workspace: str) -> None:
+        with self._lock:
+            self._maps.pop(workspace, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._maps.clear()
@@ -0,0 +1,126 @@
+"""
+A bounded cache of the files of submitted change lists.
+
+The files of a submitted change list never change, so once listed with
+`p4 describe -s` they can be kept for as long as there is room for them,
+and pages of a large change list's files are served from the cache
+rather than describing the change list again for each page.
+"""
+from __future__ import annotations
+
+import collections
+import threading
+
+_typing = False
+if _typing:
+    from typing import Any
+del _typing
+
+
+ChangeFilesCacheInfo = collections.namedtuple(
+    "ChangeFilesCacheInfo", ("hits", "misses", "max_size", "max_files", "size", "files")
+)
+
+# The `p4 describe` fields kept for each file of a change list:
+FILE_FIELDS = ("depotFile", "action", "rev", "type")
+
+
+class P4ChangeFiles:
+    """
+    The files of a change list, kept as a column per field of `FILE_FIELDS`.
+    """
+
+    __slots__ = ("change", "columns")
+
+    def __init__(self, change: int, columns: dict[str, list[str]]):
+        self.change = change
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns["depotFile"])
+
+    @classmethod
+    def from_describe(cls, describe: dict[str, Any]) -> P4ChangeFiles:
+        """
+        Get the files of the given `p4 describe -s` record.
+        """
+
+        depot_files = describe.get("depotFile") or []
+        columns: dict[str, list[str]] = {}
+        for field in FILE_FIELDS:
+            values = describe.get(field) or []
+            if len(values) != len(depot_files):
+                values = (list(values) + [""] * len(depot_files))[: len(depot_files)]
+            columns[field] = list(values)
+
+        return cls(int(describe["change"]), columns)
+
+    def get_page(self, offset: int = 0, limit: int | None = None) -> list[dict[str, str]]:
+        offset = max(0, offset)
+        end = len(self) if limit is None else min(len(self), offset + max(0, limit))
+        return [{field: self.columns[field][index] for field in FILE_FIELDS} for index in range(offset, end)]
+
+
+class P4ChangeFilesCache:
+    """
+    A thread safe LRU cache of the files of submitted change lists, keyed by
+    server and change number. It's bounded both by the number of change
+    lists and by their total number of files, so a few huge change lists
+    can't hold on to an unbounded amount of memory.
+    """
+
+    def __init__(self, max_size: int = 256, max_files: int = 500000):
+        self.max_size = max_size
+        self.max_files = max_files
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: collections.OrderedDict[tuple[str, int], P4ChangeFiles] = collections.OrderedDict()
+        self._file_count = 0
+        self._lock = threading.Lock()
+
+    # Private Methods:
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_size or self._file_count > self.max_files):
+            _, files = self._entries.popitem(last=False)
+            self._file_count -= len(files)
+
+    # Public Methods:
+    def get(self, server: str, change: int) -> P4ChangeFiles | None:
+        key = (server, int(change))
+        with self._lock:
+            files = self._entries.get(key)
+            if files is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return files
+
+    def set(self, server: str, files: P4ChangeFiles) -> None:
+        if len(files) > self.max_files:
+            return
+
+        key = (server, files.change)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._file_count -= len(previous)
+
+            self._entries[key] = files
+            self._file_count += len(files)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._file_count = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> ChangeFilesCacheInfo:
+        with self._lock:
+            return ChangeFilesCacheInfo(
+                self.hits, self.misses, self.max_size, self.max_files, len(self._entries), self._file_count
+            )
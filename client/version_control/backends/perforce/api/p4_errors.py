@@ -16,6 +16,10 @@ class P4ServerConnectionError(P4BaseException):
     pass
 
 
+class P4CancelledError(P4BaseException):
+    pass
+
+
 class P4ExclusiveCheckoutError(P4BaseException):
     def __init__(self, files):
         # type: (list[str]) -> None
@@ -29,9 +33,20 @@ class P4UnsafeOfflineCommandError(P4BaseException):
         super().__init__(f"This action is not safe to run offline: {action}")
 
 
+class P4ResultMappingError(P4BaseException):
+    def __init__(self, function_name, workspace, result_count, path_count):
+        # type: (str, str, int, int) -> None
+        super().__init__(
+            f"Unable to map the results of {function_name} in workspace {workspace}: "
+            f"{result_count} results for {path_count} paths"
+        )
+
+
 
 class P4Exceptions:
     P4BaseException = P4BaseException
     P4AttributeError = P4AttributeError
     P4PathDoesNotExistError = P4PathDoesNotExistError
     P4ServerConnectionError = P4ServerConnectionError
+    P4CancelledError = P4CancelledError
+    P4ResultMappingError = P4ResultMappingError
@@ -0,0 +1,148 @@
+"""
+Work out how far behind the server the files under a set of folders are.
+
+Running `p4 sync -N` per folder costs a server round trip per folder, as
+p4 condenses the statistics of multiple arguments into one. Instead, the
+fstat records of all the folders are streamed from a single query and
+each record is attributed back to every queried folder that contains it.
+"""
+from __future__ import annotations
+
+import dataclasses
+
+_typing = False
+if _typing:
+    from typing import Any
+    from typing import Iterable
+del _typing
+
+
+# The fstat fields needed to work out if a file is out of date (`-T`),
+# `fileSize` is only returned when fstat is run with `-Ol`:
+FSTAT_FIELDS = ("depotFile", "clientFile", "headAction", "headRev", "haveRev", "action", "fileSize")
+
+_DELETE_ACTIONS = frozenset(("delete", "move/delete", "purge", "archive"))
+
+
+@dataclasses.dataclass
+class P4FolderFreshness:
+    """
+    The number of files under a folder that a sync would add, update
+    or delete, and the number of bytes that would be transferred.
+    """
+
+    files_added: int = 0
+    files_updated: int = 0
+    files_deleted: int = 0
+    bytes: int = 0
+
+    @property
+    def files_behind(self) -> int:
+        return self.files_added + self.files_updated + self.files_deleted
+
+    @property
+    def is_latest(self) -> bool:
+        return not self.files_behind
+
+    def to_dict(self) -> dict[str, Any]:
+        data = dataclasses.asdict(self)
+        data["files_behind"] = self.files_behind
+        data["is_latest"] = self.is_latest
+        return data
+
+
+class P4FolderFreshnessCounter:
+    """
+    Accumulates fstat records into a `P4FolderFreshness` per queried folder.
+
+    `add_record` is intended to be used as the record filter of a
+    `P4RecordStream`, so the records are counted as they arrive
+    rather than being kept in memory.
+    """
+
+    def __init__(self, folders: Iterable[str]):
+        self._folders = tuple(folders)
+        self._freshness = [P4FolderFreshness() for _ in self._folders]
+        self._record_counts = [0] * len(self._folders)
+        self._indices_by_root: dict[str, list[int]] = {}
+        for index, folder in enumerate(self._folders):
+            root = self._normalize(folder)
+            if root.endswith("..."):
+                root = root[:-3]
+            self._indices_by_root.setdefault(root.rstrip("/"), []).append(index)
+
+    # Private Methods:
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return str(path).replace("\\", "/").lower()
+
+    def _get_folder_indices(self, data: dict[str, Any]) -> set[int]:
+        indices: set[int] = set()
+        for key in ("depotFile", "clientFile"):
+            path = data.get(key)
+            if not path:
+                continue
+
+            path = self._normalize(path)
+            separator_index = path.rfind("/")
+            while separator_index > 0:
+                path = path[:separator_index]
+                indices.update(self._indices_by_root.get(path, ()))
+                separator_index = path.rfind("/")
+
+        return indices
+
+    # Public Methods:
+    def add_record(self, data: dict[str, Any]) -> bool:
+        """
+        Count the given fstat record against each folder that contains it.
+        Always returns False, so the record isn't kept by the stream.
+        """
+
+        indices = self._get_folder_indices(data)
+        if not indices:
+            return False
+
+        for index in indices:
+            self._record_counts[index] += 1
+
+        # Files opened in this workspace aren't updated by a sync:
+        if "action" in data:
+            return False
+
+        head_deleted = data.get("headAction") in _DELETE_ACTIONS
+        have_rev = data.get("haveRev")
+        if head_deleted:
+            if not have_rev:
+                return False
+
+            attribute = "files_deleted"
+            size = 0
+        elif not have_rev:
+            attribute = "files_added"
+            size = int(data.get("fileSize") or 0)
+        elif have_rev != data.get("headRev"):
+            attribute = "files_updated"
+            size = int(data.get("fileSize") or 0)
+        else:
+            return False
+
+        for index in indices:
+            freshness = self._freshness[index]
+            setattr(freshness, attribute, getattr(freshness, attribute) + 1)
+            freshness.bytes += size
+
+        return False
+
+    def get_results(self, missing_folders: Iterable[str] = ()) -> list[P4FolderFreshness | None]:
+        """
+        Get the freshness of each folder, in the order they were given.
+        Folders without any records that are in `missing_folders`
+        don't exist on the server, so their result is None.
+        """
+
+        missing_folders = set(missing_folders)
+        return [
+            None if not record_count and folder in missing_folders else freshness
+            for folder, freshness, record_count in zip(self._folders, self._freshness, self._record_counts)
+        ]
@@ -0,0 +1,209 @@
+"""
+A pool of warm, logged in P4 connections.
+
+Connecting to the server is the most expensive part of most short p4
+operations, so rather than connecting and disconnecting for every top
+level call, `P4ConnectionManager` leases connections from a pool and
+hands them back once the call has finished.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+from contextlib import contextmanager
+
+import P4
+
+_typing = False
+if _typing:
+    from typing import Iterator
+del _typing
+
+
+class P4ConnectionPool:
+    """
+    Keeps up to `max_size` connected `P4.P4` instances around, leasing
+    them out to callers and taking them back when they are done.
+
+    New connections are configured from `template`, a never connected
+    `P4.P4` instance that holds the connection settings (port, user,
+    password, client, etc.). Changing the template settings and calling
+    `clear` will make all subsequent leases use the new settings.
+
+    Idle connections are disconnected once they have not been used for
+    `idle_timeout` seconds, and every connection is health checked
+    before being leased out.
+    """
+
+    # The attributes copied from the template to each new connection:
+    SETTINGS = ("port", "user", "password", "client", "charset", "host", "prog", "version")
+
+    def __init__(self, max_size: int = 8, idle_timeout: float = 300.0, lease_timeout: float | None = None):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.lease_timeout = lease_timeout
+
+        self._template: P4.P4 | None = None
+        self._idle: list[tuple[P4.P4, float]] = []
+        self._leased_count = 0
+        self._generation = 0
+        self._generations: dict[int, int] = {}
+        self._condition = threading.Condition()
+
+    # Properties:
+    @property
+    def template(self) -> P4.P4:
+        if self._template is None:
+            self._template = P4.P4()
+        return self._template
+
+    @property
+    def size(self) -> int:
+        with self._condition:
+            return len(self._idle) + self._leased_count
+
+    # Private Methods:
+    def _create_connection(self) -> P4.P4:
+        template = self.template
+        p4 = P4.P4()
+        for setting in self.SETTINGS:
+            value = getattr(template, setting, None)
+            if value:
+                setattr(p4, setting, value)
+
+        p4.connect()
+        with self._condition:
+            self._generations[id(p4)] = self._generation
+
+        return p4
+
+    def _is_healthy(self, p4: P4.P4, last_used: float) -> bool:
+        if time.monotonic() - last_used > self.idle_timeout:
+            return False
+
+        # `connected` will detect a dropped connection and
+        # is cheap as it does not need a server round trip:
+        return bool(p4.connected())
+
+    @staticmethod
+    def _disconnect(p4: P4.P4) -> None:
+        try:
+            if p4.connected():
+                p4.disconnect()
+        except Exception:
+            pass
+
+    # Public Methods:
+    def acquire(self) -> P4.P4:
+        """
+        Lease a connected `P4.P4` instance from the pool.
+
+        Blocks until a connection is available if `max_size`
+        connections are already leased, raising a `RuntimeError`
+        if none became available within `lease_timeout` seconds.
+        """
+
+        with self._condition:
+            while True:
+                while self._idle:
+                    p4, last_used = self._idle.pop()
+                    if self._is_healthy(p4, last_used):
+                        self._leased_count += 1
+                        return p4
+
+                    self._generations.pop(id(p4), None)
+                    self._disconnect(p4)
+
+                if self._leased_count < self.max_size:
+                    # Reserve the slot before connecting so the
+                    # handshake can happen outside the lock:
+                    self._leased_count += 1
+                    break
+
+                if not self._condition.wait(self.lease_timeout):
+                    raise RuntimeError(
+                        f"Timed out waiting for a free p4 connection (max_size: {self.max_size})"
+                    )
+
+        try:
+            return self._create_connection()
+        except BaseException:
+            with self._condition:
+                self._leased_count -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, p4: P4.P4, discard: bool = False) -> None:
+        """
+        Return a leased connection to the pool.
+
+        The connection is reset to the template's client and any progress
+        or output handler is removed, so changes made by the leaseholder
+        (i.e. `P4ConnectionManager.workspace_as`) don't leak between leases.
+        If `discard` is True or the connection has dropped, it is
+        disconnected rather than being kept for reuse.
+        """
+
+        with self._condition:
+            self._leased_count -= 1
+            self._condition.notify()
+            # Connections leased before `clear` was called
+            # may be using outdated settings:
+            generation = self._generations.get(id(p4))
+            if discard or generation != self._generation or not p4.connected():
+                self._generations.pop(id(p4), None)
+                self._disconnect(p4)
+                return
+
+            client = self.template.client
+            if client and p4.client != client:
+                p4.client = client
+
+            p4.progress = None
+            p4.handler = None
+
+            self._idle.append((p4, time.monotonic()))
+            self.prune()
+
+    def prune(self) -> None:
+        """
+        Disconnect any idle connections that have timed out.
+        """
+
+        with self._condition:
+            now = time.monotonic()
+            idle = []
+            for p4, last_used in self._idle:
+                if now - last_used > self.idle_timeout:
+                    self._generations.pop(id(p4), None)
+                    self._disconnect(p4)
+                    continue
+
+                idle.append((p4, last_used))
+
+            self._idle = idle
+
+    def clear(self) -> None:
+        """
+        Disconnect all idle connections, and any currently leased
+        connections once they are released.
+        This should be called when the template settings change,
+        as existing connections would otherwise use the old settings.
+        """
+
+        with self._condition:
+            self._generation += 1
+            for p4, _ in self._idle:
+                self._generations.pop(id(p4), None)
+                self._disconnect(p4)
+
+            self._idle.clear()
+
+    @contextmanager
+    def lease(self) -> Iterator[P4.P4]:
+        p4 = self.acquire()
+        try:
+            yield p4
+        finally:
+            self.release(p4)
@@ -0,0 +1,266 @@
+"""
+Coalesce the progress reported by P4 into rate limited snapshots.
+
+P4 reports progress for every position change, which on a sync of millions
+of files is millions of callbacks. Rather than forwarding each of them,
+the progress is aggregated and published as a `P4ProgressSnapshot` at most
+`max_rate` times per second, carrying the change since the last snapshot
+and the throughput over it. Subscribers are plain callables, so the same
+snapshots can drive Qt signals, the REST job API and logs:
+
+```
+aggregator = P4ProgressAggregator(max_rate=10)
+unsubscribe = aggregator.subscribe(P4ProgressLogger(log))
+aggregator.started("//depot/file.txt", UNITS_FILES)
+aggregator.update(1)
+aggregator.flush()
+unsubscribe()
+```
+"""
+from __future__ import annotations
+
+import dataclasses
+import logging
+import threading
+import time
+
+_typing = False
+if _typing:
+    from typing import Any
+    from typing import Callable
+del _typing
+
+
+# The default number of snapshots published per second:
+DEFAULT_MAX_RATE = 10.0
+
+# `P4.Progress` units, see `ClientProgress` of the P4 C++ api:
+UNITS_UNSPECIFIED = 0
+UNITS_PERCENT = 1
+UNITS_FILES = 2
+UNITS_KBYTES = 3
+UNITS_MBYTES = 4
+
+UNITS_NAMES = {
+    UNITS_UNSPECIFIED: "",
+    UNITS_PERCENT: "%",
+    UNITS_FILES: "files",
+    UNITS_KBYTES: "KB",
+    UNITS_MBYTES: "MB",
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class P4ProgressSnapshot:
+    """
+    The progress reported since the aggregator was created (or reset),
+    as of the time of the snapshot.
+
+    `position` and `total` are those of the current progress (i.e. the file
+    being transferred), whilst `done` is the total of the units advanced over
+    every progress so far, and `delta` the units advanced since the previous
+    snapshot. `rate` is `delta` per second over the snapshot's `interval`.
+    """
+
+    description: str = ""
+    units: int = UNITS_UNSPECIFIED
+    position: int = 0
+    total: int = 0
+    done: int = 0
+    delta: int = 0
+    started: int = 0
+    started_delta: int = 0
+    completed: int = 0
+    completed_delta: int = 0
+    failed: int = 0
+    rate: float = 0.0
+    elapsed: float = 0.0
+    interval: float = 0.0
+    is_final: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return dataclasses.asdict(self)
+
+    def format(self) -> str:
+        units = UNITS_NAMES.get(self.units, "")
+        position = f"{self.position}/{self.total}" if self.total else f"{self.position}"
+        return (
+            f"{self.description} {position} {units} - "
+            f"{self.completed} completed ({self.failed} failed), "
+            f"{self.rate:.1f} {units}/s, {self.elapsed:.1f}s"
+        ).strip()
+
+
+class P4ProgressAggregator:
+    """
+    A thread safe aggregator of P4 progress, publishing snapshots to its
+    subscribers at most `max_rate` times per second.
+
+    Updates that come in between two snapshots are only counted, the next
+    snapshot carries all of them. `flush` publishes any pending progress
+    straight away, i.e. once the command has finished, so the final counts
+    aren't held back by the rate limit.
+
+    Subscribers are called on the thread that reports the progress (a P4
+    worker thread), so they must be quick and thread safe.
+    """
+
+    def __init__(self, max_rate: float = DEFAULT_MAX_RATE, clock: Callable[[], float] = time.monotonic):
+        self.max_rate = max_rate
+        self._interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self._clock = clock
+        self._subscribers: list[Callable[[P4ProgressSnapshot], None]] = []
+        self._lock = threading.Lock()
+        self.reset()
+
+    # Private Methods:
+    def _take_snapshot(self, now: float, is_final: bool) -> P4ProgressSnapshot:
+        interval = now - self._published_time
+        delta = self._done - self._published_done
+        snapshot = P4ProgressSnapshot(
+            description=self._description,
+            units=self._units,
+            position=self._position,
+            total=self._total,
+            done=self._done,
+            delta=delta,
+            started=self._started,
+            started_delta=self._started - self._published_started,
+            completed=self._completed,
+            completed_delta=self._completed - self._published_completed,
+            failed=self._failed,
+            rate=delta / interval if interval > 0 else 0.0,
+            elapsed=now - self._start_time,
+            interval=interval,
+            is_final=is_final,
+        )
+        self._published_time = now
+        self._published_done = self._done
+        self._published_started = self._started
+        self._published_completed = self._completed
+        self._pending = False
+        self._snapshot = snapshot
+        return snapshot
+
+    def _publish(self, force: bool = False, is_final: bool = False) -> P4ProgressSnapshot | None:
+        with self._lock:
+            self._pending = True
+            now = self._clock()
+            if not force and now - self._published_time < self._interval:
+                return None
+
+            snapshot = self._take_snapshot(now, is_final)
+            subscribers = tuple(self._subscribers)
+
+        # Subscribers are called outside of the lock, so they can query the aggregator:
+        for subscriber in subscribers:
+            subscriber(snapshot)
+
+        return snapshot
+
+    # Public Methods:
+    def subscribe(self, callback: Callable[[P4ProgressSnapshot], None]) -> Callable[[], None]:
+        """
+        Call `callback` with every published snapshot, returns a function that unsubscribes it.
+        """
+
+        with self._lock:
+            self._subscribers.append(callback)
+
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback: Callable[[P4ProgressSnapshot], None]) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def reset(self) -> None:
+        with self._lock:
+            now = self._clock()
+            self._description = ""
+            self._units = UNITS_UNSPECIFIED
+            self._position = 0
+            self._total = 0
+            self._done = 0
+            self._started = 0
+            self._completed = 0
+            self._failed = 0
+            self._start_time = now
+            self._published_time = now
+            self._published_done = 0
+            self._published_started = 0
+            self._published_completed = 0
+            self._pending = False
+            self._snapshot: P4ProgressSnapshot | None = None
+
+    def started(self, description: str, units: int) -> None:
+        with self._lock:
+            self._description = description
+            self._units = units
+            self._position = 0
+            self._total = 0
+            self._started += 1
+
+        self._publish()
+
+    def set_total(self, total: int) -> None:
+        with self._lock:
+            self._total = total
+
+        self._publish()
+
+    def update(self, position: int) -> None:
+        with self._lock:
+            # A position lower than the last one is a progress that restarted:
+            self._done += position - self._position if position >= self._position else position
+            self._position = position
+
+        self._publish()
+
+    def completed(self, fail: int = 0) -> None:
+        with self._lock:
+            self._completed += 1
+            if fail:
+                self._failed += 1
+
+        self._publish()
+
+    def flush(self, is_final: bool = True) -> P4ProgressSnapshot | None:
+        """
+        Publish the pending progress, if any, regardless of the rate limit.
+        """
+
+        with self._lock:
+            if not self._pending:
+                return None
+
+        return self._publish(force=True, is_final=is_final)
+
+    def get_snapshot(self) -> P4ProgressSnapshot | None:
+        """
+        Get the last published snapshot, for consumers that poll rather than subscribe.
+        """
+
+        with self._lock:
+            return self._snapshot
+
+
+class P4ProgressLogger:
+    """
+    A subscriber that logs snapshots, at most once every `interval` seconds
+    and always the final one.
+    """
+
+    def __init__(self, logger: logging.Logger, level: int = logging.INFO, interval: float = 5.0):
+        self.logger = logger
+        self.level = level
+        self.interval = interval
+        self._logged_time: float | None = None
+
+    def __call__(self, snapshot: P4ProgressSnapshot) -> None:
+        if not snapshot.is_final and self._logged_time is not None:
+            if snapshot.elapsed - self._logged_time < self.interval:
+                return
+
+        self._logged_time = snapshot.elapsed
+        self.logger.log(self.level, "Progress: %s", snapshot.format())
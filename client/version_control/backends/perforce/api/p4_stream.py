@@ -0,0 +1,159 @@
+"""
+Output handlers for streaming and cancelling running p4 commands.
+
+P4Python calls a `P4.OutputHandler` synchronously for each record whilst
+a command runs, so `P4RecordStream` runs the command on a worker thread
+and hands the records over through a bounded queue. This keeps memory
+flat no matter how many records the command returns, lets records be
+filtered as they arrive and allows the command to be cancelled as soon
+as the caller stops iterating or a given cancel event is set.
+
+`P4CancelHandler` leaves the output as is, but allows a command to be
+cancelled from another thread (i.e. when an async caller times out).
+"""
+from __future__ import annotations
+
+import queue
+import threading
+
+import P4
+
+_typing = False
+if _typing:
+    from typing import Any
+    from typing import Callable
+    from typing import Iterator
+del _typing
+
+
+class P4RecordStream(P4.OutputHandler):
+    """
+    Iterable over the tagged records of `p4.run(command, *args)`.
+
+    Only records for which `record_filter` returns True are yielded.
+    Warnings (i.e. `no such file(s).`) are collected in `warnings` rather
+    than raised, errors are raised once the queued records are consumed.
+    The command is cancelled at its next record once `cancel` is called or
+    `cancel_event` is set (i.e. from another thread), which ends the
+    iteration once the queued records are consumed.
+    The given p4 connection must not be used by anything else whilst the
+    stream is being iterated.
+    """
+
+    _DONE = object()
+
+    def __init__(
+        self,
+        p4: P4.P4,
+        command: str,
+        args: tuple[Any, ...] = (),
+        record_filter: Callable[[dict[str, Any]], bool] | None = None,
+        max_queued: int = 1000,
+        cancel_event: threading.Event | None = None,
+    ):
+        super().__init__()
+        self._p4 = p4
+        self._command = command
+        self._args = args
+        self._record_filter = record_filter
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queued)
+        self._cancel_event = cancel_event
+        self._cancelled = threading.Event()
+        # Set once the caller stopped iterating, nothing reads the queue anymore:
+        self._stopped = threading.Event()
+        self._error: Exception | None = None
+
+        self.record_count = 0
+        self.warnings: list[str] = []
+
+    # Output Handler Methods:
+    def outputStat(self, stat: dict[str, Any]) -> int:
+        if self.is_cancelled:
+            return P4.OutputHandler.CANCEL
+
+        self.record_count += 1
+        if self._record_filter is None or self._record_filter(stat):
+            self._put(stat)
+
+        return P4.OutputHandler.CANCEL if self.is_cancelled else P4.OutputHandler.HANDLED
+
+    # Private Methods:
+    def _put(self, item: Any) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _run(self) -> None:
+        try:
+            with self._p4.using_handler(self):
+                self._p4.run(self._command, *self._args)
+        except Exception as error:
+            # Query the exception type by name, see:
+            # `P4ConnectionManager._is_p4_exception`
+            if type(error).__name__ != "P4Exception" or self._p4.errors:
+                if not self.is_cancelled:
+                    self._error = error
+        finally:
+            self.warnings.extend(str(warning) for warning in self._p4.warnings)
+            self._put(self._DONE)
+
+    # Public Methods:
+    @property
+    def is_cancelled(self) -> bool:
+        return (
+            self._cancelled.is_set()
+            or self._stopped.is_set()
+            or (self._cancel_event is not None and self._cancel_event.is_set())
+        )
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        thread = threading.Thread(target=self._run, name=f"P4RecordStream-{self._command}", daemon=True)
+        thread.start()
+        try:
+            while True:
+                record = self._queue.get()
+                if record is self._DONE:
+                    break
+
+                yield record
+
+            if self._error is not None:
+                raise self._error
+
+        finally:
+            # Stop the command if iteration ended early and unblock the
+            # worker thread, so the connection is free once this returns:
+            self._stopped.set()
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            thread.join()
+
+
+class P4CancelHandler(P4.OutputHandler):
+    """
+    Output handler that leaves the command output as is, but cancels
+    the running command at its next output once `event` is set.
+    """
+
+    def __init__(self, event: threading.Event):
+        super().__init__()
+        self._event = event
+
+    def _handle(self, *_args: Any) -> int:
+        return P4.OutputHandler.CANCEL if self._event.is_set() else P4.OutputHandler.REPORT
+
+    outputStat = _handle
+    outputInfo = _handle
+    outputMessage = _handle
+    outputText = _handle
+    outputBinary = _handle
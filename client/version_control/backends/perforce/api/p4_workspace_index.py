@@ -0,0 +1,130 @@
+"""
+An in memory index of the client and depot roots of the user's workspaces.
+
+Finding which workspace a path belongs to is needed for every api call
+that takes paths, so rather than scanning every workspace (and querying
+the server for its roots) per path, the roots are compiled into a case
+folded prefix trie that is only rebuilt when the workspaces change.
+"""
+from __future__ import annotations
+
+import threading
+
+_typing = False
+if _typing:
+    from typing import Any
+    from typing import Iterable
+    from typing import Mapping
+del _typing
+
+
+class _TrieNode:
+    __slots__ = ("children", "workspaces")
+
+    def __init__(self):
+        self.children: dict[str, _TrieNode] = {}
+        self.workspaces: list[str] = []
+
+
+class P4WorkspaceRootIndex:
+    """
+    A prefix trie of path components, where each root node lists
+    the workspaces whose client or depot root it is.
+
+    Paths are matched component by component, so `C:/ws2/file` is not
+    considered to be under the root `C:/ws`, and lookups cost the
+    depth of the path rather than the number of workspaces.
+    """
+
+    def __init__(self):
+        self._root = _TrieNode()
+        self._signature: Any = None
+        self._workspaces: tuple[str, ...] = ()
+        self._lock = threading.RLock()
+
+    # Private Methods:
+    @staticmethod
+    def _split(path: Any) -> list[str]:
+        path = str(path).replace("\\", "/").lower()
+        parts = path.split("/")
+        # Ignore a trailing `...` wildcard and empty trailing components,
+        # but keep the leading empty components of depot paths (`//depot`)
+        # so they can't collide with relative paths:
+        while parts and parts[-1] in ("", "..."):
+            parts.pop()
+
+        return parts
+
+    # Public Methods:
+    @property
+    def signature(self) -> Any:
+        return self._signature
+
+    @property
+    def workspaces(self) -> tuple[str, ...]:
+        return self._workspaces
+
+    def is_current(self, signature: Any) -> bool:
+        return self._signature is not None and self._signature == signature
+
+    def build(self, roots: Mapping[str, Iterable[str]], signature: Any = None) -> None:
+        """
+        Rebuild the index from a mapping of workspace names
+        to their roots (i.e. the client and depot roots).
+        """
+
+        root = _TrieNode()
+        for workspace, workspace_roots in roots.items():
+            for workspace_root in workspace_roots:
+                if not workspace_root:
+                    continue
+
+                node = root
+                for part in self._split(workspace_root):
+                    node = node.children.setdefault(part, _TrieNode())
+
+                if workspace not in node.workspaces:
+                    node.workspaces.append(workspace)
+
+        with self._lock:
+            self._root = root
+            self._workspaces = tuple(roots)
+            self._signature = signature
+
+    def get_workspaces(self, path: Any) -> tuple[str, ...]:
+        """
+        Get the workspaces with a root that contains the
+        given path, the deepest (most specific) root first.
+        """
+
+        node = self._root
+        matches: list[str] = list(node.workspaces)
+        for part in self._split(path):
+            node = node.children.get(part)
+            if node is None:
+                break
+
+            if node.workspaces:
+                matches[0:0] = node.workspaces
+
+        return tuple(dict.fromkeys(matches))
+
+    def get_workspace(self, path: Any) -> str | None:
+        """
+        Get the workspace with the deepest root that contains the given path.
+        """
+
+        workspaces = self.get_workspaces(path)
+        return workspaces[0] if workspaces else None
+
+    def is_under_workspace(self, path: Any, workspace: str) -> bool:
+        return workspace in self.get_workspaces(path)
+
+    def is_under_any_workspace(self, path: Any) -> bool:
+        return bool(self.get_workspaces(path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._root = _TrieNode()
+            self._workspaces = ()
+            self._signature = None
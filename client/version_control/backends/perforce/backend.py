@@ -2,6 +2,7 @@ import os
 import pathlib
 
 from . import api
+from .api import p4_errors
 from .. import abstract
 
 _typing = False
@@ -10,19 +11,77 @@ if _typing:
     from typing import Sequence
 del _typing
 
+# The default number of changes of each `get_changes_page` page:
+CHANGES_PAGE_SIZE = 500
+
+# The operations that can be run by `run_batch`, by the name of their
+# `PerforceRestStub` method, and the methods that run them:
+BATCH_OPERATIONS = {
+    "add": "add",
+    "checkout": "checkout",
+    "exists_on_server": "exists_on_server",
+    "get_change_files": "get_change_files",
+    "get_changes": "get_changes",
+    "get_folder_freshness": "get_folder_freshness",
+    "get_last_change_list": "get_last_change_list",
+    "get_stream": "get_stream",
+    "get_workspace_dir": "get_workspace_dir",
+    "is_checkouted": "is_checkedout",
+    "is_in_any_workspace": "is_in_any_workspace",
+    "submit_change_list": "submit_change_list",
+    "sync_latest_version": "sync_latest_version",
+    "sync_to_version": "sync_to_version",
+}
+
+
+def _is_path_list(path):
+    # type: (Any) -> bool
+    return isinstance(path, (list, tuple))
+
+
+def _key_by_path(path, result):
+    # type: (Sequence[pathlib.Path | str], Any) -> Any
+    """Key the per-path result of the api by the given paths.
+
+    The api keys the results of a list of paths by the p4 form of each path,
+    which callers can't look their paths up by.
+    """
+    if not isinstance(result, dict):
+        return result
+
+    paths = list(dict.fromkeys(str(_path) for _path in path))
+    if len(paths) != len(result):
+        return result
+
+    return dict(zip(paths, result.values()))
+
+
+def _get_changes(file_spec=None, since=None, before=None, limit=None):
+    # type: (str | None, int | None, int | None, int | None) -> list[dict] | None
+    """Get the change lists from the api, as a list even if there's one.
+
+    The api returns a result of a single item as that item, which for
+    change lists is a change list's dict.
+    """
+    changes = api.get_changes(
+        file_spec=file_spec, since=since, before=before, limit=limit)
+    if isinstance(changes, dict):
+        return [changes]
+    return changes
+
 
 class VersionControlPerforce(abstract.VersionControl):
     @staticmethod
     def get_server_version(path):
         # type: (str | pathlib.Path) -> int | None | dict[str, int | None]
         result = api.get_current_server_revision(path)
-        return result
+        return _key_by_path(path, result) if _is_path_list(path) else result
 
     @staticmethod
     def get_local_version(path):
         # type: (pathlib.Path | str) -> int | None
         result = api.get_current_client_revision(path)
-        return result
+        return _key_by_path(path, result) if _is_path_list(path) else result
 
     @staticmethod
     def get_version_info(path):
@@ -32,13 +91,40 @@ class VersionControlPerforce(abstract.VersionControl):
 
     @staticmethod
     def is_latest_version(path):
-        # type: (pathlib.Path | str) -> bool | None
-        return api.is_latest(path)
+        # type: (pathlib.Path | str) -> bool | None | dict[str, bool | None]
+        result = api.is_latest(path)
+        return _key_by_path(path, result) if _is_path_list(path) else result
+
+    @staticmethod
+    def get_folder_freshness(path):
+        # type: (pathlib.Path | str) -> dict[str, Any] | None | dict[str, dict[str, Any] | None]
+        result = api.get_folder_freshness(path)
+        if isinstance(result, dict):
+            return _key_by_path(path, {
+                _path: freshness.to_dict() if freshness else None
+                for _path, freshness in result.items()
+            })
+
+        return result.to_dict() if result else None
+
+    @staticmethod
+    def is_in_any_workspace(path):
+        # type: (pathlib.Path | str | Sequence[pathlib.Path | str]) -> bool | dict[str, bool]
+        manager = api._get_connection_manager()
+        if not _is_path_list(path):
+            return manager._is_path_under_any_root(path)
+
+        with manager.holding_connection():
+            return {
+                str(_path): manager._is_path_under_any_root(_path)
+                for _path in path
+            }
 
     @staticmethod
     def is_checkedout(path):
-        # type: (pathlib.Path | str) -> bool
-        return api.is_checked_out(path)
+        # type: (pathlib.Path | str) -> bool | dict[str, bool | None]
+        result = api.is_checked_out(path)
+        return _key_by_path(path, result) if _is_path_list(path) else result
 
     @staticmethod
     def checked_out_by(path, other_users_only=False):
@@ -47,26 +133,32 @@ class VersionControlPerforce(abstract.VersionControl):
 
     @staticmethod
     def exists_on_server(path):
-        # type: (pathlib.Path | str) -> bool
+        # type: (pathlib.Path | str) -> bool | dict[str, bool]
+        if _is_path_list(path):
+            return _key_by_path(path, api.exists_on_server(path))
+
         if not api.get_stat(path, ["-m 1"]):
             return False
 
         return True
 
     @staticmethod
-    def sync_latest_version(path):
-        # type: (pathlib.Path | str) -> bool | None
-        return api.get_latest(path)
+    def sync_latest_version(path, parallel=None):
+        # type: (pathlib.Path | str, dict[str, Any] | bool | None) -> bool | None | dict[str, bool | None]
+        result = api.get_latest(path, parallel=parallel)
+        return _key_by_path(path, result) if _is_path_list(path) else result
 
     @staticmethod
-    def sync_to_version(path, version):
-        # type: (pathlib.Path | str, int) -> bool | None
-        return api.get_revision(path, version)
+    def sync_to_version(path, version, parallel=None):
+        # type: (pathlib.Path | str, int | Sequence[int], dict[str, Any] | bool | None) -> bool | None | dict[str, bool]
+        result = api.get_revision(path, version, parallel=parallel)
+        return _key_by_path(path, result) if _is_path_list(path) else result
 
     @staticmethod
     def add(path, comment=""):
-        # type: (pathlib.Path | str, str) -> bool
-        return api.add(path, change_description=comment)
+        # type: (pathlib.Path | str, str) -> bool | dict[str, bool]
+        result = api.add(path, change_description=comment)
+        return _key_by_path(path, result) if _is_path_list(path) else result
 
     @staticmethod
     def add_to_change_list(path, comment):
@@ -75,8 +167,9 @@ class VersionControlPerforce(abstract.VersionControl):
 
     @staticmethod
     def checkout(path, comment=""):
-        # type: (pathlib.Path | str, str) -> bool
-        return api.checkout(path, change_description=comment)
+        # type: (pathlib.Path | str, str) -> bool | dict[str, bool]
+        result = api.checkout(path, change_description=comment)
+        return _key_by_path(path, result) if _is_path_list(path) else result
 
     @staticmethod
     def revert(path):
@@ -89,9 +182,28 @@ class VersionControlPerforce(abstract.VersionControl):
         return api.move(path, new_path, change_description=change_description)
 
     @staticmethod
-    def get_changes():
-        # type: (None) -> (list(dict)) | None
-        return api.get_changes()
+    def get_changes(path=None, since=None, before=None, limit=None):
+        # type: (str | None, int | None, int | None, int | None) -> (list(dict)) | None
+        return _get_changes(file_spec=path, since=since, before=before, limit=limit)
+
+    @staticmethod
+    def get_change_files(change, offset=0, limit=None):
+        # type: (int, int, int | None) -> dict[str, Any] | None
+        return api.get_change_files(change, offset=offset, limit=limit)
+
+    @staticmethod
+    def get_changes_page(path=None, cursor=None, since=None, limit=CHANGES_PAGE_SIZE):
+        # type: (str | None, int | None, int | None, int) -> dict[str, Any]
+        # Pages are newest first, `cursor` is the cursor returned with the
+        # previous page and is `None` once there are no older changes.
+        # One more change is asked for, to know if there is another page:
+        changes = _get_changes(file_spec=path, since=since, before=cursor, limit=limit + 1) or []
+        next_cursor = None
+        if len(changes) > limit:
+            changes = changes[:limit]
+            next_cursor = int(changes[-1]["change"])
+
+        return {"changes": changes, "cursor": next_cursor}
 
     @staticmethod
     def get_existing_change_list(comment):
@@ -135,6 +247,37 @@ class VersionControlPerforce(abstract.VersionControl):
         # type: (str, str) -> bool
         return api.update_change_list_description(comment, new_comment)
 
+    @staticmethod
+    def run_batch(operations, stop_on_error=False):
+        # type: (Sequence[dict[str, Any]], bool) -> list[dict[str, Any]]
+        # Runs `{"command": ..., "kwargs": {...}}` operations in order on one
+        # leased p4 connection, returning a result per operation:
+        # `{"ok": True, "result": ...}` or `{"ok": False, "error": ...}`.
+        # With `stop_on_error`, the operations after the first failed one
+        # aren't run and are returned as `{"ok": False, "skipped": True}`.
+        results = []
+        failed = False
+        with api.holding_connection():
+            for operation in operations:
+                if failed and stop_on_error:
+                    results.append({"ok": False, "skipped": True})
+                    continue
+
+                command = operation["command"]
+                method = getattr(VersionControlPerforce, BATCH_OPERATIONS[command])
+                try:
+                    result = method(**(operation.get("kwargs") or {}))
+                except p4_errors.P4CancelledError:
+                    raise
+                except Exception as error:
+                    failed = True
+                    results.append({"ok": False, "error": str(error) or type(error).__name__})
+                    continue
+
+                results.append({"ok": True, "result": result})
+
+        return results
+
     @staticmethod
     def get_stream(workspace_name):
         # type: (str) -> str
@@ -0,0 +1,286 @@
+"""
+Background jobs for long running P4 operations, for use from the tray's
+aiohttp routes.
+
+A sync to a change can take hours, so rather than holding an HTTP request
+open for its whole duration, starting it returns a job id straight away.
+The sync then runs on the transfer pool of `aapi`, where its progress
+(files, bytes, rate and ETA) and per-file results can be polled and the
+job can be cancelled:
+
+```
+from version_control.backends.perforce import jobs
+
+job_id = jobs.start_sync("C:/workspace/...", version=1234)
+jobs.get_progress(job_id)
+jobs.cancel(job_id)
+jobs.get_results(job_id, offset=0, limit=1000)
+```
+"""
+from __future__ import annotations
+
+import collections
+import threading
+import time
+import uuid
+
+from . import aapi
+from . import api
+from .api import p4_errors
+from .api import p4_progress
+
+_typing = False
+if _typing:
+    from typing import Any
+    from typing import Iterable
+del _typing
+
+
+# Finished jobs kept for their progress and results to be polled,
+# the oldest finished jobs are forgotten first:
+MAX_FINISHED_JOBS = 20
+
+# The fields of the sync records kept as the job's per-file results:
+RESULT_FIELDS = ("depotFile", "clientFile", "rev", "action", "fileSize")
+
+_STATES_FINISHED = frozenset(("completed", "cancelled", "failed"))
+
+
+class P4SyncJob:
+    """
+    A sync of a path (optionally to a version), run on a worker thread.
+
+    Progress is gathered from the streamed sync records, where the first
+    record carries the total file count and size of the sync, and from the
+    snapshots of a `P4ProgressHandler` installed on the job's connection.
+    Cancelling the job cancels the running sync at its next record.
+    """
+
+    def __init__(self, path: str | Iterable[str], version: int | None = None, parallel: Any = None):
+        self.job_id = uuid.uuid4().hex
+        self.paths = [str(_path) for _path in api.make_tuple_if_not(path)]
+        self.version = version
+        self.parallel = parallel
+        self.state = "queued"
+        self.error = ""
+
+        self.files_done = 0
+        self.files_total = 0
+        self.bytes_done = 0
+        self.bytes_total = 0
+        self.current_file = ""
+
+        self._results: list[tuple[str, ...]] = []
+        self._progress_aggregator = p4_progress.P4ProgressAggregator()
+        self._progress_aggregator.subscribe(self._on_progress_snapshot)
+        self._progress_snapshot: p4_progress.P4ProgressSnapshot | None = None
+        self._started_time: float | None = None
+        self._finished_time: float | None = None
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._future = None
+
+    # Private Methods:
+    def _add_record(self, record: dict[str, Any]) -> bool:
+        with self._lock:
+            if "totalFileCount" in record:
+                self.files_total += int(record["totalFileCount"] or 0)
+                self.bytes_total += int(record.get("totalFileSize") or 0)
+
+            self.files_done += 1
+            self.bytes_done += int(record.get("fileSize") or 0)
+            self.current_file = record.get("clientFile") or record.get("depotFile") or ""
+            self._results.append(tuple(str(record.get(field) or "") for field in RESULT_FIELDS))
+
+        # Records are kept by the job, rather than by the stream:
+        return False
+
+    def _on_progress_snapshot(self, snapshot: p4_progress.P4ProgressSnapshot) -> None:
+        with self._lock:
+            self._progress_snapshot = snapshot
+
+    def _run(self) -> None:
+        with self._lock:
+            self.state = "running"
+            self._started_time = time.monotonic()
+
+        manager = api._get_connection_manager()
+        progress_handler = api.P4ProgressHandler(aggregator=self._progress_aggregator)
+        with manager.using_progress(progress_handler):
+            records = manager.iter_sync(
+                self.paths, record_filter=self._add_record, parallel=self.parallel, revision=self.version
+            )
+            try:
+                # No records are yielded, the stream ends once the sync has finished or,
+                # as it runs with the job's cancel event (see `aapi.submit`), once cancelled:
+                for _ in records:
+                    pass
+            finally:
+                records.close()
+                progress_handler.flush()
+
+            if self._cancel_event.is_set():
+                raise p4_errors.P4CancelledError("Cancelled")
+
+    def _on_done(self, future) -> None:
+        error = None if future.cancelled() else future.exception()
+        with self._lock:
+            self._finished_time = time.monotonic()
+            if self._cancel_event.is_set() or isinstance(error, p4_errors.P4CancelledError):
+                self.state = "cancelled"
+            elif error is not None:
+                self.state = "failed"
+                self.error = str(error)
+            else:
+                self.state = "completed"
+
+    def _get_progress_done(self) -> tuple[int, int]:
+        # The progress handler reports the progress within the running command,
+        # which can be ahead of the records that have been received:
+        files_done = self.files_done
+        bytes_done = self.bytes_done
+        snapshot = self._progress_snapshot
+        if snapshot is None:
+            return files_done, bytes_done
+
+        if snapshot.units == p4_progress.UNITS_FILES:
+            files_done = max(files_done, snapshot.position)
+        elif snapshot.units == p4_progress.UNITS_KBYTES:
+            bytes_done = max(bytes_done, snapshot.position * 1024)
+        elif snapshot.units == p4_progress.UNITS_MBYTES:
+            bytes_done = max(bytes_done, snapshot.position * 1024 * 1024)
+
+        return files_done, bytes_done
+
+    # Public Methods:
+    @property
+    def is_finished(self) -> bool:
+        return self.state in _STATES_FINISHED
+
+    def start(self) -> None:
+        self._future = aapi.submit(self._run, event=self._cancel_event, transfer=True)
+        self._future.add_done_callback(self._on_done)
+
+    def cancel(self) -> bool:
+        if self.is_finished:
+            return False
+
+        # Jobs that haven't started yet are removed from the pool's queue:
+        self._cancel_event.set()
+        if self._future is not None:
+            self._future.cancel()
+
+        return True
+
+    def get_progress(self) -> dict[str, Any]:
+        with self._lock:
+            files_done, bytes_done = self._get_progress_done()
+            end_time = self._finished_time or time.monotonic()
+            elapsed = end_time - self._started_time if self._started_time is not None else 0.0
+            rate = bytes_done / elapsed if elapsed > 0 else 0.0
+            file_rate = files_done / elapsed if elapsed > 0 else 0.0
+
+            eta = None
+            if self.state == "running":
+                if self.bytes_total and rate:
+                    eta = max(0.0, (self.bytes_total - bytes_done) / rate)
+                elif self.files_total and file_rate:
+                    eta = max(0.0, (self.files_total - files_done) / file_rate)
+
+            return {
+                "job_id": self.job_id,
+                "state": self.state,
+                "error": self.error,
+                "files_done": files_done,
+                "files_total": self.files_total,
+                "bytes_done": bytes_done,
+                "bytes_total": self.bytes_total,
+                "rate": rate,
+                "eta": eta,
+                "elapsed": elapsed,
+                "current_file": self.current_file,
+                "progress": None if self._progress_snapshot is None else self._progress_snapshot.to_dict(),
+            }
+
+    def get_results(self, offset: int = 0, limit: int | None = None) -> dict[str, Any]:
+        with self._lock:
+            total = len(self._results)
+            offset = max(0, offset)
+            end = total if limit is None else min(total, offset + max(0, limit))
+            results = [dict(zip(RESULT_FIELDS, result)) for result in self._results[offset:end]]
+
+        return {"job_id": self.job_id, "state": self.state, "offset": offset, "total": total, "results": results}
+
+
+_jobs: collections.OrderedDict[str, P4SyncJob] = collections.OrderedDict()
+_jobs_lock = threading.Lock()
+
+
+def _forget_finished_jobs() -> None:
+    finished_job_ids = [job_id for job_id, job in _jobs.items() if job.is_finished]
+    for job_id in finished_job_ids[: max(0, len(finished_job_ids) - MAX_FINISHED_JOBS)]:
+        del _jobs[job_id]
+
+
+def _get_job(job_id: str) -> P4SyncJob:
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+
+    if job is None:
+        raise KeyError(f"Unknown job: {job_id}")
+
+    return job
+
+
+def start_sync(path: str | Iterable[str], version: int | None = None, parallel: Any = None) -> str:
+    """
+    Start syncing the given path(s), to `version` if given or else to the
+    latest version, returning the id of the job.
+    """
+
+    job = P4SyncJob(path, version=version, parallel=parallel)
+    with _jobs_lock:
+        _forget_finished_jobs()
+        _jobs[job.job_id] = job
+
+    job.start()
+    return job.job_id
+
+
+def get_progress(job_id: str) -> dict[str, Any]:
+    """
+    Get the state, files, bytes, rate (bytes per second) and ETA (seconds) of a job.
+    """
+
+    return _get_job(job_id).get_progress()
+
+
+def get_results(job_id: str, offset: int = 0, limit: int | None = None) -> dict[str, Any]:
+    """
+    Get a page of the per-file results of a job, which are complete once it has finished.
+    """
+
+    return _get_job(job_id).get_results(offset=offset, limit=limit)
+
+
+def cancel(job_id: str) -> bool:
+    """
+    Cancel a job, returns False if it had already finished.
+    """
+
+    return _get_job(job_id).cancel()
+
+
+def shutdown() -> None:
+    """
+    Cancel all the running jobs.
+    """
+
+    with _jobs_lock:
+        jobs = list(_jobs.values())
+
+    for job in jobs:
+        job.cancel()
+
+
+__all__ = ("start_sync", "get_progress", "get_results", "cancel", "shutdown", "P4SyncJob", "MAX_FINISHED_JOBS")
@@ -1,4 +1,3 @@
-import json
 import datetime
 from aiohttp.web_response import Response
 
@@ -7,9 +6,12 @@ from ayon_core.lib import Logger
 from ayon_core.tools.tray.webserver.base_routes import RestApiEndpoint
 
 from version_control.backends.perforce.backend import (
+    BATCH_OPERATIONS,
     VersionControlPerforce
 )
-from version_control.backends.perforce import api
+from version_control.backends.perforce import aapi
+from version_control.backends.perforce import jobs
+from version_control.rest.perforce import rest_encoding
 
 
 log = Logger.get_logger("P4routes")
@@ -28,42 +30,58 @@ class PerforceRestApiEndpoint(RestApiEndpoint):
         raise TypeError(value)
 
     @classmethod
-    def encode(cls, data):
-        return json.dumps(
+    def encode(cls, data, content_type=rest_encoding.CONTENT_TYPE_JSON):
+        return rest_encoding.encode(
             data,
-            indent=4,
+            content_type,
             default=cls.json_dump_handler
-        ).encode("utf-8")
+        )
+
+    def encode_response(self, request, data) -> Response:
+        """Response of the data, in the encoding the client asked for
+        (see `rest_encoding`)."""
+        content_type = rest_encoding.negotiate_content_type(
+            request.headers.get("Accept")
+        )
+        body, content_encoding = rest_encoding.compress(
+            self.encode(data, content_type),
+            request.headers.get("Accept-Encoding")
+        )
+        headers = {"Vary": "Accept, Accept-Encoding"}
+        if content_encoding:
+            headers["Content-Encoding"] = content_encoding
+
+        return Response(
+            status=200,
+            body=body,
+            content_type=content_type,
+            headers=headers
+        )
 
 
 class LoginEndpoint(PerforceRestApiEndpoint):
     """Returns list of workspaces."""
     async def post(self, request) -> Response:
         content = await request.json()
-        result = api.login(
+        result = await aapi.run(
+            "login",
             content["host"],
             content["port"],
             content["username"],
             content["password"],
             content["workspace_name"]
         )
-        return Response(
-            status=200,
-            body=self.encode(result),
-            content_type="application/json"
-        )
+        return self.encode_response(request, result)
 
 
 class IsPathInAnyWorkspace(PerforceRestApiEndpoint):
     """Returns list of workspaces."""
     async def post(self, request) -> Response:
         content = await request.json()
-        result = api._is_path_under_any_root(content["path"])
-        return Response(
-            status=200,
-            body=self.encode(result),
-            content_type="application/json"
+        result = await aapi.run(
+            VersionControlPerforce.is_in_any_workspace, content["path"]
         )
+        return self.encode_response(request, result)
 
 
 class AddEndpoint(PerforceRestApiEndpoint):
@@ -72,13 +90,10 @@ class AddEndpoint(PerforceRestApiEndpoint):
         log.debug("AddEndpoint called")
         content = await request.json()
 
-        result = VersionControlPerforce.add(content["path"],
-                                            content["comment"])
-        return Response(
-            status=200,
-            body=self.encode(result),
-            content_type="application/json"
+        result = await aapi.run(
+            VersionControlPerforce.add, content["path"], content["comment"]
         )
+        return self.encode_response(request, result)
 
 
 class SyncLatestEndpoint(PerforceRestApiEndpoint):
@@ -87,12 +102,64 @@ class SyncLatestEndpoint(PerforceRestApiEndpoint):
         log.debug("SyncLatestEndpoint called")
         content = await request.json()
 
-        result = VersionControlPerforce.sync_latest_version(content["path"])
-        return Response(
-            status=200,
-            body=self.encode(result),
-            content_type="application/json"
+        result = await aapi.run(
+            VersionControlPerforce.sync_latest_version,
+            content["path"],
+            parallel=content.get("parallel")
         )
+        return self.encode_response(request, result)
+
+
+class StartSyncJobEndpoint(PerforceRestApiEndpoint):
+    """Starts syncing a path in the background, returns the job id."""
+    async def post(self, request) -> Response:
+        log.debug("StartSyncJobEndpoint called")
+        content = await request.json()
+
+        job_id = jobs.start_sync(
+            content["path"],
+            version=content.get("version"),
+            parallel=content.get("parallel")
+        )
+        return self.encode_response(request, {"job_id": job_id})
+
+
+class JobEndpoint(PerforceRestApiEndpoint):
+    """Base for the endpoints of a single background job."""
+    async def post(self, request) -> Response:
+        content = await request.json()
+        try:
+            result = self.get_job_result(content)
+        except KeyError as error:
+            return Response(status=404, text=str(error))
+
+        return self.encode_response(request, result)
+
+    def get_job_result(self, content):
+        raise NotImplementedError()
+
+
+class GetJobProgressEndpoint(JobEndpoint):
+    """Returns the state, files, bytes, rate and ETA of a job."""
+    def get_job_result(self, content):
+        return jobs.get_progress(content["job_id"])
+
+
+class GetJobResultsEndpoint(JobEndpoint):
+    """Returns a page of the per-file results of a job."""
+    def get_job_result(self, content):
+        return jobs.get_results(
+            content["job_id"],
+            offset=content.get("offset") or 0,
+            limit=content.get("limit")
+        )
+
+
+class CancelJobEndpoint(JobEndpoint):
+    """Cancels a job, returns False if it had already finished."""
+    def get_job_result(self, content):
+        log.debug("CancelJobEndpoint called")
+        return jobs.cancel(content["job_id"])
 
 
 class SyncVersionEndpoint(PerforceRestApiEndpoint):
@@ -102,14 +169,14 @@ class SyncVersionEndpoint(PerforceRestApiEndpoint):
         content = await request.json()
 
         log.debug(f"Syncing '{content['path']}' to {content['version']}")
-        result = VersionControlPerforce.sync_to_version(content["path"],
-                                                        content["version"])
-        log.debug("Synced")
-        return Response(
-            status=200,
-            body=self.encode(result),
-            content_type="application/json"
+        result = await aapi.run(
+            VersionControlPerforce.sync_to_version,
+            content["path"],
+            content["version"],
+            parallel=content.get("parallel")
         )
+        log.debug("Synced")
+        return self.encode_response(request, result)
 
 
 class CheckoutEndpoint(PerforceRestApiEndpoint):
@@ -119,13 +186,10 @@ class CheckoutEndpoint(PerforceRestApiEndpoint):
 
         content = await request.json()
 
-        result = VersionControlPerforce.checkout(content["path"],
-                                                 content["comment"])
-        return Response(
-            status=200,
-            body=self.encode(result),
-            content_type="application/json"
+        result = await aapi.run(
+            VersionControlPerforce.checkout, content["path"], content["comment"]
         )
+        return self.encode_response(request, result)
 
 
 class IsCheckoutedEndpoint(PerforceRestApiEndpoint):
@@ -135,12 +199,10 @@ class IsCheckoutedEndpoint(PerforceRestApiEndpoint):
 
         content = await request.json()
 
-        result = VersionControlPerforce.is_checkedout(content["path"])
-        return Response(
-            status=200,
-            body=self.encode(result),
-            content_type="application/json"
+        result = await aapi.run(
+            VersionControlPerforce.is_checkedout, content["path"]
         )
+        return self.encode_response(request, result)
 
 
 class GetChanges(PerforceRestApiEndpoint):
@@ -149,12 +211,49 @@ class GetChanges(PerforceRestApiEndpoint):
         log.debug("GetChanges called")
         content = await request.json()
 
-        result = VersionControlPerforce.get_changes()
-        return Response(
-            status=200,
-            body=self.encode(result),
-            content_type="application/json"
+        result = await aapi.run(
+            VersionControlPerforce.get_changes,
+            path=content.get("path"),
+            since=content.get("since"),
+            before=content.get("before"),
+            limit=content.get("limit"),
+        )
+        return self.encode_response(request, result)
+
+
+class GetChangesPage(PerforceRestApiEndpoint):
+    """Returns a page of submitted changes and the cursor of the next one."""
+    async def post(self, request) -> Response:
+        log.debug("GetChangesPage called")
+        content = await request.json()
+
+        kwargs = {}
+        if content.get("limit"):
+            kwargs["limit"] = content["limit"]
+
+        result = await aapi.run(
+            VersionControlPerforce.get_changes_page,
+            path=content.get("path"),
+            cursor=content.get("cursor"),
+            since=content.get("since"),
+            **kwargs
         )
+        return self.encode_response(request, result)
+
+
+class GetChangeFiles(PerforceRestApiEndpoint):
+    """Returns a page of the files of a change list."""
+    async def post(self, request) -> Response:
+        log.debug("GetChangeFiles called")
+        content = await request.json()
+
+        result = await aapi.run(
+            VersionControlPerforce.get_change_files,
+            content["change"],
+            offset=content.get("offset") or 0,
+            limit=content.get("limit"),
+        )
+        return self.encode_response(request, result)
 
 
 class GetLastChangelist(PerforceRestApiEndpoint):
@@ -163,12 +262,10 @@ class GetLastChangelist(PerforceRestApiEndpoint):
         log.debug("GetLatestChangelist called")
         content = await request.json()
 
-        result = VersionControlPerforce.get_last_change_list()
-        return Response(
-            status=200,
-            body=self.encode(result),
-            content_type="application/json"
+        result = await aapi.run(
+            VersionControlPerforce.get_last_change_list
         )
+        return self.encode_response(request, result)
 
 
 class SubmitChangelist(PerforceRestApiEndpoint):
@@ -177,12 +274,10 @@ class SubmitChangelist(PerforceRestApiEndpoint):
         log.debug("SubmitChangelist called")
         content = await request.json()
 
-        result = VersionControlPerforce.submit_change_list(content["comment"])
-        return Response(
-            status=200,
-            body=self.encode(result),
-            content_type="application/json"
+        result = await aapi.run(
+            VersionControlPerforce.submit_change_list, content["comment"]
         )
+        return self.encode_response(request, result)
 
 
 class ExistsOnServer(PerforceRestApiEndpoint):
@@ -191,18 +286,62 @@ class ExistsOnServer(PerforceRestApiEndpoint):
         log.debug("exists_on_server called")
         content = await request.json()
 
-        result = VersionControlPerforce.exists_on_server(content["path"])
-        return Response(
-            status=200,
-            body=self.encode(result),
-            content_type="application/json"
+        result = await aapi.run(
+            VersionControlPerforce.exists_on_server, content["path"]
+        )
+        return self.encode_response(request, result)
+
+
+class GetFolderFreshness(PerforceRestApiEndpoint):
+    """Returns how many files and bytes folders are behind the server."""
+    async def post(self, request) -> Response:
+        log.debug("get_folder_freshness called")
+        content = await request.json()
+
+        result = await aapi.run(
+            VersionControlPerforce.get_folder_freshness, content["path"]
         )
+        return self.encode_response(request, result)
+
+
+class BatchEndpoint(PerforceRestApiEndpoint):
+    """Runs a list of operations on one P4 connection, returns their results
+    in the same order."""
+    async def post(self, request) -> Response:
+        log.debug("BatchEndpoint called")
+        content = await request.json()
+
+        operations = content.get("operations") or []
+        unknown = [
+            operation.get("command")
+            for operation in operations
+            if operation.get("command") not in BATCH_OPERATIONS
+        ]
+        if unknown:
+            return Response(
+                status=400, text=f"Unknown batch operations: {unknown}"
+            )
+
+        # Batches that sync or submit run on the transfer pool:
+        transfer = any(
+            operation["command"] in aapi.TRANSFER_FUNCTIONS
+            for operation in operations
+        )
+        result = await aapi.run(
+            VersionControlPerforce.run_batch,
+            operations,
+            stop_on_error=bool(content.get("stop_on_error")),
+            transfer=transfer
+        )
+        return self.encode_response(request, result)
 
 
 class GetServerVersionEndpoint(PerforceRestApiEndpoint):
     """Returns list of dict with project info (id, name)."""
     async def get(self) -> Response:
-        result = VersionControlPerforce.get_server_version()
+        result = await aapi.run(
+            VersionControlPerforce.get_server_version
+        )
         return Response(
             status=200,
             body=self.encode(result),
@@ -215,12 +354,10 @@ class GetStreamEndpoint(PerforceRestApiEndpoint):
     async def post(self, request) -> Response:
         content = await request.json()
 
-        result = VersionControlPerforce.get_stream(content["workspace_name"])
-        return Response(
-            status=200,
-            body=self.encode(result),
-            content_type="application/json"
+        result = await aapi.run(
+            VersionControlPerforce.get_stream, content["workspace_name"]
         )
+        return self.encode_response(request, result)
 
 
 class GetWorkspaceDirEndpoint(PerforceRestApiEndpoint):
@@ -228,11 +365,8 @@ class GetWorkspaceDirEndpoint(PerforceRestApiEndpoint):
     async def post(self, request) -> Response:
         content = await request.json()
 
-        result = VersionControlPerforce.get_workspace_dir(
+        result = await aapi.run(
+            VersionControlPerforce.get_workspace_dir,
             content["workspace_name"]
         )
-        return Response(
-            status=200,
-            body=self.encode(result),
-            content_type="application/json"
-        )
+        return self.encode_response(request, result)
@@ -0,0 +1,370 @@
+"""
+A local, persistent store of the submitted change lists of each server
+and stream, shared by every process (and tray session) of the user.
+
+Reading the change history from the server on every open of the changes
+viewer transfers the whole history each time. Instead, the change lists are
+kept in an SQLite database, where a scope is filled a page at a time: the
+newest page first, older pages as they are read and afterwards only the
+changes newer than the highest stored change:
+
+```
+def fetch_changes(since, before, limit):
+    return PerforceRestStub.get_changes(path=scope, since=since, before=before, limit=limit)
+
+store = ChangesStore()
+store.update(server, scope, fetch_changes)
+changes = store.read_changes(server, scope, fetch_changes, before=cursor, limit=500)
+```
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+
+_typing = False
+if _typing:
+    from typing import Any
+    from typing import Callable
+    from typing import Iterable
+del _typing
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS changes (
+    server TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    change INTEGER NOT NULL,
+    user TEXT,
+    client TEXT,
+    time INTEGER,
+    desc TEXT,
+    PRIMARY KEY (server, scope, change)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS scopes (
+    server TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    highest_change INTEGER NOT NULL,
+    lowest_change INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (server, scope)
+) WITHOUT ROWID;
+"""
+
+# The columns of the `changes` table, in the order they are selected:
+_COLUMNS = ("change", "user", "client", "time", "desc")
+
+# The number of change lists fetched from the server per request:
+FETCH_PAGE_SIZE = 1000
+
+
+def get_default_store_path() -> str:
+    # Imported here, as only the default path requires AYON:
+    from ayon_core.lib import get_ayon_appdirs
+
+    return get_ayon_appdirs("addons", "version_control", "changes.sqlite3")
+
+
+class ChangesStore:
+    """
+    The submitted change lists of each (server, scope), where the scope is
+    the depot path the changes were queried for (i.e. `//streams/main/...`).
+
+    A scope is filled a page at a time by `update` and `fill_older`, so the
+    store holds every change list of the scope from its lowest to its highest
+    stored change. A lowest change of 0 means the scope is complete, down to
+    its first change list. Later updates only need to fetch the changes that
+    are newer than the highest one.
+    Change lists are returned as `p4 changes` records, newest first.
+
+    The changes are fetched by a `fetch_changes(since, before, limit)` callable,
+    returning the `p4 changes` records newer than `since` and older than
+    `before` (either may be `None`), newest first and up to `limit` of them,
+    or `None` if the fetch failed, which raises a `RuntimeError` and leaves
+    the scope as it was.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or get_default_store_path()
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+
+    # Private Methods:
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            # Allow other processes to read whilst one of them is updating:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+
+        return self._connection
+
+    @staticmethod
+    def _fetch_page(
+        fetch_changes: Callable[[int | None, int | None, int], Any],
+        since: int | None,
+        before: int | None,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        # A failed fetch must not be stored as the end of the scope:
+        changes = fetch_changes(since, before, limit)
+        if changes is None:
+            raise RuntimeError(f"Failed to fetch the changes since {since} and before {before}")
+
+        return list(changes)
+
+    @staticmethod
+    def _to_record(row: tuple[Any, ...]) -> dict[str, str]:
+        record = dict(zip(_COLUMNS, row))
+        record["change"] = str(record["change"])
+        record["time"] = str(record["time"])
+        record["status"] = "submitted"
+        return record
+
+    # Public Methods:
+    def get_highest_change(self, server: str, scope: str) -> int | None:
+        """
+        Get the highest change of the given scope, `None` if the scope has never been filled.
+        """
+
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT highest_change FROM scopes WHERE server = ? AND scope = ?", (server, scope)
+            ).fetchone()
+
+        return None if row is None else row[0]
+
+    def get_lowest_change(self, server: str, scope: str) -> int | None:
+        """
+        Get the lowest change of the given scope, 0 if the scope is complete
+        or `None` if the scope has never been filled.
+        """
+
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT lowest_change FROM scopes WHERE server = ? AND scope = ?", (server, scope)
+            ).fetchone()
+
+        return None if row is None else row[0]
+
+    def is_complete(self, server: str, scope: str) -> bool:
+        return self.get_lowest_change(server, scope) == 0
+
+    def add_changes(
+        self,
+        server: str,
+        scope: str,
+        changes: Iterable[dict[str, Any]],
+        highest_change: int | None = None,
+        lowest_change: int | None = None,
+    ) -> int:
+        """
+        Store the given `p4 changes` records, returns the number of records stored.
+        If `highest_change` is given, the store holds every change of the scope up to it,
+        from `lowest_change` if given (0 for the first change) or else from its lowest change.
+        A scope that's new to the store must be given its `highest_change`.
+        """
+
+        rows = [
+            (
+                server,
+                scope,
+                int(change["change"]),
+                change.get("user"),
+                change.get("client"),
+                int(change.get("time") or 0),
+                change.get("desc"),
+            )
+            for change in changes
+        ]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO changes (server, scope, change, user, client, time, desc) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                # Another process may have updated the scope further already:
+                if highest_change is not None:
+                    connection.execute(
+                        "INSERT INTO scopes (server, scope, highest_change, lowest_change) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT (server, scope) DO UPDATE SET "
+                        "highest_change = MAX(highest_change, excluded.highest_change)",
+                        (server, scope, highest_change, lowest_change or 0),
+                    )
+
+                if lowest_change is not None:
+                    connection.execute(
+                        "UPDATE scopes SET lowest_change = MIN(lowest_change, ?) WHERE server = ? AND scope = ?",
+                        (lowest_change, server, scope),
+                    )
+
+        return len(rows)
+
+    def update(
+        self,
+        server: str,
+        scope: str,
+        fetch_changes: Callable[[int | None, int | None, int], Any],
+        page_size: int = FETCH_PAGE_SIZE,
+    ) -> int:
+        """
+        Fetch and store the changes that are newer than the highest change of the scope,
+        a page at a time, or only its newest page if the scope has never been filled.
+        Returns the number of new changes.
+        """
+
+        since = self.get_highest_change(server, scope)
+        if since is None:
+            return self.fill_older(server, scope, fetch_changes, page_size=page_size)
+
+        # The newer changes are only stored once all of them are fetched,
+        # as the stored changes of a scope must not have gaps:
+        changes: list[dict[str, Any]] = []
+        before = None
+        while True:
+            page = self._fetch_page(fetch_changes, since, before, page_size)
+            changes.extend(page)
+            if len(page) < page_size:
+                break
+
+            before = min(int(change["change"]) for change in page)
+
+        highest_change = max((int(change["change"]) for change in changes), default=since)
+        return self.add_changes(server, scope, changes, highest_change=highest_change)
+
+    def fill_older(
+        self,
+        server: str,
+        scope: str,
+        fetch_changes: Callable[[int | None, int | None, int], Any],
+        page_size: int = FETCH_PAGE_SIZE,
+    ) -> int:
+        """
+        Fetch and store the page of changes that are older than the lowest change of
+        the scope, or its newest page if the scope has never been filled.
+        Returns the number of new changes, 0 once the scope is complete.
+        """
+
+        before = self.get_lowest_change(server, scope)
+        if before == 0:
+            return 0
+
+        changes = self._fetch_page(fetch_changes, None, before, page_size)
+        numbers = [int(change["change"]) for change in changes]
+        # A partial page is the last one:
+        lowest_change = min(numbers) if len(changes) >= page_size else 0
+        highest_change = max(numbers, default=0) if before is None else None
+        return self.add_changes(
+            server, scope, changes, highest_change=highest_change, lowest_change=lowest_change
+        )
+
+    def read_changes(
+        self,
+        server: str,
+        scope: str,
+        fetch_changes: Callable[[int | None, int | None, int], Any],
+        before: int | None = None,
+        limit: int | None = None,
+        page_size: int = FETCH_PAGE_SIZE,
+    ) -> list[dict[str, str]]:
+        """
+        Get the changes of the scope older than `before`, up to `limit` changes
+        (or every change if `None`), first filling the store with as many older
+        pages as that requires. Newer changes are not fetched, see `update`.
+        """
+
+        while True:
+            changes = self.get_changes(server, scope, before=before, limit=limit)
+            if (limit and len(changes) >= limit) or self.is_complete(server, scope):
+                return changes
+
+            self.fill_older(server, scope, fetch_changes, page_size=page_size)
+
+    def get_changes(
+        self,
+        server: str,
+        scope: str,
+        since: int | None = None,
+        before: int | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, str]]:
+        """
+        Get the stored changes of the scope newer than `since`
+        and older than `before`, up to `limit` changes.
+        """
+
+        query = f"SELECT {', '.join(_COLUMNS)} FROM changes WHERE server = ? AND scope = ?"
+        parameters: list[Any] = [server, scope]
+        if since is not None:
+            query += " AND change > ?"
+            parameters.append(int(since))
+
+        if before is not None:
+            query += " AND change < ?"
+            parameters.append(int(before))
+
+        query += " ORDER BY change DESC"
+        if limit:
+            query += " LIMIT ?"
+            parameters.append(int(limit))
+
+        with self._lock:
+            rows = self._connect().execute(query, parameters).fetchall()
+
+        return [self._to_record(row) for row in rows]
+
+    def get_latest_change(self, server: str, scope: str) -> dict[str, str] | None:
+        changes = self.get_changes(server, scope, limit=1)
+        return changes[0] if changes else None
+
+    def clear(self, server: str | None = None, scope: str | None = None) -> None:
+        """
+        Remove the stored changes of the given scope, of all the scopes
+        of the given server, or of every server if neither is given.
+        """
+
+        condition = ""
+        parameters: list[Any] = []
+        if server is not None:
+            condition = " WHERE server = ?"
+            parameters.append(server)
+            if scope is not None:
+                condition += " AND scope = ?"
+                parameters.append(scope)
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(f"DELETE FROM changes{condition}", parameters)
+                connection.execute(f"DELETE FROM scopes{condition}", parameters)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def get_server_key(host: str | None, port: Any) -> str:
+    """
+    Get the key the changes of a server are stored under.
+    """
+
+    return f"{host or ''}:{port or ''}".lower()
+
+
+def get_stream_scope(stream: str | None) -> str:
+    """
+    Get the scope of the changes of the given stream, an empty
+    scope (the whole server) if there is no stream.
+    """
+
+    return f"{stream}/..." if stream else ""
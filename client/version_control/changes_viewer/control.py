@@ -7,6 +7,13 @@ from ayon_core.addon import AddonsManager
 
 from version_control.rest.perforce.rest_stub import PerforceRestStub
 from version_control.lib import WorkspaceProfileContext
+from version_control.changes_store import (
+    ChangesStore,
+    get_server_key,
+    get_stream_scope,
+)
+
+CHANGES_PAGE_SIZE = 500
 
 
 class ChangesViewerController:
@@ -39,6 +46,8 @@ class ChangesViewerController:
             context=workspace_profile_context
         )
         self._conn_info = conn_info
+        self._changes_scope = None
+        self._changes_store = ChangesStore()
 
         self._event_system = self._create_event_system()
 
@@ -66,8 +75,80 @@ class ChangesViewerController:
             workspace_name=conn_info["workspace_name"]
         )
 
-    def get_changes(self):
-        return PerforceRestStub.get_changes()
+    def get_changes(self, since=None):
+        """Get the changes of the workspace's stream newer than `since`.
+
+        Only asking for the changes newer than `since` fetches the changes
+        submitted since the store was last updated, otherwise every change
+        is read, filling the store with the pages it's missing.
+        """
+        server, scope = self._get_changes_scope()
+        if since is not None:
+            self._update_changes_store(server, scope)
+            return self._changes_store.get_changes(server, scope, since=since)
+
+        return self._changes_store.read_changes(
+            server, scope, self._get_fetch_changes(scope))
+
+    def get_changes_page(self, cursor=None):
+        """Get a page of the changes of the workspace's stream.
+
+        Returns:
+            dict: The `changes` of the page and the `cursor` of the next
+                (older) page, `None` if there are no older changes.
+        """
+        server, scope = self._get_changes_scope()
+        if cursor is None:
+            # The first page holds the newest changes:
+            self._update_changes_store(server, scope)
+
+        # One more change is read to know if there is another page:
+        changes = self._changes_store.read_changes(
+            server,
+            scope,
+            self._get_fetch_changes(scope),
+            before=cursor,
+            limit=CHANGES_PAGE_SIZE + 1
+        )
+        next_cursor = None
+        if len(changes) > CHANGES_PAGE_SIZE:
+            changes = changes[:CHANGES_PAGE_SIZE]
+            next_cursor = int(changes[-1]["change"])
+        return {"changes": changes, "cursor": next_cursor}
+
+    def get_change_files(self, change_id, offset=0, limit=None):
+        """Get a page of the files of a change.
+
+        Returns:
+            dict: The `files` of the page and the `total` number of files.
+        """
+        return PerforceRestStub.get_change_files(
+            change_id, offset=offset, limit=limit)
+
+    def start_sync_to(self, change_id):
+        """Start syncing the workspace to the change in the background.
+
+        Returns:
+            Union[str, None]: Id of the sync job, to poll its progress.
+        """
+        if not self.enabled:
+            return None
+
+        if not self._conn_info:
+            raise RuntimeError("Not collected conn_info")
+        conn_info = self._conn_info
+        self.login()
+        workspace_dir = PerforceRestStub.get_workspace_dir(
+            conn_info["workspace_name"])
+        return PerforceRestStub.start_sync_job(
+            f"{workspace_dir}/...", version=change_id,
+            parallel=conn_info.get("parallel_sync"))
+
+    def get_sync_progress(self, job_id):
+        return PerforceRestStub.get_job_progress(job_id)
+
+    def cancel_sync(self, job_id):
+        return PerforceRestStub.cancel_job(job_id)
 
     def sync_to(self, change_id):
         if not self.enabled:
@@ -87,7 +168,8 @@ class ChangesViewerController:
         workspace_dir = PerforceRestStub.get_workspace_dir(
             conn_info["workspace_name"])
         PerforceRestStub.sync_to_version(
-            f"{workspace_dir}/...", change_id)
+            f"{workspace_dir}/...", change_id,
+            parallel=conn_info.get("parallel_sync"))
 
 
     def get_current_project_name(self):
@@ -99,3 +181,26 @@ class ChangesViewerController:
     def _create_event_system(self):
         return QueuedEventSystem()
 
+    def _get_changes_scope(self):
+        # Scope the changes to the stream of the workspace, so the server
+        # doesn't send the history of the whole depot:
+        if self._changes_scope is None:
+            server = scope = ""
+            if self._conn_info:
+                conn_info = self._conn_info
+                server = get_server_key(conn_info["host"], conn_info["port"])
+                scope = get_stream_scope(
+                    PerforceRestStub.get_stream(conn_info["workspace_name"]))
+            self._changes_scope = (server, scope)
+        return self._changes_scope
+
+    def _get_fetch_changes(self, scope):
+        def _fetch_changes(since, before, limit):
+            return PerforceRestStub.get_changes(
+                path=scope or None, since=since, before=before, limit=limit)
+        return _fetch_changes
+
+    def _update_changes_store(self, server, scope):
+        # Only the changes newer than the stored ones are fetched:
+        self._changes_store.update(
+            server, scope, self._get_fetch_changes(scope))
@@ -1,67 +1,513 @@
-from qtpy import QtCore, QtGui
+import heapq
+import logging
+import threading
+from array import array
 from datetime import datetime
 
+from qtpy import QtCore
+
+from .search import ChangesSearchIndex
+
 CHANGE_ROLE = QtCore.Qt.UserRole + 1
 DESC_ROLE = QtCore.Qt.UserRole + 2
 AUTHOR_ROLE = QtCore.Qt.UserRole + 3
 CREATED_ROLE = QtCore.Qt.UserRole + 4
+SORT_ROLE = QtCore.Qt.UserRole + 5
+
+# Changes stored per hold of the model's lock, so the UI thread isn't
+# blocked from showing the fetched rows whilst a large fetch is stored:
+STORE_CHUNK_SIZE = 1000
+
+# Milliseconds the search text must be unchanged for, before it's searched:
+SEARCH_DELAY = 250
+
+log = logging.getLogger(__name__)
+
+
+class ChangesFetchThread(QtCore.QThread):
+    """Runs a fetch off the UI thread, emitting its result.
+
+    The result is None if the fetch failed, so the callback is always
+    called and can reset the state of the fetch.
+    """
+    fetched = QtCore.Signal(int, object)
+
+    def __init__(self, generation, func, *args):
+        super().__init__()
+        self._generation = generation
+        self._func = func
+        self._args = args
+
+    def run(self):
+        try:
+            result = self._func(self._generation, *self._args)
+        except Exception:
+            log.exception("Failed to fetch the changes")
+            result = None
+        self.fetched.emit(self._generation, result)
 
 
-class ChangesModel(QtGui.QStandardItemModel):
+class ChangesModel(QtCore.QAbstractTableModel):
+    """Changes of the workspace's stream, newest first.
+
+    Changes are kept in column arrays, in the order they were fetched, and
+    only converted for display when a view asks for them. `_ordered_ids`
+    keeps the ids of those changes newest first, as they are fetched. Rows
+    map to the columns through `_rows`, which is either every change or the
+    changes matching the current search, in the same order.
+
+    Pages of older changes are fetched on a worker thread as the view
+    scrolls to the bottom (`canFetchMore`/`fetchMore`). Searching fetches
+    the rest of the changes first, so the whole history is searched, once
+    the search text stopped changing for `SEARCH_DELAY` milliseconds.
+    """
     column_labels = [
         "Change",
         "Description",
         "Author",
         "Date submitted",
     ]
+    refreshed = QtCore.Signal()
 
     def __init__(self, controller, *args, **kwargs):
         super(ChangesModel, self).__init__(*args, **kwargs)
-        self._changes_by_item_id = {}
+        self._numbers = array("q")
+        self._times = array("q")
+        self._descs = []
+        self._authors = []
+        self._ids_by_number = {}
+        self._ordered_ids = array("q")
+        self._rows = array("q")
+        self._search_index = ChangesSearchIndex()
+        self._search_text = ""
+        self._pending_search_text = ""
+        self._search_timer = QtCore.QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DELAY)
+        self._search_timer.timeout.connect(self._on_search_timer)
+
+        # Cursor of the next (older) page of changes to fetch:
+        self._cursor = None
+        self._newest_change = None
+        self._is_complete = False
+        # Results of fetches started before the last refresh are ignored:
+        self._generation = 0
+        self._threads = set()
+        self._fetching = False
+        self._fetching_all = False
+        # Guards the change columns, which are filled by the fetch threads:
+        self._lock = threading.Lock()
 
         controller.login()
 
         self._controller = controller
 
-        self.setColumnCount(len(self.column_labels))
-        for idx, label in enumerate(self.column_labels):
-            self.setHeaderData(idx, QtCore.Qt.Horizontal, label)
-
     def refresh(self):
-        self.removeRows(0, self.rowCount())  # Clear existing data
-        changes = self._controller.get_changes()
+        self.beginResetModel()
+        with self._lock:
+            # Fetches started before the refresh are discarded:
+            self._generation += 1
+            self._numbers = array("q")
+            self._times = array("q")
+            self._descs = []
+            self._authors = []
+            self._ids_by_number = {}
+            self._search_index.clear()
+            self._newest_change = None
+        self._ordered_ids = array("q")
+        self._rows = array("q")
+        self._cursor = None
+        self._is_complete = False
+        self._fetching_all = False
+        self.endResetModel()
+
+        self._fetching = True
+        self._start_fetch(self._on_page_fetched, self._fetch_page, None)
+
+    def refresh_newer(self):
+        """Add only the changes submitted since the last refresh."""
+        if self._newest_change is None:
+            self.refresh()
+            return
+
+        self._start_fetch(
+            self._on_newer_fetched, self._fetch_newer, self._newest_change)
+
+    def is_fetching(self):
+        return self._fetching
+
+    def set_search_text(self, text):
+        """Show only the changes matching the search query.
 
-        for change in changes:
-            date_time = datetime.fromtimestamp(int(change["time"]))
-            date_string = date_time.strftime("%Y%m%dT%H%M%SZ")
+        See `ChangesQuery.parse` for the query syntax. The changes are
+        searched once the text stopped changing for `SEARCH_DELAY`.
+        """
+        self._pending_search_text = text.strip()
+        self._search_timer.start()
 
-            number_item = QtGui.QStandardItem(change["change"])
-            number_item.setData(int(change["change"]), CHANGE_ROLE)  # Store number for sorting
-            desc_item = QtGui.QStandardItem(change["desc"])
-            author_item = QtGui.QStandardItem(change["user"])
-            date_item = QtGui.QStandardItem(date_string)
-            self.appendRow([number_item, desc_item, author_item, date_item])
+    def _on_search_timer(self):
+        self._search_text = self._pending_search_text
+        if self._search_text and not self._is_complete:
+            # Rows are updated once the rest of the changes are fetched:
+            if not self._fetching_all:
+                self._fetching_all = True
+                self._fetching = True
+                self._start_fetch(self._on_all_fetched, self._fetch_all)
+            return
+        self._update_rows()
 
-    def data(self, index, role=QtGui.Qt.DisplayRole):
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.column_labels)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if (
+            orientation == QtCore.Qt.Horizontal
+            and role == QtCore.Qt.DisplayRole
+        ):
+            return self.column_labels[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        change_id = self._rows[index.row()]
+        # The columns are appended to by the fetch threads:
+        with self._lock:
+            number = self._numbers[change_id]
+            created = self._times[change_id]
+            desc = self._descs[change_id]
+            author = self._authors[change_id]
+
+        column = index.column()
         if role == CHANGE_ROLE:
-            # Return actual data stored for sorting
-            return index.model().item(index.row(), 0).data(CHANGE_ROLE)
-        return super().data(index, role)
+            return number
 
-    def get_change_by_id(self, item_id):
-        return self._changes_by_item_id.get(item_id)
+        if role == SORT_ROLE:
+            # Numeric sort keys for the change number and date columns:
+            if column == 0:
+                return number
+            if column == 3:
+                return created
+            role = QtCore.Qt.DisplayRole
 
+        if role == DESC_ROLE:
+            return desc
 
-class CustomSortProxyModel(QtCore.QSortFilterProxyModel):
-    def lessThan(self, source_left, source_right):
-        first_column = 0
+        if role == AUTHOR_ROLE:
+            return author
+
+        if role == CREATED_ROLE:
+            return created
+
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+            if column == 0:
+                return str(number)
+            if column == 1:
+                return desc
+            if column == 2:
+                return author
+            if column == 3:
+                date_time = datetime.fromtimestamp(created)
+                return date_time.strftime("%Y%m%dT%H%M%SZ")
+        return None
+
+    def canFetchMore(self, parent):
+        if parent.isValid() or self._fetching or self._search_text:
+            return False
+        return self._cursor is not None
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+
+        self._fetching = True
+        self._start_fetch(
+            self._on_page_fetched, self._fetch_page, self._cursor)
+
+    def _start_fetch(self, callback, func, *args):
+        thread = ChangesFetchThread(self._generation, func, *args)
+        thread.fetched.connect(callback)
+        thread.finished.connect(lambda: self._threads.discard(thread))
+        self._threads.add(thread)
+        thread.start()
+
+    # The `_fetch_*` methods run on worker threads, they store and index
+    # the fetched changes so the UI thread only has to show the new rows.
+    def _fetch_page(self, generation, cursor):
+        page = self._controller.get_changes_page(cursor=cursor)
+        return page["cursor"], self._store_changes(generation, page["changes"])
+
+    def _fetch_newer(self, generation, since):
+        changes = self._controller.get_changes(since=since)
+        return self._store_changes(generation, changes or [])
+
+    def _fetch_all(self, generation):
+        changes = self._controller.get_changes()
+        return self._store_changes(generation, changes or [])
+
+    def _store_changes(self, generation, changes):
+        new_ids = array("q")
+        for start in range(0, len(changes), STORE_CHUNK_SIZE):
+            with self._lock:
+                if generation != self._generation:
+                    return array("q")
+
+                for change in changes[start:start + STORE_CHUNK_SIZE]:
+                    # Changes that were already fetched by another request
+                    # are skipped:
+                    number = int(change["change"])
+                    if number in self._ids_by_number:
+                        continue
+
+                    change_id = len(self._numbers)
+                    self._ids_by_number[number] = change_id
+                    self._numbers.append(number)
+                    self._times.append(int(change["time"]))
+                    self._descs.append(change["desc"])
+                    self._authors.append(change["user"])
+                    self._search_index.add(
+                        change_id,
+                        change["desc"],
+                        change["user"],
+                        change.get("client"),
+                        change["time"],
+                    )
+                    new_ids.append(change_id)
+                    if (
+                        self._newest_change is None
+                        or number > self._newest_change
+                    ):
+                        self._newest_change = number
 
-        # Use different sort roles for the first column and others
-        SORT_ROLE = QtGui.Qt.DisplayRole
-        if source_left.column() == first_column:
-            SORT_ROLE = CHANGE_ROLE
+        return new_ids
 
-        left_data = self.sourceModel().data(source_left, SORT_ROLE)
-        right_data = self.sourceModel().data(source_right, SORT_ROLE)
+    def _on_page_fetched(self, generation, result):
+        if generation != self._generation:
+            return
 
-        return left_data < right_data
+        self._fetching = self._fetching_all
+        if result is None:
+            # The view fetches a failed page again when it asks for more,
+            # a failed first page is fetched again by a refresh:
+            return
+
+        cursor, new_ids = result
+        if not self._is_complete:
+            self._cursor = cursor
+            self._is_complete = cursor is None
+        self._add_rows(new_ids, newer=False)
+
+    def _on_newer_fetched(self, generation, new_ids):
+        if generation != self._generation or new_ids is None:
+            return
+        self._add_rows(new_ids, newer=True)
+
+    def _on_all_fetched(self, generation, new_ids):
+        if generation != self._generation:
+            return
+
+        self._fetching = self._fetching_all = False
+        if new_ids is None:
+            # Only the fetched changes are searched:
+            self._update_rows()
+            return
+
+        self._cursor = None
+        self._is_complete = True
+        if new_ids:
+            # Changes can be both older and newer than the shown ones:
+            with self._lock:
+                numbers = self._numbers
+                new_ids = sorted(
+                    new_ids,
+                    key=lambda change_id: numbers[change_id],
+                    reverse=True
+                )
+                self._ordered_ids = array(
+                    "q",
+                    heapq.merge(
+                        self._ordered_ids,
+                        new_ids,
+                        key=lambda change_id: numbers[change_id],
+                        reverse=True
+                    )
+                )
+        self._update_rows()
+
+    def _add_rows(self, new_ids, newer):
+        """Add fetched changes, that are all newer or all older than the
+        shown ones, newest first."""
+        if not new_ids:
+            return
+
+        if newer:
+            self._ordered_ids[0:0] = new_ids
+        else:
+            self._ordered_ids.extend(new_ids)
+
+        if self._search_text:
+            with self._lock:
+                matching = self._search_index.search(self._search_text)
+            new_ids = array(
+                "q",
+                (change_id for change_id in new_ids if change_id in matching)
+            )
+            if not new_ids:
+                return
+
+        row = 0 if newer else len(self._rows)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row + len(new_ids) - 1)
+        self._rows[row:row] = new_ids
+        self.endInsertRows()
+        self.refreshed.emit()
+
+    def _update_rows(self):
+        # `_ordered_ids` are in change order already, so the matching
+        # changes only have to be picked from them:
+        if self._search_text:
+            with self._lock:
+                matching = self._search_index.search(self._search_text)
+            rows = array(
+                "q",
+                (
+                    change_id
+                    for change_id in self._ordered_ids
+                    if change_id in matching
+                )
+            )
+        else:
+            rows = array("q", self._ordered_ids)
+
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+        self.refreshed.emit()
+
+
+class ChangeFilesModel(QtCore.QAbstractTableModel):
+    """Files of the current change, fetched a page at a time.
+
+    The first page is fetched when the change is set and the next ones as
+    the view scrolls to the bottom, each on a worker thread.
+    """
+    column_labels = [
+        "File",
+        "Action",
+        "Revision",
+    ]
+    fields = ("depotFile", "action", "rev")
+    page_size = 1000
+
+    def __init__(self, controller, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._controller = controller
+        self._change_id = None
+        self._files = []
+        self._total = 0
+        self._generation = 0
+        self._threads = set()
+        self._fetching = False
+
+    def get_total(self):
+        return self._total
+
+    def set_change(self, change_id):
+        if change_id == self._change_id:
+            return
+
+        self.beginResetModel()
+        self._change_id = change_id
+        self._files = []
+        self._total = 0
+        self._generation += 1
+        self._fetching = False
+        self.endResetModel()
+
+        if change_id is not None:
+            self._fetch_page()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._files)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.column_labels)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if (
+            orientation == QtCore.Qt.Horizontal
+            and role == QtCore.Qt.DisplayRole
+        ):
+            return self.column_labels[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+            return self._files[index.row()].get(self.fields[index.column()])
+        return None
+
+    def canFetchMore(self, parent):
+        if parent.isValid() or self._fetching or self._change_id is None:
+            return False
+        return len(self._files) < self._total
+
+    def fetchMore(self, parent):
+        if self.canFetchMore(parent):
+            self._fetch_page()
+
+    def _fetch_page(self):
+        self._fetching = True
+        thread = ChangesFetchThread(
+            self._generation,
+            self._get_page,
+            self._change_id,
+            len(self._files)
+        )
+        thread.fetched.connect(self._on_page_fetched)
+        thread.finished.connect(lambda: self._threads.discard(thread))
+        self._threads.add(thread)
+        thread.start()
+
+    def _get_page(self, generation, change_id, offset):
+        return self._controller.get_change_files(
+            change_id, offset=offset, limit=self.page_size)
+
+    def _on_page_fetched(self, generation, page):
+        if generation != self._generation:
+            return
+
+        self._fetching = False
+        if not page:
+            return
+
+        self._total = page["total"]
+        files = page["files"]
+        if not files:
+            return
+
+        row = len(self._files)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row + len(files) - 1)
+        self._files.extend(files)
+        self.endInsertRows()
+
+
+class CustomSortProxyModel(QtCore.QSortFilterProxyModel):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Sort by the numeric keys of the source model, rather than
+        # comparing the display strings:
+        self.setSortRole(SORT_ROLE)
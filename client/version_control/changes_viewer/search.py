@@ -0,0 +1,201 @@
+"""Search index over the changes shown by the changes viewer.
+
+Changes are indexed as they are added to the model, so a query only looks up
+the (prefix) matching tokens, rather than testing every change's text:
+
+```
+index = ChangesSearchIndex()
+index.add(change_id, "Fix broken lights", "jane", "jane_ws", 1700000000)
+index.search("fix li author:jane after:2023-11-01")
+```
+"""
+import bisect
+import re
+from array import array
+from datetime import datetime, timedelta
+
+TOKEN_REGEX = re.compile(r"\w+", re.UNICODE)
+DATE_FORMAT = "%Y-%m-%d"
+
+# Query filters, i.e. `author:jane` or `after:2024-01-31`:
+AUTHOR_FILTERS = ("author", "user")
+AFTER_FILTERS = ("after", "since", "from")
+BEFORE_FILTERS = ("before", "until", "to")
+
+
+def tokenize(text):
+    """Lower case words of the text, as they are indexed and queried."""
+    if not text:
+        return []
+    return TOKEN_REGEX.findall(text.lower())
+
+
+class ChangesQuery:
+    """Parsed search query.
+
+    Args:
+        terms (list[str]): Prefixes each matching change must contain.
+        author (Union[str, None]): Author the changes must be submitted by.
+        start_time (Union[int, None]): Earliest submit time (timestamp).
+        end_time (Union[int, None]): Latest submit time (timestamp).
+    """
+
+    def __init__(self, terms=None, author=None, start_time=None, end_time=None):
+        self.terms = terms or []
+        self.author = author
+        self.start_time = start_time
+        self.end_time = end_time
+
+    @classmethod
+    def parse(cls, text):
+        """Parse query text like `fix li author:jane after:2024-01-31`.
+
+        Dates of `before:` are inclusive. Filters with invalid dates are
+        searched as text.
+        """
+        query = cls()
+        for part in text.split():
+            key, sep, value = part.partition(":")
+            key = key.lower()
+            if sep and value:
+                if key in AUTHOR_FILTERS:
+                    query.author = value.lower()
+                    continue
+
+                if key in AFTER_FILTERS or key in BEFORE_FILTERS:
+                    try:
+                        date = datetime.strptime(value, DATE_FORMAT)
+                    except ValueError:
+                        pass
+                    else:
+                        if key in AFTER_FILTERS:
+                            query.start_time = int(date.timestamp())
+                        else:
+                            date += timedelta(days=1)
+                            query.end_time = int(date.timestamp()) - 1
+                        continue
+
+            query.terms.extend(tokenize(part))
+        return query
+
+    def is_empty(self):
+        return (
+            not self.terms
+            and self.author is None
+            and self.start_time is None
+            and self.end_time is None
+        )
+
+
+class ChangesSearchIndex:
+    """Inverted index (token -> change ids) of changes.
+
+    Change ids are the consecutive numbers changes were added with, starting
+    at 0, so the caller can keep the change data in arrays of its own.
+    Description, author and client are indexed; query terms match any token
+    starting with them and all the terms of a query must match.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._authors = {}
+        self._times = array("q")
+        # Sorted tokens for prefix lookups, rebuilt after tokens are added:
+        self._sorted_tokens = None
+
+    def __len__(self):
+        return len(self._times)
+
+    def add(self, change_id, description, author, client, time):
+        if change_id != len(self._times):
+            raise ValueError(
+                f"Expected change id {len(self._times)}, got {change_id}")
+
+        self._times.append(int(time))
+        tokens = set(tokenize(description))
+        tokens.update(tokenize(author))
+        tokens.update(tokenize(client))
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = array("q")
+                self._sorted_tokens = None
+            postings.append(change_id)
+
+        self._authors.setdefault((author or "").lower(), array("q")).append(
+            change_id)
+
+    def clear(self):
+        self._postings.clear()
+        self._authors.clear()
+        self._times = array("q")
+        self._sorted_tokens = None
+
+    def search(self, query):
+        """Get the ids of the changes matching the query.
+
+        Args:
+            query (Union[str, ChangesQuery]): Query text or parsed query.
+
+        Returns:
+            set[int]: Ids of matching changes.
+        """
+        if not isinstance(query, ChangesQuery):
+            query = ChangesQuery.parse(query)
+
+        candidates = None
+        if query.author is not None:
+            candidates = set(self._authors.get(query.author, ()))
+
+        # Evaluate the most selective terms first:
+        term_postings = sorted(
+            (self._get_prefix_postings(term) for term in set(query.terms)),
+            key=lambda postings: sum(len(ids) for ids in postings)
+        )
+        for postings in term_postings:
+            if candidates is not None and not candidates:
+                break
+
+            matching = set()
+            for ids in postings:
+                if candidates is None:
+                    matching.update(ids)
+                else:
+                    matching.update(
+                        change_id
+                        for change_id in ids
+                        if change_id in candidates
+                    )
+            candidates = matching
+
+        if candidates is None:
+            candidates = range(len(self._times))
+
+        if query.start_time is None and query.end_time is None:
+            return set(candidates)
+
+        start_time = query.start_time
+        if start_time is None:
+            start_time = float("-inf")
+        end_time = query.end_time
+        if end_time is None:
+            end_time = float("inf")
+
+        times = self._times
+        return {
+            change_id
+            for change_id in candidates
+            if start_time <= times[change_id] <= end_time
+        }
+
+    def _get_prefix_postings(self, prefix):
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+
+        tokens = self._sorted_tokens
+        postings = []
+        idx = bisect.bisect_left(tokens, prefix)
+        while idx < len(tokens) and tokens[idx].startswith(prefix):
+            postings.append(self._postings[tokens[idx]])
+            idx += 1
+        return postings
@@ -5,6 +5,8 @@ from ayon_core.tools.utils.delegates import PrettyTimeDelegate
 
 from .model import (
     ChangesModel,
+    ChangeFilesModel,
+    ChangesFetchThread,
     CHANGE_ROLE,
     CustomSortProxyModel
 )
@@ -22,6 +24,12 @@ class ChangesDetailWidget(QtWidgets.QWidget):
         proxy.setSourceModel(model)
         proxy.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
 
+        search_input = QtWidgets.QLineEdit(self)
+        search_input.setPlaceholderText(
+            "Search changes, e.g. 'fix light author:jane after:2024-01-31'"
+        )
+        search_input.setClearButtonEnabled(True)
+
         changes_view = TreeView(self)
         changes_view.setSelectionMode(
             QtWidgets.QAbstractItemView.ExtendedSelection
@@ -40,9 +48,39 @@ class ChangesDetailWidget(QtWidgets.QWidget):
         time_delegate = PrettyTimeDelegate()
         changes_view.setItemDelegateForColumn(3, time_delegate)
 
+        files_model = ChangeFilesModel(controller=controller, parent=self)
+        files_view = TreeView(self)
+        files_view.setAlternatingRowColors(True)
+        files_view.setIndentation(0)
+        files_view.setModel(files_model)
+        files_view.setColumnWidth(0, 500)
+        files_view.setColumnWidth(1, 100)
+
+        views_splitter = QtWidgets.QSplitter(QtCore.Qt.Vertical, self)
+        views_splitter.addWidget(changes_view)
+        views_splitter.addWidget(files_view)
+        views_splitter.setStretchFactor(0, 3)
+        views_splitter.setStretchFactor(1, 1)
+
         message_label_widget = QtWidgets.QLabel(self)
 
+        sync_progress_bar = QtWidgets.QProgressBar(self)
+        sync_progress_bar.setVisible(False)
+
+        refresh_btn = QtWidgets.QPushButton("Refresh", self)
         sync_btn = QtWidgets.QPushButton("Sync to", self)
+        cancel_sync_btn = QtWidgets.QPushButton("Cancel sync", self)
+        cancel_sync_btn.setVisible(False)
+
+        sync_progress_timer = QtCore.QTimer(self)
+        sync_progress_timer.setInterval(500)
+
+        buttons_layout = QtWidgets.QHBoxLayout()
+        buttons_layout.setContentsMargins(0, 0, 0, 0)
+        buttons_layout.addStretch(1)
+        buttons_layout.addWidget(refresh_btn, 0)
+        buttons_layout.addWidget(sync_btn, 0)
+        buttons_layout.addWidget(cancel_sync_btn, 0)
 
         self._block_changes = False
         self._editable = False
@@ -50,24 +88,53 @@ class ChangesDetailWidget(QtWidgets.QWidget):
 
         layout = QtWidgets.QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(changes_view, 1)
+        layout.addWidget(search_input, 0)
+        layout.addWidget(views_splitter, 1)
         layout.addWidget(message_label_widget, 0,
                          QtCore.Qt.AlignLeft | QtCore.Qt.AlignBottom)
-        layout.addWidget(sync_btn, 0, QtCore.Qt.AlignRight)
+        layout.addWidget(sync_progress_bar, 0)
+        layout.addLayout(buttons_layout, 0)
 
+        search_input.textChanged.connect(self._on_search_changed)
+        changes_view.selectionModel().currentChanged.connect(
+            self._on_current_change_changed)
+        refresh_btn.clicked.connect(self._on_refresh_clicked)
         sync_btn.clicked.connect(self._on_sync_clicked)
+        cancel_sync_btn.clicked.connect(self._on_cancel_sync_clicked)
+        sync_progress_timer.timeout.connect(self._on_sync_progress_timer)
 
         self._model = model
         self._controller = controller
         self._changes_view = changes_view
+        self._files_model = files_model
+        self._search_input = search_input
+        self.refresh_btn = refresh_btn
         self.sync_btn = sync_btn
-        self._thread = None
+        self._cancel_sync_btn = cancel_sync_btn
+        self._sync_progress_bar = sync_progress_bar
+        self._sync_progress_timer = sync_progress_timer
+        self._sync_job_id = None
+        self._sync_change_id = None
+        # Starting a sync logs in and calls the tray, so it runs on a thread:
+        self._sync_threads = set()
         self._time_delegate = time_delegate
         self._message_label_widget = message_label_widget
 
     def reset(self):
         self._model.refresh()
 
+    def _on_current_change_changed(self, current, _previous):
+        change_id = None
+        if current.isValid():
+            change_id = current.data(CHANGE_ROLE)
+        self._files_model.set_change(change_id)
+
+    def _on_search_changed(self, text):
+        self._model.set_search_text(text)
+
+    def _on_refresh_clicked(self):
+        self._model.refresh_newer()
+
     def _on_sync_clicked(self):
         selection_model = self._changes_view.selectionModel()
         current_index = selection_model.currentIndex()
@@ -75,30 +142,123 @@ class ChangesDetailWidget(QtWidgets.QWidget):
             return
 
         change_id = current_index.data(CHANGE_ROLE)
+        self._message_label_widget.setText(
+            f"Starting sync to '{change_id}'...")
+        self._sync_change_id = change_id
+        self.sync_btn.setEnabled(False)
+        self._sync_progress_bar.setRange(0, 0)
+        self._sync_progress_bar.setVisible(True)
+
+        thread = ChangesFetchThread(change_id, self._start_sync)
+        thread.fetched.connect(self._on_sync_started)
+        thread.finished.connect(lambda: self._sync_threads.discard(thread))
+        self._sync_threads.add(thread)
+        thread.start()
+
+    def _start_sync(self, change_id):
+        # Runs on a worker thread:
+        return self._controller.start_sync_to(change_id)
+
+    def _on_sync_started(self, change_id, job_id):
+        if not job_id:
+            self._reset_sync()
+            self._message_label_widget.setText(
+                f"Sync to '{change_id}' could not be started.")
+            return
 
         self._message_label_widget.setText(f"Syncing to '{change_id}'...")
+        self._sync_job_id = job_id
+        self._cancel_sync_btn.setEnabled(True)
+        self._cancel_sync_btn.setVisible(True)
+        self._sync_progress_timer.start()
 
-        self.sync_btn.setEnabled(False)
-        thread = SyncThread(self._controller, change_id)
-        thread.finished.connect(lambda: self._on_thread_finished(change_id))
-        thread.start()
+    def _on_cancel_sync_clicked(self):
+        if self._sync_job_id:
+            self._cancel_sync_btn.setEnabled(False)
+            self._controller.cancel_sync(self._sync_job_id)
+
+    def _on_sync_progress_timer(self):
+        change_id = self._sync_change_id
+        try:
+            progress = self._controller.get_sync_progress(self._sync_job_id)
+        except Exception as error:
+            # I.e. the tray restarted or has forgotten the finished job:
+            progress = None
+            error_message = str(error)
+        else:
+            error_message = "the job is unknown"
+
+        if not progress:
+            self._reset_sync()
+            self._message_label_widget.setText(
+                f"Lost the progress of the sync to '{change_id}':"
+                f" {error_message}"
+            )
+            return
 
-        self._thread = thread
+        state = progress["state"]
+        if state in ("completed", "cancelled", "failed"):
+            self._on_sync_finished(change_id, progress)
+            return
+
+        files_total = progress["files_total"]
+        if files_total:
+            # Files can be more than the progress bar's int range:
+            self._sync_progress_bar.setRange(0, 1000)
+            self._sync_progress_bar.setValue(
+                int(1000 * progress["files_done"] / files_total))
 
-    def _on_thread_finished(self, change_id):
         self._message_label_widget.setText(
-            f"Synced to '{change_id}'. "
-            "Please close Viewer to continue."
+            f"Syncing to '{change_id}': {format_sync_progress(progress)}"
         )
+
+    def _reset_sync(self):
+        self._sync_progress_timer.stop()
+        self._sync_job_id = None
+        self._sync_progress_bar.setVisible(False)
+        self._cancel_sync_btn.setVisible(False)
         self.sync_btn.setEnabled(True)
 
+    def _on_sync_finished(self, change_id, progress):
+        self._reset_sync()
 
-class SyncThread(QtCore.QThread):
+        state = progress["state"]
+        if state == "completed":
+            message = (
+                f"Synced to '{change_id}' ({progress['files_done']} files). "
+                "Please close Viewer to continue."
+            )
+        elif state == "cancelled":
+            message = (
+                f"Sync to '{change_id}' was cancelled after"
+                f" {progress['files_done']} files."
+            )
+        else:
+            message = f"Sync to '{change_id}' failed: {progress['error']}"
+        self._message_label_widget.setText(message)
 
-    def __init__(self, controller, change_id):
-        super().__init__()
-        self._controller = controller
-        self._change_id = change_id
 
-    def run(self):
-        self._controller.sync_to(self._change_id)
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def format_sync_progress(progress):
+    """Human readable files, bytes, rate and ETA of a sync job."""
+    parts = [f"{progress['files_done']}/{progress['files_total']} files"]
+    if progress["bytes_total"]:
+        parts.append(
+            f"{format_size(progress['bytes_done'])}"
+            f"/{format_size(progress['bytes_total'])}"
+        )
+    if progress["rate"]:
+        parts.append(f"{format_size(progress['rate'])}/s")
+    eta = progress["eta"]
+    if eta is not None:
+        minutes, seconds = divmod(int(eta), 60)
+        hours, minutes = divmod(minutes, 60)
+        parts.append(f"ETA {hours}:{minutes:02}:{seconds:02}")
+    return ", ".join(parts)
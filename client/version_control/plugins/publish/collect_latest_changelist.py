@@ -34,6 +34,7 @@ class CollectLatestChangeList(pyblish.api.InstancePlugin):
         if not change_info:
             self.log.info("No changelist was found, "
                           "extraction of it not possible.")
+            return
 
         if not instance.data.get("version_control"):
             instance.data["version_control"] = {}
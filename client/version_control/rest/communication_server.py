@@ -1,17 +1,27 @@
 import os
+import sys
+import shutil
 import asyncio
 import logging
 import socket
+import tempfile
 import threading
 from contextlib import closing
 
 from aiohttp import web
 
+from version_control.backends.perforce import aapi
+from version_control.backends.perforce import jobs
 from version_control.rest.perforce.rest_api import PerforceModuleRestAPI
 
 log = logging.getLogger(__name__)
 log.setLevel(logging.DEBUG)
 
+# The webserver also listens on a Unix domain socket where they are
+# supported, which is faster than TCP for local calls and only reachable
+# by the user running the tray:
+UNIX_SOCKET_SUPPORTED = hasattr(socket, "AF_UNIX") and sys.platform != "win32"
+
 
 # class CommunicationWrapper:
 #     # TODO add logs and exceptions
@@ -42,15 +52,27 @@ log.setLevel(logging.DEBUG)
 
 
 class WebServer:
-    def __init__(self):
+    """Tray webserver of the Perforce routes.
+
+    Args:
+        port (int): Port of the TCP site.
+        tcp (bool): Listen on the TCP port.
+        unix_socket (bool | None): Listen on a Unix domain socket as well,
+            by default where Unix domain sockets are supported.
+    """
+    def __init__(self, port=64111, tcp=True, unix_socket=None):
         self.client = None
 
+        if unix_socket is None:
+            unix_socket = UNIX_SOCKET_SUPPORTED
+
         self.loop = asyncio.new_event_loop()
         self.app = web.Application(loop=self.loop)
         # self.port = self.find_free_port()
-        self.port = 64111
+        self.port = port if tcp else None
+        self.socket_path = self.get_socket_path() if unix_socket else None
         self.websocket_thread = WebServerThread(
-            self, self.port, loop=self.loop
+            self, self.port, loop=self.loop, socket_path=self.socket_path
         )
 
     @property
@@ -70,6 +92,18 @@ class WebServer:
             port = sock.getsockname()[1]
         return port
 
+    @staticmethod
+    def get_socket_path():
+        """Path of the socket, in a new directory only the user can access.
+
+        Each tray gets its own socket, so multiple trays don't collide.
+        """
+        directory = tempfile.mkdtemp(
+            prefix="ayon_version_control_",
+            dir=os.environ.get("XDG_RUNTIME_DIR") or None
+        )
+        return os.path.join(directory, "perforce.sock")
+
     def start(self):
         rest_api = PerforceModuleRestAPI(self.app.router)
         rest_api.register()
@@ -95,15 +129,17 @@ class WebServerThread(threading.Thread):
         example Harmony needs to run something on main thread), but currently
         it creates separate thread and separate asyncio event loop
     """
-    def __init__(self, module, port, loop):
+    def __init__(self, module, port, loop, socket_path=None):
         super(WebServerThread, self).__init__()
         self.is_running = False
         self.server_is_running = False
         self.port = port
+        self.socket_path = socket_path
         self.module = module
         self.loop = loop
         self.runner = None
         self.site = None
+        self.unix_site = None
         self.tasks = []
 
     def run(self):
@@ -114,11 +150,18 @@ class WebServerThread(threading.Thread):
 
             self.loop.run_until_complete(self.start_server())
 
-            webserver_url = "http://localhost:{}".format(self.port)
-            log.info(
-                f"Running Websocket server on URL:{webserver_url}"
-            )
-            os.environ["PERFORCE_WEBSERVER_URL"] = webserver_url
+            if self.site is not None:
+                webserver_url = "http://localhost:{}".format(self.port)
+                log.info(
+                    f"Running Websocket server on URL:{webserver_url}"
+                )
+                os.environ["PERFORCE_WEBSERVER_URL"] = webserver_url
+
+            if self.unix_site is not None:
+                log.info(
+                    f"Running Websocket server on socket:{self.socket_path}"
+                )
+                os.environ["PERFORCE_WEBSERVER_SOCKET"] = self.socket_path
 
             asyncio.ensure_future(self.check_shutdown(), loop=self.loop)
 
@@ -138,11 +181,27 @@ class WebServerThread(threading.Thread):
         log.info("Websocket server stopped")
 
     async def start_server(self):
-        """ Starts runner and TCPsite """
+        """ Starts runner, TCPsite and UnixSite """
         self.runner = web.AppRunner(self.module.app)
         await self.runner.setup()
-        self.site = web.TCPSite(self.runner, "localhost", self.port)
-        await self.site.start()
+        if self.port is not None:
+            self.site = web.TCPSite(self.runner, "localhost", self.port)
+            await self.site.start()
+
+        if self.socket_path is not None:
+            try:
+                self.unix_site = web.UnixSite(self.runner, self.socket_path)
+                await self.unix_site.start()
+            except OSError:
+                # The TCP site is enough to run on:
+                if self.site is None:
+                    raise
+
+                log.warning(
+                    f"Failed to listen on socket: {self.socket_path}",
+                    exc_info=True
+                )
+                self.unix_site = None
 
     def stop(self):
         """Sets is_running flag to false, 'check_shutdown' shuts server down"""
@@ -163,10 +222,18 @@ class WebServerThread(threading.Thread):
 
         log.debug("## Server shutdown started")
 
-        await self.site.stop()
+        for site in (self.site, self.unix_site):
+            if site is not None:
+                await site.stop()
         log.debug("# Site stopped")
         await self.runner.cleanup()
         log.debug("# Server runner stopped")
+        if self.socket_path is not None:
+            os.environ.pop("PERFORCE_WEBSERVER_SOCKET", None)
+            shutil.rmtree(os.path.dirname(self.socket_path), ignore_errors=True)
+        jobs.shutdown()
+        aapi.shutdown()
+        log.debug("# P4 worker pool stopped")
         tasks = [
             task for task in asyncio.all_tasks()
             if task is not asyncio.current_task()
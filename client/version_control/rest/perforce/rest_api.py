@@ -56,6 +56,34 @@ class PerforceModuleRestAPI:
             sync_to_version.dispatch
         )
 
+        start_sync_job = rest_routes.StartSyncJobEndpoint()
+        self.server_manager.add_route(
+            "POST",
+            self.prefix + "/start_sync_job",
+            start_sync_job.dispatch
+        )
+
+        get_job_progress = rest_routes.GetJobProgressEndpoint()
+        self.server_manager.add_route(
+            "POST",
+            self.prefix + "/get_job_progress",
+            get_job_progress.dispatch
+        )
+
+        get_job_results = rest_routes.GetJobResultsEndpoint()
+        self.server_manager.add_route(
+            "POST",
+            self.prefix + "/get_job_results",
+            get_job_results.dispatch
+        )
+
+        cancel_job = rest_routes.CancelJobEndpoint()
+        self.server_manager.add_route(
+            "POST",
+            self.prefix + "/cancel_job",
+            cancel_job.dispatch
+        )
+
         checkout = rest_routes.CheckoutEndpoint()
         self.server_manager.add_route(
             "POST",
@@ -77,6 +105,20 @@ class PerforceModuleRestAPI:
             get_changes.dispatch
         )
 
+        get_changes_page = rest_routes.GetChangesPage()
+        self.server_manager.add_route(
+            "POST",
+            self.prefix + "/get_changes_page",
+            get_changes_page.dispatch
+        )
+
+        get_change_files = rest_routes.GetChangeFiles()
+        self.server_manager.add_route(
+            "POST",
+            self.prefix + "/get_change_files",
+            get_change_files.dispatch
+        )
+
         get_last_change_list = rest_routes.GetLastChangelist()
         self.server_manager.add_route(
             "POST",
@@ -98,6 +140,20 @@ class PerforceModuleRestAPI:
             exists_on_server.dispatch
         )
 
+        get_folder_freshness = rest_routes.GetFolderFreshness()
+        self.server_manager.add_route(
+            "POST",
+            self.prefix + "/get_folder_freshness",
+            get_folder_freshness.dispatch
+        )
+
+        batch = rest_routes.BatchEndpoint()
+        self.server_manager.add_route(
+            "POST",
+            self.prefix + "/batch",
+            batch.dispatch
+        )
+
         get_stream = rest_routes.GetStreamEndpoint()
         self.server_manager.add_route(
             "POST",
@@ -0,0 +1,126 @@
+"""Encoding of the bridge's responses, shared by the routes and the stub.
+
+Responses are JSON by default. Clients preferring `application/msgpack`
+(`Accept` header) get msgpack instead, when `msgpack` is installed, and
+clients accepting gzip (`Accept-Encoding` header) get large responses
+compressed. JSON is written without whitespace, with `orjson` when it's
+installed:
+
+```
+content_type = negotiate_content_type(request.headers.get("Accept"))
+body = encode(data, content_type)
+data = decode(body, content_type)
+```
+"""
+import gzip
+import json
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_MSGPACK = "application/msgpack"
+
+# Smallest response compressed for clients accepting gzip, smaller ones
+# aren't worth the time it takes to compress them:
+GZIP_MIN_SIZE = 256 * 1024
+# Compression is traded for speed, responses mostly go to the same machine:
+GZIP_LEVEL = 1
+
+
+def get_content_types():
+    """Content types that can be encoded and decoded, preferred first.
+
+    JSON written by `orjson` is faster than msgpack end to end, but
+    msgpack is faster than JSON written by the standard library.
+    """
+    if msgpack is None:
+        return [CONTENT_TYPE_JSON]
+    if orjson is not None:
+        return [CONTENT_TYPE_JSON, CONTENT_TYPE_MSGPACK]
+    return [CONTENT_TYPE_MSGPACK, CONTENT_TYPE_JSON]
+
+
+def negotiate_content_type(accept):
+    """Content type of a response for the given `Accept` header.
+
+    Returns the first of the accepted types that can be encoded, falling
+    back to JSON.
+    """
+    if not accept:
+        return CONTENT_TYPE_JSON
+
+    content_types = get_content_types()
+    for accepted in accept.split(","):
+        accepted = accepted.split(";")[0].strip().lower()
+        if accepted in content_types:
+            return accepted
+    return CONTENT_TYPE_JSON
+
+
+def accepts_gzip(accept_encoding):
+    if not accept_encoding:
+        return False
+
+    return any(
+        encoding.split(";")[0].strip().lower() == "gzip"
+        for encoding in accept_encoding.split(",")
+    )
+
+
+def encode(data, content_type=CONTENT_TYPE_JSON, default=None):
+    """Encode the data as the given content type.
+
+    Args:
+        data (Any): Data to encode.
+        content_type (str): `CONTENT_TYPE_JSON` or `CONTENT_TYPE_MSGPACK`.
+        default (Union[Callable[[Any], Any], None]): Converts values that
+            can't be encoded otherwise, see `json.dumps`.
+
+    Returns:
+        bytes: The encoded data.
+    """
+    if content_type == CONTENT_TYPE_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack is not installed")
+        return msgpack.packb(data, default=default, use_bin_type=True)
+
+    if orjson is not None:
+        # Non-string keys are converted as `json.dumps` does:
+        return orjson.dumps(
+            data, default=default, option=orjson.OPT_NON_STR_KEYS)
+
+    return json.dumps(
+        data, default=default, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def decode(body, content_type=CONTENT_TYPE_JSON):
+    """Decode a body of the given content type."""
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type == CONTENT_TYPE_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack is not installed")
+        return msgpack.unpackb(body, raw=False)
+
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def compress(body, accept_encoding):
+    """Gzip the body if the client accepts it and it's large enough.
+
+    Returns:
+        tuple[bytes, Union[str, None]]: The body and its content encoding.
+    """
+    if len(body) < GZIP_MIN_SIZE or not accepts_gzip(accept_encoding):
+        return body, None
+    return gzip.compress(body, compresslevel=GZIP_LEVEL), "gzip"
@@ -1,30 +1,232 @@
 import os
+import threading
+
 import requests
 import pathlib
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from version_control.rest.perforce import rest_encoding
+from version_control.rest.perforce.rest_transport import (
+    UNIX_SOCKET_SCHEME,
+    UnixSocketAdapter,
+    is_unix_socket_supported,
+)
+
+# The shared session and the url of the webserver's Perforce routes:
+_session = None
+_session_lock = threading.Lock()
+
+
+def _to_path_arg(path):
+    # type: (pathlib.Path | str | list[pathlib.Path | str]) -> str | list[str]
+    """Convert a path, or list of paths, to send to the webserver."""
+    if isinstance(path, (list, tuple, set)):
+        return [str(_path) for _path in path]
+    return str(path)
 
 
 class PerforceRestStub:
+    """Calls the Perforce routes of the tray's webserver.
+
+    Methods taking a `path` also take a list of paths, in which case they
+    return a dict of the result of each path, keyed by the given paths.
+
+    All the calls of the process share one session, so connections to the
+    webserver are kept alive and reused rather than opened for each call.
+    The session is safe to use from multiple threads, each concurrent call
+    takes its own connection from the session's pool.
+
+    Calls go through the webserver's Unix domain socket when it published
+    one (`PERFORCE_WEBSERVER_SOCKET`), else to `PERFORCE_WEBSERVER_URL`.
+    """
+
+    # Seconds to wait to connect to the webserver and for its response,
+    # there is no response timeout by default as syncs can take hours:
+    connect_timeout = 5.0
+    read_timeout = None
+    # Retries of calls that failed to connect, or that the webserver turned
+    # away as unavailable, so weren't run; the wait between retries doubles
+    # from `backoff_factor` seconds:
+    retries = 3
+    backoff_factor = 0.2
+    # Connections kept alive, i.e. the number of threads calling at once:
+    pool_maxsize = 10
+    # Call through the webserver's Unix domain socket if it has one:
+    use_unix_socket = True
+    # Ask for responses in the fastest encoding available (see
+    # `rest_encoding.get_content_types`), and for large responses to be
+    # gzipped, which is only worth it when the webserver is remote:
+    compact_encoding = True
+    compress = False
 
     @staticmethod
-    def _wrap_call(command, **kwargs):
-        webserver_url = os.environ.get("PERFORCE_WEBSERVER_URL")
-        if not webserver_url:
-            raise RuntimeError("Uknown url for Perforce")
+    def configure(
+        connect_timeout=None,
+        read_timeout=None,
+        retries=None,
+        backoff_factor=None,
+        pool_maxsize=None,
+        use_unix_socket=None,
+        compact_encoding=None,
+        compress=None
+    ):
+        # type: (float | None, float | None, int | None, float | None, int | None, bool | None, bool | None, bool | None) -> None
+        """Change the timeouts, retries, pool size, transport or encoding
+        of the calls.
+
+        Arguments left as None keep their current value. The session is
+        recreated on the next call.
+        """
+        values = {
+            "connect_timeout": connect_timeout,
+            "read_timeout": read_timeout,
+            "retries": retries,
+            "backoff_factor": backoff_factor,
+            "pool_maxsize": pool_maxsize,
+            "use_unix_socket": use_unix_socket,
+            "compact_encoding": compact_encoding,
+            "compress": compress,
+        }
+        with _session_lock:
+            for name, value in values.items():
+                if value is not None:
+                    setattr(PerforceRestStub, name, value)
+        PerforceRestStub.close()
 
-        action_url = f"{webserver_url}/perforce/{command}"
+    @staticmethod
+    def close():
+        """Close the connections of the shared session."""
+        global _session
 
-        response = requests.post(
-            action_url, json=kwargs
+        with _session_lock:
+            session = _session
+            _session = None
+
+        if session is not None:
+            session[0].close()
+
+    @staticmethod
+    def _create_session(socket_path=None):
+        # type: (str | None) -> requests.Session
+        retry = Retry(
+            total=PerforceRestStub.retries,
+            connect=PerforceRestStub.retries,
+            # A call that may have been run by the webserver isn't retried:
+            read=0,
+            other=0,
+            status=PerforceRestStub.retries,
+            status_forcelist=(503,),
+            allowed_methods=frozenset(("POST",)),
+            backoff_factor=PerforceRestStub.backoff_factor,
+            raise_on_status=False,
+        )
+        session = requests.Session()
+        if socket_path:
+            session.mount(
+                UNIX_SOCKET_SCHEME,
+                UnixSocketAdapter(
+                    socket_path,
+                    pool_maxsize=PerforceRestStub.pool_maxsize,
+                    max_retries=retry,
+                )
+            )
+            return session
+
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=PerforceRestStub.pool_maxsize,
+            max_retries=retry,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @staticmethod
+    def _get_socket_path():
+        # type: () -> str | None
+        if not PerforceRestStub.use_unix_socket:
+            return None
+
+        socket_path = os.environ.get("PERFORCE_WEBSERVER_SOCKET")
+        if (
+            not socket_path
+            or not is_unix_socket_supported()
+            or not os.path.exists(socket_path)
+        ):
+            return None
+        return socket_path
+
+    @staticmethod
+    def _get_session():
+        # type: () -> tuple[requests.Session, str]
+        global _session
+
+        session = _session
+        if session is not None:
+            return session
+
+        with _session_lock:
+            if _session is None:
+                socket_path = PerforceRestStub._get_socket_path()
+                if socket_path:
+                    webserver_url = f"{UNIX_SOCKET_SCHEME}localhost"
+                else:
+                    webserver_url = os.environ.get("PERFORCE_WEBSERVER_URL")
+                if not webserver_url:
+                    raise RuntimeError("Uknown url for Perforce")
+
+                _session = (
+                    PerforceRestStub._create_session(socket_path),
+                    f"{webserver_url}/perforce"
+                )
+            return _session
+
+    @staticmethod
+    def _get_headers():
+        # type: () -> dict[str, str]
+        if PerforceRestStub.compact_encoding:
+            accept = ", ".join(rest_encoding.get_content_types())
+        else:
+            accept = rest_encoding.CONTENT_TYPE_JSON
+        return {
+            "Accept": accept,
+            "Accept-Encoding": (
+                "gzip" if PerforceRestStub.compress else "identity"
+            ),
+        }
+
+    @staticmethod
+    def _wrap_call(command, **kwargs):
+        session, url = PerforceRestStub._get_session()
+        response = session.post(
+            f"{url}/{command}",
+            json=kwargs,
+            headers=PerforceRestStub._get_headers(),
+            timeout=(
+                PerforceRestStub.connect_timeout,
+                PerforceRestStub.read_timeout
+            )
         )
         if not response.ok:
             print(response.content)
             raise RuntimeError(response.text)
-        return response.json()
+        return rest_encoding.decode(
+            response.content, response.headers.get("Content-Type"))
+
+    @staticmethod
+    def batch(stop_on_error=False):
+        # type: (bool) -> PerforceBatch
+        """Queue operations to send to the webserver in a single call.
+
+        See `PerforceBatch`.
+        """
+        return PerforceBatch(stop_on_error=stop_on_error)
 
     @staticmethod
     def is_in_any_workspace(path):
         response = PerforceRestStub._wrap_call(
-            "is_in_any_workspace", path=path)
+            "is_in_any_workspace", path=_to_path_arg(path))
         return response
 
     @staticmethod
@@ -41,33 +243,64 @@ class PerforceRestStub:
 
     @staticmethod
     def add(path, comment=""):
-        # type: (pathlib.Path | str, str) -> bool
+        # type: (pathlib.Path | str | list[pathlib.Path | str], str) -> bool | dict[str, bool]
         response = PerforceRestStub._wrap_call(
-            "add", path=path, comment=comment)
+            "add", path=_to_path_arg(path), comment=comment)
         return response
 
     @staticmethod
-    def sync_latest_version(path):
+    def sync_latest_version(path, parallel=None):
+        # type: (pathlib.Path | str | list[pathlib.Path | str], dict | bool | None) -> bool | dict[str, bool]
+        response = PerforceRestStub._wrap_call(
+            "sync_latest_version", path=_to_path_arg(path), parallel=parallel)
+        return response
+
+    @staticmethod
+    def sync_to_version(path, version, parallel=None):
+        # type: (pathlib.Path | str | list[pathlib.Path | str], int | list[int], dict | bool | None) -> bool | dict[str, bool]
+        response = PerforceRestStub._wrap_call(
+            "sync_to_version", path=_to_path_arg(path), version=version,
+            parallel=parallel)
+        return response
+
+    @staticmethod
+    def start_sync_job(path, version=None, parallel=None):
+        # type: (pathlib.Path | str | list[pathlib.Path | str], int | None, dict | bool | None) -> str
+        response = PerforceRestStub._wrap_call(
+            "start_sync_job", path=_to_path_arg(path), version=version,
+            parallel=parallel)
+        return response["job_id"]
+
+    @staticmethod
+    def get_job_progress(job_id):
+        # type: (str) -> dict
         response = PerforceRestStub._wrap_call(
-            "sync_latest_version", path=path)
+            "get_job_progress", job_id=job_id)
         return response
 
     @staticmethod
-    def sync_to_version(path, version):
+    def get_job_results(job_id, offset=0, limit=None):
+        # type: (str, int, int | None) -> dict
         response = PerforceRestStub._wrap_call(
-            "sync_to_version", path=path, version=version)
+            "get_job_results", job_id=job_id, offset=offset, limit=limit)
+        return response
+
+    @staticmethod
+    def cancel_job(job_id):
+        # type: (str) -> bool
+        response = PerforceRestStub._wrap_call("cancel_job", job_id=job_id)
         return response
 
     @staticmethod
     def checkout(path, comment=""):
         response = PerforceRestStub._wrap_call(
-            "checkout", path=path, comment=comment)
+            "checkout", path=_to_path_arg(path), comment=comment)
         return response
 
     @staticmethod
     def is_checkouted(path):
         response = PerforceRestStub._wrap_call(
-            "is_checkouted", path=path)
+            "is_checkouted", path=_to_path_arg(path))
         return response
 
     @staticmethod
@@ -77,9 +310,25 @@ class PerforceRestStub:
         return response
 
     @staticmethod
-    def get_changes():
-        # type: (None) -> dict
-        response = PerforceRestStub._wrap_call("get_changes")
+    def get_changes(path=None, since=None, before=None, limit=None):
+        # type: (str | None, int | None, int | None, int | None) -> list[dict] | None
+        response = PerforceRestStub._wrap_call(
+            "get_changes", path=path, since=since, before=before, limit=limit)
+        return response
+
+    @staticmethod
+    def get_changes_page(path=None, cursor=None, since=None, limit=None):
+        # type: (str | None, int | None, int | None, int | None) -> dict
+        response = PerforceRestStub._wrap_call(
+            "get_changes_page", path=path, cursor=cursor, since=since,
+            limit=limit)
+        return response
+
+    @staticmethod
+    def get_change_files(change, offset=0, limit=None):
+        # type: (int, int, int | None) -> dict | None
+        response = PerforceRestStub._wrap_call(
+            "get_change_files", change=change, offset=offset, limit=limit)
         return response
 
     @staticmethod
@@ -91,7 +340,14 @@ class PerforceRestStub:
     @staticmethod
     def exists_on_server(path):
         response = PerforceRestStub._wrap_call(
-            "exists_on_server", path=path)
+            "exists_on_server", path=_to_path_arg(path))
+        return response
+
+    @staticmethod
+    def get_folder_freshness(path):
+        # type: (pathlib.Path | str | list[pathlib.Path | str]) -> dict | None
+        response = PerforceRestStub._wrap_call(
+            "get_folder_freshness", path=_to_path_arg(path))
         return response
 
     @staticmethod
@@ -105,3 +361,119 @@ class PerforceRestStub:
         response = PerforceRestStub._wrap_call(
             "get_workspace_dir", workspace_name=workspace_name)
         return response
+
+
+class PerforceBatchResult:
+    """Result of an operation of a `PerforceBatch`, set once it has run."""
+
+    def __init__(self, command):
+        self.command = command
+        self.is_done = False
+        self.ok = False
+        self.skipped = False
+        self.error = None
+        self.value = None
+
+    def get(self):
+        """Get the result of the operation, raises if it failed."""
+        if not self.is_done:
+            raise RuntimeError(f"'{self.command}' has not been run yet")
+
+        if self.skipped:
+            raise RuntimeError(
+                f"'{self.command}' was skipped after an earlier error")
+
+        if not self.ok:
+            raise RuntimeError(self.error)
+
+        return self.value
+
+
+class PerforceBatch:
+    """Operations sent to the webserver in one call, where they are run in
+    order on one P4 connection.
+
+    Operations are queued by calling the methods of the batch, which return
+    a `PerforceBatchResult` each. The batch is run when leaving the context
+    or by calling `run`. With `stop_on_error`, the operations after the first
+    failed one are skipped.
+
+    ```
+    with PerforceRestStub.batch(stop_on_error=True) as batch:
+        exists = batch.exists_on_server(path)
+        batch.checkout(path, comment)
+    if exists.get():
+        ...
+    ```
+    """
+
+    def __init__(self, stop_on_error=False):
+        self.stop_on_error = stop_on_error
+        self._operations = []
+        self._results = []
+
+    def __len__(self):
+        return len(self._operations)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.run()
+
+    def call(self, command, **kwargs):
+        # type: (str, object) -> PerforceBatchResult
+        """Queue the operation of the `PerforceRestStub` method `command`."""
+        self._operations.append({"command": command, "kwargs": kwargs})
+        result = PerforceBatchResult(command)
+        self._results.append(result)
+        return result
+
+    def run(self):
+        # type: () -> list[PerforceBatchResult]
+        """Run the queued operations, returns their results in order."""
+        operations, results = self._operations, self._results
+        self._operations, self._results = [], []
+        if not operations:
+            return results
+
+        response = PerforceRestStub._wrap_call(
+            "batch", operations=operations, stop_on_error=self.stop_on_error)
+        for result, data in zip(results, response):
+            result.is_done = True
+            result.ok = bool(data.get("ok"))
+            result.skipped = bool(data.get("skipped"))
+            result.error = data.get("error")
+            result.value = data.get("result")
+        return results
+
+    def is_in_any_workspace(self, path):
+        return self.call("is_in_any_workspace", path=_to_path_arg(path))
+
+    def exists_on_server(self, path):
+        return self.call("exists_on_server", path=_to_path_arg(path))
+
+    def is_checkouted(self, path):
+        return self.call("is_checkouted", path=_to_path_arg(path))
+
+    def checkout(self, path, comment=""):
+        return self.call("checkout", path=_to_path_arg(path), comment=comment)
+
+    def add(self, path, comment=""):
+        return self.call("add", path=_to_path_arg(path), comment=comment)
+
+    def sync_latest_version(self, path, parallel=None):
+        return self.call(
+            "sync_latest_version", path=_to_path_arg(path), parallel=parallel)
+
+    def sync_to_version(self, path, version, parallel=None):
+        return self.call(
+            "sync_to_version", path=_to_path_arg(path), version=version,
+            parallel=parallel)
+
+    def get_folder_freshness(self, path):
+        return self.call("get_folder_freshness", path=_to_path_arg(path))
+
+    def submit_change_list(self, comment):
+        return self.call("submit_change_list", comment=comment)
@@ -0,0 +1,101 @@
+"""Transport of `PerforceRestStub` calls over the tray's Unix domain socket.
+
+`requests` only connects over TCP, so calls to urls of the `http+unix`
+scheme are sent through `UnixSocketAdapter`, which connects to the socket
+instead. The host of those urls is ignored:
+
+```
+session = requests.Session()
+session.mount(UNIX_SOCKET_SCHEME, UnixSocketAdapter(socket_path))
+session.post(f"{UNIX_SOCKET_SCHEME}localhost/perforce/get_stream", json={})
+```
+"""
+import socket
+import threading
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+UNIX_SOCKET_SCHEME = "http+unix://"
+
+
+def is_unix_socket_supported():
+    return hasattr(socket, "AF_UNIX")
+
+
+class UnixSocketConnection(HTTPConnection):
+    """HTTP connection over a Unix domain socket."""
+
+    def __init__(self, socket_path, *args, **kwargs):
+        self.socket_path = socket_path
+        super().__init__("localhost", *args, **kwargs)
+
+    def _new_conn(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as error:
+            sock.close()
+            # Raised as a connection error, so the call can be retried:
+            raise NewConnectionError(
+                self, f"Failed to connect to {self.socket_path}: {error}"
+            ) from error
+        return sock
+
+
+class UnixSocketConnectionPool(HTTPConnectionPool):
+    """Pool of keep-alive connections to a Unix domain socket."""
+
+    def __init__(self, socket_path, **kwargs):
+        super().__init__("localhost", **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self):
+        self.num_connections += 1
+        return UnixSocketConnection(
+            self.socket_path, timeout=self.timeout.connect_timeout)
+
+
+class UnixSocketAdapter(HTTPAdapter):
+    """Sends the requests of the urls it's mounted on to a Unix domain socket.
+
+    The connections are pooled like those of `HTTPAdapter`, `pool_maxsize`
+    connections are kept alive and `max_retries` is applied to each request.
+    """
+
+    def __init__(self, socket_path, pool_maxsize=10, **kwargs):
+        self.socket_path = socket_path
+        self._pool = None
+        self._pool_maxsize = pool_maxsize
+        self._pool_lock = threading.Lock()
+        super().__init__(pool_maxsize=pool_maxsize, **kwargs)
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = UnixSocketConnectionPool(
+                    self.socket_path, maxsize=self._pool_maxsize)
+            return self._pool
+
+    def get_connection_with_tls_context(
+        self, request, verify, proxies=None, cert=None
+    ):
+        return self._get_pool()
+
+    def get_connection(self, url, proxies=None):
+        # Used by `requests` older than 2.32.2:
+        return self._get_pool()
+
+    def request_url(self, request, proxies):
+        return request.path_url
+
+    def close(self):
+        super().close()
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
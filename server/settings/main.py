@@ -85,6 +85,43 @@ class PublishPluginsModel(BaseSettingsModel):
 
 
 
+class ParallelSyncModel(BaseSettingsModel):
+    """Transfer files over multiple threads when syncing.
+
+    Requires `net.parallel.max` to be set on the Perforce server.
+    """
+
+    _isGroup = True
+    enabled: bool = Field(False, title="Enabled")
+    threads: int = Field(
+        4,
+        title="Threads",
+        ge=2,
+        description="Number of threads used to transfer files"
+    )
+    batch: int = Field(
+        8,
+        title="Batch",
+        ge=1,
+        description="Number of files sent per batch"
+    )
+    batch_size: int = Field(
+        0,
+        title="Batch size (bytes)",
+        ge=0,
+        description="Number of bytes sent per batch, 0 uses the server default"
+    )
+    min_size: int = Field(
+        0,
+        title="Minimum size (bytes)",
+        ge=0,
+        description=(
+            "Minimum number of bytes a sync must transfer to run in parallel, "
+            "0 uses the server default"
+        )
+    )
+
+
 class LocalSubmodel(BaseSettingsModel):
     """Provide artist based values"""
 
@@ -125,6 +162,11 @@ class VersionControlSettings(BaseSettingsModel):
         title="Port"
     )
 
+    parallel_sync: ParallelSyncModel = Field(
+        default_factory=ParallelSyncModel,
+        title="Parallel Sync",
+    )
+
     publish: PublishPluginsModel = Field(
         default_factory=PublishPluginsModel,
         title="Publish Plugins",
@@ -0,0 +1,157 @@
+"""
+Import the addon's modules without the addon's package init, as that
+requires the rest of AYON, which isn't needed to test them.
+
+Requires `p4python` and `qtpy` (as installed in the AYON tray), the tests
+replace the server with in-process fakes.
+"""
+import contextlib
+import os
+import socket
+import sys
+import time
+import types
+
+import pytest
+
+CLIENT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "client")
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+if "version_control" not in sys.modules:
+    sys.path.insert(0, CLIENT_DIR)
+    # The changes viewer's package init imports its window, which requires AYON:
+    for name in ("version_control", "version_control.changes_viewer"):
+        package = types.ModuleType(name)
+        package.__path__ = [os.path.join(CLIENT_DIR, *name.split("."))]
+        sys.modules[name] = package
+
+
+class FakeP4:
+    """In process stand-in for a connected P4.P4 instance."""
+
+    def __init__(self, port="perforce:1666", user="user", client="workspace", root="/workspace"):
+        self.port = port
+        self.user = user
+        self.client = client
+        self.root = root
+        self.progress = None
+        self.handler = None
+        self.errors = []
+        self.warnings = []
+        self.calls = []
+        # Paths that fstat reports as `no such file(s).`:
+        self.missing_paths = set()
+        # The records output by `run`, every `record_delay` seconds:
+        self.records = []
+        self.record_delay = 0.0
+
+    def connected(self):
+        return True
+
+    @contextlib.contextmanager
+    def using_handler(self, handler):
+        previous_handler = self.handler
+        self.handler = handler
+        try:
+            yield
+        finally:
+            self.handler = previous_handler
+
+    def run(self, command, *args):
+        import P4
+
+        self.calls.append((command, args))
+        results = []
+        for record in self.records:
+            time.sleep(self.record_delay)
+            if self.handler is None:
+                results.append(dict(record))
+            elif self.handler.outputStat(dict(record)) == P4.OutputHandler.CANCEL:
+                break
+
+        return results
+
+    def run_fstat(self, args):
+        import P4
+
+        args, paths = args
+        paths = [paths] if isinstance(paths, str) else list(paths)
+        self.calls.append(("fstat", tuple(paths)))
+        self.warnings = [f"{path} - no such file(s)." for path in paths if path in self.missing_paths]
+        if self.warnings:
+            raise P4.P4Exception("no such file(s).")
+
+        return [{"depotFile": f"//{self.client}/{path}", "clientFile": path} for path in paths]
+
+    def run_sync(self, args, paths):
+        import P4
+
+        paths = [paths] if isinstance(paths, str) else list(paths)
+        self.calls.append(("sync", tuple(paths)))
+        self.warnings = [
+            f"{path} - no such file(s)." if path in self.missing_paths else f"{path} - file(s) up-to-date."
+            for path in paths
+        ]
+        raise P4.P4Exception("no such file(s).")
+
+    def run_client(self, *args):
+        self.calls.append(("client", args))
+        return [{"Client": self.client, "Root": self.root, "View": [f"//depot/... //{self.client}/..."]}]
+
+    def run_info(self):
+        return [{"clientName": self.client, "caseHandling": "insensitive"}]
+
+    def run_clients(self, *args):
+        self.calls.append(("clients", args))
+        return [{"client": self.client, "Host": socket.gethostname(), "Root": self.root, "Stream": ""}]
+
+
+class FakeConnectionPool:
+    def __init__(self, p4=None):
+        self.p4 = p4 or FakeP4()
+        self.template = self.p4
+        self.acquired = 0
+        self.released = 0
+
+    def acquire(self):
+        self.acquired += 1
+        return self.p4
+
+    def release(self, p4, discard=False):
+        self.released += 1
+        p4.progress = None
+        p4.handler = None
+
+    @contextlib.contextmanager
+    def lease(self):
+        p4 = self.acquire()
+        try:
+            yield p4
+        finally:
+            self.release(p4)
+
+    def clear(self):
+        pass
+
+
+@pytest.fixture(scope="session")
+def qt_app():
+    from qtpy import QtWidgets
+
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def api():
+    from version_control.backends.perforce import api
+    return api
+
+
+@pytest.fixture
+def fake_pool():
+    return FakeConnectionPool()
+
+
+@pytest.fixture
+def manager(api, fake_pool):
+    return api.P4ConnectionManager(connection_pool=fake_pool)
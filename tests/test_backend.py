@@ -0,0 +1,26 @@
+import pytest
+
+
+@pytest.fixture
+def backend(api, manager, monkeypatch):
+    from version_control.backends.perforce import backend
+
+    monkeypatch.setattr(api, "_get_connection_manager", lambda: manager)
+    return backend
+
+
+def test_get_changes_page_of_a_single_change(backend, fake_pool):
+    fake_pool.p4.records = [{"change": "7"}]
+
+    page = backend.VersionControlPerforce.get_changes_page(path="//streams/main/...", limit=2)
+
+    assert page == {"changes": [{"change": "7"}], "cursor": None}
+    assert fake_pool.p4.calls[-1] == ("changes", ("-s", "submitted", "-m", "3", "//streams/main/..."))
+
+
+def test_get_changes_page_cursor(backend, fake_pool):
+    fake_pool.p4.records = [{"change": str(number)} for number in (9, 8, 7)]
+
+    page = backend.VersionControlPerforce.get_changes_page(limit=2)
+
+    assert page == {"changes": [{"change": "9"}, {"change": "8"}], "cursor": 8}
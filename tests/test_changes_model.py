@@ -0,0 +1,147 @@
+import time
+
+import pytest
+from qtpy import QtCore
+
+from version_control.changes_viewer import model as changes_model
+
+
+def _make_changes(first, last):
+    return [
+        {"change": str(number), "time": str(1700000000 + number), "desc": f"Change {number}", "user": "jane"}
+        for number in range(last, first - 1, -1)
+    ]
+
+
+class FakeController:
+    def __init__(self, changes, page_size=10):
+        self.changes = changes
+        self.page_size = page_size
+        self.error = None
+
+    def login(self):
+        pass
+
+    def get_changes_page(self, cursor=None):
+        if self.error:
+            raise self.error
+
+        start = int(cursor or 0)
+        end = start + self.page_size
+        return {"changes": self.changes[start:end], "cursor": str(end) if end < len(self.changes) else None}
+
+    def get_changes(self, since=None):
+        if self.error:
+            raise self.error
+
+        return [change for change in self.changes if since is None or int(change["change"]) > since]
+
+    def get_change_files(self, change_id, offset=0, limit=None):
+        if self.error:
+            raise self.error
+
+        return {"total": 0, "files": []}
+
+
+def _wait_for(qt_app, condition, timeout=5.0):
+    end_time = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end_time:
+            raise TimeoutError("Condition not met in time")
+        qt_app.processEvents()
+        time.sleep(0.005)
+
+
+def _search(qt_app, model, text):
+    model.set_search_text(text)
+    # The search starts once the text is unchanged for the search delay:
+    _wait_for(qt_app, lambda: not model._search_timer.isActive() and not model.is_fetching())
+
+
+@pytest.fixture
+def controller():
+    return FakeController(_make_changes(1, 25))
+
+
+@pytest.fixture
+def model(qt_app, controller):
+    model = changes_model.ChangesModel(controller)
+    yield model
+    for thread in tuple(model._threads):
+        thread.wait()
+
+
+def test_pages_are_fetched(qt_app, model):
+    model.refresh()
+    _wait_for(qt_app, lambda: not model.is_fetching())
+    assert model.rowCount() == 10
+    assert model.data(model.index(0, 0)) == "25"
+    assert model.data(model.index(0, 1), changes_model.DESC_ROLE) == "Change 25"
+
+    while model.canFetchMore(QtCore.QModelIndex()):
+        model.fetchMore(QtCore.QModelIndex())
+        _wait_for(qt_app, lambda: not model.is_fetching())
+
+    assert model.rowCount() == 25
+    assert model.data(model.index(24, 0), changes_model.SORT_ROLE) == 1
+
+
+def test_failed_fetches_reset_the_fetching_state(qt_app, model, controller):
+    controller.error = RuntimeError("Server is down")
+    model.refresh()
+    _wait_for(qt_app, lambda: not model.is_fetching())
+    assert model.rowCount() == 0
+
+    _search(qt_app, model, "change")
+    assert not model._fetching_all
+
+    controller.error = None
+    _search(qt_app, model, "change")
+    assert model.rowCount() == 25
+
+
+def test_newer_changes_are_added_on_top(qt_app, model, controller):
+    model.refresh()
+    _wait_for(qt_app, lambda: not model.is_fetching())
+
+    controller.changes = _make_changes(1, 27)
+    model.refresh_newer()
+    _wait_for(qt_app, lambda: model.rowCount() == 12)
+    assert [model.data(model.index(row, 0)) for row in range(3)] == ["27", "26", "25"]
+
+
+def test_failed_change_files_page(qt_app, controller):
+    controller.error = RuntimeError("Server is down")
+    files_model = changes_model.ChangeFilesModel(controller)
+    files_model.set_change(1)
+    _wait_for(qt_app, lambda: not files_model._fetching)
+    for thread in tuple(files_model._threads):
+        thread.wait()
+
+    assert files_model.rowCount() == 0
+
+
+def test_search_is_debounced_and_in_change_order(qt_app, model, controller):
+    model.refresh()
+    _wait_for(qt_app, lambda: not model.is_fetching())
+    controller.changes = _make_changes(1, 27)
+    model.refresh_newer()
+    _wait_for(qt_app, lambda: model.rowCount() == 12)
+
+    model.set_search_text("chan")
+    model.set_search_text("change 2")
+    assert model.rowCount() == 12
+    _search(qt_app, model, "change 2")
+    # The newer, the fetched and the rest of the changes, newest first:
+    expected = [str(number) for number in range(27, 0, -1) if str(number).startswith("2")]
+    assert [model.data(model.index(row, 0)) for row in range(model.rowCount())] == expected
+
+    controller.changes = _make_changes(1, 30)
+    model.refresh_newer()
+    _wait_for(qt_app, lambda: model.rowCount() == len(expected) + 2)
+    assert [model.data(model.index(row, 0)) for row in range(3)] == ["29", "28", "27"]
+
+    _search(qt_app, model, "")
+    assert [model.data(model.index(row, 0)) for row in range(model.rowCount())] == [
+        str(number) for number in range(30, 0, -1)
+    ]
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+import pytest
+
+from version_control.changes_viewer.search import ChangesQuery
+from version_control.changes_viewer.search import ChangesSearchIndex
+
+
+def _timestamp(text):
+    return int(datetime.strptime(text, "%Y-%m-%d %H:%M").timestamp())
+
+
+@pytest.fixture
+def index():
+    index = ChangesSearchIndex()
+    index.add(0, "Fix broken lights", "jane", "jane_ws", _timestamp("2024-01-30 12:00"))
+    index.add(1, "Add lighting rig", "john", "john_ws", _timestamp("2024-01-31 12:00"))
+    index.add(2, "Fix the rig's lights", "John", "build_ws", _timestamp("2024-02-01 12:00"))
+    return index
+
+
+def test_terms_match_prefixes_of_every_term(index):
+    assert index.search("fix") == {0, 2}
+    assert index.search("li") == {0, 1, 2}
+    assert index.search("fix RIG") == {2}
+    assert index.search("missing") == set()
+
+
+def test_author_and_client(index):
+    assert index.search("author:john") == {1, 2}
+    assert index.search("user:jane lights") == {0}
+    assert index.search("build") == {2}
+
+
+def test_dates(index):
+    assert index.search("after:2024-01-31") == {1, 2}
+    # `before` includes the whole day:
+    assert index.search("before:2024-01-31") == {0, 1}
+    assert index.search("after:2024-01-31 before:2024-01-31") == {1}
+    # Invalid dates are searched as text:
+    assert ChangesQuery.parse("after:yesterday").terms == ["after", "yesterday"]
+
+
+def test_empty_query(index):
+    assert ChangesQuery.parse("").is_empty()
+    assert index.search("") == {0, 1, 2}
+
+
+def test_change_ids_must_be_consecutive(index):
+    with pytest.raises(ValueError):
+        index.add(5, "Out of order", "jane", "jane_ws", 0)
+
+    index.clear()
+    assert len(index) == 0
+    index.add(0, "Again", "jane", "jane_ws", 0)
+    assert index.search("again") == {0}
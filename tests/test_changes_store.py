@@ -0,0 +1,108 @@
+import pytest
+
+from version_control.changes_store import ChangesStore
+from version_control.changes_store import get_stream_scope
+
+SERVER = "perforce:1666"
+SCOPE = get_stream_scope("//streams/main")
+
+
+class FakeServer:
+    """Answers `fetch_changes(since, before, limit)` from changes 1 to `highest`."""
+
+    def __init__(self, highest):
+        self.highest = highest
+        self.calls = []
+
+    def __call__(self, since, before, limit):
+        self.calls.append((since, before, limit))
+        last = min(self.highest, before - 1) if before is not None else self.highest
+        first = (since or 0) + 1
+        numbers = range(last, first - 1, -1)[:limit]
+        return [{"change": str(number), "time": str(number), "user": "jane", "desc": f"Change {number}"} for number in numbers]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ChangesStore(str(tmp_path / "changes.sqlite3"))
+    yield store
+    store.close()
+
+
+def _numbers(changes):
+    return [int(change["change"]) for change in changes]
+
+
+def test_first_update_only_fetches_the_newest_page(store):
+    server = FakeServer(highest=25)
+
+    assert store.update(SERVER, SCOPE, server, page_size=10) == 10
+    assert server.calls == [(None, None, 10)]
+    assert store.get_highest_change(SERVER, SCOPE) == 25
+    assert store.get_lowest_change(SERVER, SCOPE) == 16
+    assert not store.is_complete(SERVER, SCOPE)
+
+
+def test_read_changes_fills_older_pages(store):
+    server = FakeServer(highest=25)
+    store.update(SERVER, SCOPE, server, page_size=10)
+
+    changes = store.read_changes(SERVER, SCOPE, server, before=16, limit=5, page_size=10)
+    assert _numbers(changes) == [15, 14, 13, 12, 11]
+    assert server.calls[-1] == (None, 16, 10)
+
+    changes = store.read_changes(SERVER, SCOPE, server, page_size=10)
+    assert _numbers(changes) == list(range(25, 0, -1))
+    assert store.is_complete(SERVER, SCOPE)
+
+    # The complete scope is read without fetching:
+    call_count = len(server.calls)
+    store.read_changes(SERVER, SCOPE, server, before=3, page_size=10)
+    assert len(server.calls) == call_count
+
+
+def test_update_fetches_the_newer_changes_in_pages(store):
+    server = FakeServer(highest=5)
+    store.read_changes(SERVER, SCOPE, server, page_size=10)
+
+    server.highest = 30
+    server.calls.clear()
+    assert store.update(SERVER, SCOPE, server, page_size=10) == 25
+    assert server.calls == [(5, None, 10), (5, 21, 10), (5, 11, 10)]
+    assert store.get_highest_change(SERVER, SCOPE) == 30
+    assert _numbers(store.get_changes(SERVER, SCOPE)) == list(range(30, 0, -1))
+    assert store.is_complete(SERVER, SCOPE)
+
+
+def test_scopes_are_kept_apart(store):
+    store.update(SERVER, SCOPE, FakeServer(highest=3))
+
+    assert store.get_highest_change(SERVER, "") is None
+    assert store.get_highest_change("other:1666", SCOPE) is None
+    assert store.get_latest_change(SERVER, SCOPE)["change"] == "3"
+
+    store.clear(SERVER, SCOPE)
+    assert store.get_highest_change(SERVER, SCOPE) is None
+    assert store.get_changes(SERVER, SCOPE) == []
+
+
+
+def test_failed_fetches_leave_the_scope_as_is(store):
+    server = FakeServer(highest=25)
+    store.update(SERVER, SCOPE, server, page_size=10)
+
+    def _failed_fetch(since, before, limit):
+        return None
+
+    with pytest.raises(RuntimeError):
+        store.fill_older(SERVER, SCOPE, _failed_fetch, page_size=10)
+
+    with pytest.raises(RuntimeError):
+        store.update(SERVER, SCOPE, _failed_fetch, page_size=10)
+
+    assert not store.is_complete(SERVER, SCOPE)
+    assert store.get_lowest_change(SERVER, SCOPE) == 16
+    assert store.get_highest_change(SERVER, SCOPE) == 25
+
+    # The next read fills the scope once the server answers again:
+    assert _numbers(store.read_changes(SERVER, SCOPE, server, page_size=10)) == list(range(25, 0, -1))
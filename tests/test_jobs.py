@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from version_control.backends.perforce import jobs
+from version_control.backends.perforce.api import p4_progress
+
+
+def _wait_for(condition, timeout=5.0):
+    end_time = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end_time:
+            raise TimeoutError("Condition not met in time")
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def job_manager(api, manager, monkeypatch):
+    # Only Windows paths are valid local paths:
+    monkeypatch.setattr(manager, "_get_clean_p4_paths", tuple)
+    monkeypatch.setattr(api, "_get_connection_manager", lambda: manager)
+    return manager
+
+
+def test_cancelling_a_running_job_cancels_the_sync(job_manager, fake_pool):
+    p4 = fake_pool.p4
+    p4.records = [{"depotFile": f"//depot/{index}.txt", "fileSize": "10"} for index in range(10000)]
+    p4.record_delay = 0.001
+
+    job = jobs.P4SyncJob("//depot/...")
+    job.start()
+    _wait_for(lambda: job.get_progress()["files_done"] >= 3)
+    assert job.state == "running"
+
+    assert job.cancel()
+    _wait_for(lambda: job.is_finished, timeout=1.0)
+
+    progress = job.get_progress()
+    assert progress["state"] == "cancelled"
+    assert progress["files_done"] < len(p4.records)
+    assert fake_pool.acquired == fake_pool.released
+    assert not job.cancel()
+
+
+def test_finished_job_is_completed(job_manager, fake_pool):
+    fake_pool.p4.records = [{"depotFile": "//depot/a.txt", "clientFile": "/work/a.txt", "rev": "2", "fileSize": "5"}]
+
+    job = jobs.P4SyncJob("//depot/...", version=10)
+    job.start()
+    _wait_for(lambda: job.is_finished)
+
+    assert job.state == "completed"
+    assert fake_pool.p4.calls[-1] == ("sync", ([], ["//depot/...@10"]))
+    assert job.get_results()["results"] == [
+        {"depotFile": "//depot/a.txt", "clientFile": "/work/a.txt", "rev": "2", "action": "", "fileSize": "5"}
+    ]
+
+
+def test_get_progress():
+    job = jobs.P4SyncJob("//depot/...")
+    job.state = "running"
+    job._started_time = time.monotonic() - 2.0
+    job._add_record({"depotFile": "//depot/a.txt", "totalFileCount": "4", "totalFileSize": "400", "fileSize": "100"})
+    job._add_record({"depotFile": "//depot/b.txt", "fileSize": "100"})
+
+    progress = job.get_progress()
+    assert (progress["files_done"], progress["files_total"]) == (2, 4)
+    assert (progress["bytes_done"], progress["bytes_total"]) == (200, 400)
+    assert progress["current_file"] == "//depot/b.txt"
+    assert progress["rate"] == pytest.approx(100, rel=0.1)
+    assert progress["eta"] == pytest.approx(2.0, rel=0.1)
+    assert progress["progress"] is None
+
+    # The command's progress can be ahead of the received records:
+    job._on_progress_snapshot(p4_progress.P4ProgressSnapshot(units=p4_progress.UNITS_FILES, position=3))
+    progress = job.get_progress()
+    assert progress["files_done"] == 3
+    assert progress["progress"]["position"] == 3
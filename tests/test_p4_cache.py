@@ -0,0 +1,74 @@
+import pytest
+
+from version_control.backends.perforce.api import p4_cache
+
+
+SERVER = ("perforce:1666", "workspace")
+
+
+@pytest.fixture
+def cache():
+    return p4_cache.P4StatCache(max_size=3, ttl=60)
+
+
+def test_get_returns_set_records(cache):
+    cache.set("C:\\Work\\File.txt", ["-Ol"], {"depotFile": "//depot/File.txt"}, SERVER)
+
+    assert cache.get("c:/work/file.txt", ["-Ol"], SERVER) == {"depotFile": "//depot/File.txt"}
+    assert cache.get("c:/work/file.txt", [], SERVER) is None
+    assert cache.info()[:2] == (1, 1)
+
+
+def test_records_are_kept_per_server_and_client(cache):
+    cache.set("/work/file.txt", [], {"depotFile": "//depot/file.txt"}, SERVER)
+
+    assert cache.get("/work/file.txt", [], ("other:1666", "workspace")) is None
+    assert cache.get("/work/file.txt", [], ("perforce:1666", "other_workspace")) is None
+    assert cache.get("/work/file.txt", [], SERVER) is not None
+
+
+def test_invalidate_by_depot_path_and_folder(cache):
+    cache.set("/work/a.txt", [], {"depotFile": "//depot/a.txt"}, SERVER)
+    cache.set("/work/sub/b.txt", [], {"depotFile": "//depot/sub/b.txt"}, SERVER)
+
+    cache.invalidate("//depot/a.txt")
+    assert cache.get("/work/a.txt", [], SERVER) is None
+
+    cache.invalidate("/work/sub/...")
+    assert cache.get("/work/sub/b.txt", [], SERVER) is None
+    assert cache.info().size == 0
+
+
+def test_least_recently_used_records_are_evicted(cache):
+    for name in ("a", "b", "c"):
+        cache.set(f"/work/{name}", [], {}, SERVER)
+
+    cache.get("/work/a", [], SERVER)
+    cache.set("/work/d", [], {}, SERVER)
+
+    assert cache.get("/work/b", [], SERVER) is None
+    assert cache.get("/work/a", [], SERVER) == {}
+
+
+def test_expired_records_are_missed(cache):
+    cache.ttl = 0.0
+    cache.set("/work/a", [], {}, SERVER)
+    assert cache.get("/work/a", [], SERVER) is None
+
+
+def test_uncacheable_paths():
+    assert p4_cache.P4StatCache.is_cacheable("/work/file.txt")
+    assert not p4_cache.P4StatCache.is_cacheable("/work/...")
+    assert not p4_cache.P4StatCache.is_cacheable("/work/file.txt#2")
+
+
+def test_get_stat_is_not_served_across_workspaces(api, fake_pool):
+    manager = api.P4ConnectionManager(connection_pool=fake_pool, stat_cache=p4_cache.P4StatCache())
+    with manager.__connect__():
+        first = manager._connect_get_stat("/work/file.txt")
+        assert manager._connect_get_stat("/work/file.txt") == first
+
+        fake_pool.p4.client = "other_workspace"
+        assert manager._connect_get_stat("/work/file.txt") != first
+
+    assert [call for call in fake_pool.p4.calls if call[0] == "fstat"] == [("fstat", ("/work/file.txt",))] * 2
@@ -0,0 +1,59 @@
+import pytest
+
+from version_control.backends.perforce.api import p4_client_view
+from version_control.backends.perforce.api.p4_client_view import AMBIGUOUS
+from version_control.backends.perforce.api.p4_client_view import P4ClientViewMap
+
+
+@pytest.fixture
+def view_map():
+    return P4ClientViewMap(
+        "ws",
+        "C:\\ws",
+        [
+            "//depot/... //ws/...",
+            "-//depot/tmp/... //ws/tmp/...",
+            '"//depot/100%25 done/..." "//ws/done/..."',
+        ],
+    )
+
+
+def test_local_and_depot_paths(view_map):
+    assert view_map.where("C:\\ws\\tex\\icon.png") == {
+        "depotFile": "//depot/tex/icon.png",
+        "clientFile": "//ws/tex/icon.png",
+        "path": "C:\\ws\\tex\\icon.png",
+    }
+    assert view_map.where("//depot/tex/...")["path"] == "C:\\ws\\tex\\..."
+    assert view_map.where("C:\\ws\\tmp\\file.txt") is None
+
+
+def test_local_paths_are_escaped(view_map):
+    result = view_map.where("C:\\ws\\tex\\icon@2x #1 100%*.png")
+
+    assert result["depotFile"] == "//depot/tex/icon%402x %231 100%25%2A.png"
+    assert result["clientFile"] == "//ws/tex/icon%402x %231 100%25%2A.png"
+    assert result["path"] == "C:\\ws\\tex\\icon@2x #1 100%*.png"
+
+
+def test_depot_paths_are_unescaped(view_map):
+    result = view_map.where("//depot/tex/icon%402x.png")
+
+    assert result["depotFile"] == "//depot/tex/icon%402x.png"
+    assert result["path"] == "C:\\ws\\tex\\icon@2x.png"
+
+
+def test_escaped_view_lines(view_map):
+    assert view_map.where("C:\\ws\\done\\file.txt")["depotFile"] == "//depot/100%25 done/file.txt"
+    assert view_map.where("//depot/100%25 done/file.txt")["path"] == "C:\\ws\\done\\file.txt"
+
+
+def test_depot_revisions_and_wildcards_are_left_to_the_server(view_map):
+    assert view_map.where("//depot/tex/icon.png@2") is AMBIGUOUS
+    assert view_map.where("//depot/tex/icon.png#head") is AMBIGUOUS
+    assert view_map.where("//depot/tex/*.png") is AMBIGUOUS
+
+
+@pytest.mark.parametrize("name", ["plain.txt", "a@b#c%d*e.txt", "%40.txt", "100%.txt"])
+def test_escape_round_trip(name):
+    assert p4_client_view.unescape(p4_client_view.escape(name)) == name
@@ -0,0 +1,74 @@
+import pytest
+
+
+def test_clients_are_listed_once_across_leases(manager, fake_pool):
+    for _ in range(5):
+        with manager.__connect__():
+            assert "workspace" in manager._clients_cache
+
+    assert fake_pool.acquired == fake_pool.released == 5
+    assert [call for call in fake_pool.p4.calls if call[0] == "clients"] == [("clients", ("--me",))]
+
+
+def test_clients_are_listed_again_after_ttl_or_server_change(manager, fake_pool):
+    with manager.__connect__():
+        manager._clients_cache
+
+    fake_pool.p4.port = "other:1666"
+    with manager.__connect__():
+        manager._clients_cache
+
+    manager.clients_cache_ttl = 0
+    with manager.__connect__():
+        manager._clients_cache
+
+    assert len(fake_pool.p4.calls) == 3
+
+
+def test_clear_clients_cache(manager, fake_pool):
+    with manager.__connect__():
+        manager._clients_cache
+        manager.clear_clients_cache()
+        manager._clients_cache
+
+    assert len(fake_pool.p4.calls) == 2
+
+
+def test_get_changes_file_spec_is_passed_as_is(manager, fake_pool):
+    fake_pool.p4.records = [{"change": "9"}, {"change": "8"}]
+
+    changes = manager.get_changes(file_spec="//streams/main/...", since=3, before=10, limit=5)
+
+    assert changes == [{"change": "9"}, {"change": "8"}]
+    assert fake_pool.p4.calls[-1] == (
+        "changes", ("-s", "submitted", "-m", "5", "-e", "4", "//streams/main/...@1,@9")
+    )
+
+
+def _run_routed(manager, function, paths, routes):
+    with manager.__connect__():
+        manager.__run_function_routed__(function, paths, routes, False, (paths,), {})
+
+    return manager.result
+
+
+def test_routed_results_are_merged_in_path_order(manager, monkeypatch):
+    monkeypatch.setattr(manager, "_are_paths_valid", lambda paths, workspace: True)
+
+    def _connect_echo(path):
+        return [f"{manager.p4.client}:{_path}" for _path in path]
+
+    result = _run_routed(manager, _connect_echo, ("a", "b", "c"), {"ws_1": [0, 2], "ws_2": [1]})
+
+    assert result == ["ws_1:a", "ws_2:b", "ws_1:c"]
+    assert manager._run_successfully
+
+
+def test_routed_results_that_cant_be_mapped_raise(api, manager, monkeypatch):
+    monkeypatch.setattr(manager, "_are_paths_valid", lambda paths, workspace: True)
+
+    def _connect_merged(path):
+        return ["merged"]
+
+    with pytest.raises(api.p4_errors.P4ResultMappingError):
+        _run_routed(manager, _connect_merged, ("a", "b", "c"), {"ws_1": [0, 2], "ws_2": [1]})
@@ -0,0 +1,84 @@
+import pytest
+
+NO_SUCH_FILE = " - no such file(s)."
+
+
+@pytest.fixture
+def merge(api):
+    return api.P4ConnectionManager._merge_missing_results
+
+
+@pytest.mark.parametrize(
+    ("result", "missing_indices", "expected"),
+    [
+        (["a", "c"], [1], ["a", None, "c"]),
+        (["b", "c"], [0], [None, "b", "c"]),
+        (["a", "b"], [2], ["a", "b", None]),
+        (["a", "d"], [1, 2], ["a", None, None, "d"]),
+        (["b", "d"], [0, 2, 4], [None, "b", None, "d", None]),
+        ([], [0, 1], [None, None]),
+        (["a", "b"], [], ["a", "b"]),
+    ],
+)
+def test_merge_missing_results(merge, result, missing_indices, expected):
+    assert merge(result, missing_indices, None) == expected
+
+
+def test_merge_missing_results_matches_inserts(merge):
+    result = list(range(100))
+    missing_indices = [0, 1, 10, 50, 51, 52, 120, 129]
+    expected = list(result)
+    for index in missing_indices:
+        expected.insert(index, -1)
+
+    assert merge(result, missing_indices, -1) == expected
+
+
+def test_get_paths_from_warnings(api):
+    warnings = [
+        f"//depot/a.txt{NO_SUCH_FILE}",
+        f"//depot/a.txt{NO_SUCH_FILE}",
+        "//depot/b.txt - file(s) up-to-date.",
+        f"C:/work/c.txt{NO_SUCH_FILE}",
+    ]
+
+    paths = api.P4ConnectionManager._get_paths_from_warnings(warnings, NO_SUCH_FILE)
+
+    assert paths == {"//depot/a.txt", "C:/work/c.txt"}
+
+
+def test_fstat_of_missing_paths(manager, fake_pool):
+    p4 = fake_pool.p4
+    # Includes a duplicated missing path and a warning for a path that wasn't asked for:
+    p4.missing_paths = {"//depot/b.txt", "//depot/d.txt", "//depot/unrequested.txt"}
+    paths = ("//depot/a.txt", "//depot/b.txt", "//depot/c.txt", "//depot/b.txt", "//depot/d.txt")
+
+    with manager.__connect__():
+        stat = manager._run_fstat(paths, [])
+
+    assert [data.get("clientFile") for data in stat] == ["//depot/a.txt", None, "//depot/c.txt", None, None]
+    assert p4.calls[-1] == ("fstat", ("//depot/a.txt", "//depot/c.txt"))
+
+
+def test_fstat_of_only_missing_paths(manager, fake_pool):
+    fake_pool.p4.missing_paths = {"//depot/a.txt", "//depot/b.txt"}
+
+    with manager.__connect__():
+        stat = manager._run_fstat(("//depot/a.txt", "//depot/b.txt"), [])
+
+    assert stat == [{}, {}]
+
+
+def test_results_of_many_paths_are_remapped(manager, fake_pool):
+    p4 = fake_pool.p4
+    paths = tuple(f"//depot/file_{index}.ma" for index in range(20000))
+    p4.missing_paths = set(paths[::2])
+
+    with manager.__connect__():
+        stat = manager._connect_get_stat(paths)
+        latest = manager._connect_get_latest(paths)
+
+    assert stat == [
+        {} if path in p4.missing_paths else {"depotFile": f"//workspace/{path}", "clientFile": path} for path in paths
+    ]
+    assert latest == [None if path in p4.missing_paths else True for path in paths]
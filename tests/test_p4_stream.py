@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from version_control.backends.perforce.api import p4_errors
+from version_control.backends.perforce.api import p4_stream
+
+
+def _make_records(count):
+    return [{"depotFile": f"//depot/{index}.txt"} for index in range(count)]
+
+
+def test_stream_yields_filtered_records(fake_pool):
+    p4 = fake_pool.p4
+    p4.records = _make_records(10)
+
+    stream = p4_stream.P4RecordStream(
+        p4, "fstat", ([], ["//depot/..."]), record_filter=lambda record: record["depotFile"] < "//depot/5"
+    )
+
+    assert [record["depotFile"] for record in stream] == [f"//depot/{index}.txt" for index in range(5)]
+    assert stream.record_count == 10
+    assert p4.handler is None
+
+
+def test_stream_is_cancelled_by_cancel_event(fake_pool):
+    p4 = fake_pool.p4
+    p4.records = _make_records(1000)
+    event = threading.Event()
+
+    stream = p4_stream.P4RecordStream(p4, "fstat", ([], ["//depot/..."]), cancel_event=event)
+    records = []
+    for record in stream:
+        records.append(record)
+        if len(records) == 3:
+            event.set()
+
+    assert stream.is_cancelled
+    assert stream.record_count < 1000
+
+
+def test_streamed_commands_are_cancelled_by_cancellable(manager, fake_pool, monkeypatch):
+    # Only Windows paths are valid local paths:
+    monkeypatch.setattr(manager, "_get_clean_p4_paths", tuple)
+    p4 = fake_pool.p4
+    p4.records = _make_records(1000)
+    p4.record_delay = 0.001
+    event = threading.Event()
+
+    def _cancel_after_records(record):
+        if record["depotFile"] == "//depot/10.txt":
+            # The event is set from the command's thread, as it would be from the caller's:
+            event.set()
+        return False
+
+    with pytest.raises(p4_errors.P4CancelledError):
+        with manager.cancellable(event):
+            records = manager._iter_records(
+                "sync", "//depot/...", record_filter=_cancel_after_records, workspace_override="workspace"
+            )
+            assert list(records) == []
+
+    assert fake_pool.acquired == fake_pool.released
+    assert p4.calls[-1][0] == "sync"
+    assert p4.handler is None
+
+
+def test_newest_file_stops_at_the_first_matching_record(manager, fake_pool):
+    p4 = fake_pool.p4
+    # Newest first, as requested by `fstat -Sd -r`:
+    records = [
+        {"clientFile": "/workspace/folder/sub/newest.txt", "headTime": "400"},
+        {"clientFile": "/workspace/folder/newer.txt", "headTime": "300"},
+        {"clientFile": "/workspace/folder/new.ma", "headTime": "200"},
+        {"clientFile": "/workspace/folder/old.ma", "headTime": "100"},
+    ] + [{"clientFile": f"/workspace/folder/{index}.ma", "headTime": "0"} for index in range(1000)]
+    output = []
+
+    def _output_records():
+        for record in records:
+            output.append(record)
+            yield record
+
+    p4.records = _output_records()
+
+    with manager.__connect__():
+        newest = manager._connect_get_newest_file_in_folder(["//depot/folder/..."], extensions=["ma"])
+
+    assert newest.path.as_posix() == "/workspace/folder/new.ma"
+    command, (fstat_args, path) = p4.calls[-1]
+    assert (command, path) == ("fstat", "//depot/folder/...")
+    assert {"-Sd", "-r"} <= set(fstat_args)
+    # The command was cancelled rather than output the whole folder:
+    assert len(output) < len(records)
+    assert p4.handler is None
@@ -0,0 +1,45 @@
+import pytest
+
+from version_control.backends.perforce.api.p4_workspace_index import P4WorkspaceRootIndex
+
+
+@pytest.fixture
+def index():
+    index = P4WorkspaceRootIndex()
+    index.build(
+        {
+            "ws": ["C:/Work", "//streams/main"],
+            "ws_nested": ["C:\\Work\\Nested"],
+            "ws_2": ["C:/Work2", "//streams/main"],
+        },
+        signature=1,
+    )
+    return index
+
+
+def test_deepest_root_first(index):
+    assert index.get_workspace("c:/work/nested/file.txt") == "ws_nested"
+    assert index.get_workspaces("C:/Work/Nested/file.txt") == ("ws_nested", "ws")
+    assert index.get_workspace("C:/Work/file.txt") == "ws"
+
+
+def test_roots_are_matched_by_component(index):
+    assert index.get_workspace("C:/Work2/file.txt") == "ws_2"
+    assert index.get_workspace("C:/Workshop/file.txt") is None
+    assert not index.is_under_any_workspace("D:/Work/file.txt")
+
+
+def test_depot_roots(index):
+    assert index.get_workspaces("//streams/main/...") == ("ws", "ws_2")
+    assert index.is_under_workspace("//streams/main/file.txt", "ws_2")
+    assert not index.is_under_workspace("//streams/dev/file.txt", "ws")
+
+
+def test_signature_and_clear(index):
+    assert index.is_current(1)
+    assert not index.is_current(2)
+    assert index.workspaces == ("ws", "ws_nested", "ws_2")
+
+    index.clear()
+    assert not index.is_current(1)
+    assert index.get_workspace("C:/Work/file.txt") is None
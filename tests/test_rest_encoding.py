@@ -0,0 +1,67 @@
+import gzip
+
+import pytest
+
+from version_control.rest.perforce import rest_encoding
+
+DATA = {"changes": [{"change": "1", "desc": "Fix \u00e9"}], "count": 1, 3: None}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_module(request, monkeypatch):
+    if request.param == "orjson":
+        if rest_encoding.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(rest_encoding, "orjson", None)
+    return request.param
+
+
+def test_json_round_trip(json_module):
+    body = rest_encoding.encode(DATA)
+
+    assert b", " not in body and b": " not in body
+    # Non-string keys are converted as `json.dumps` does:
+    assert rest_encoding.decode(body) == {"changes": DATA["changes"], "count": 1, "3": None}
+    assert rest_encoding.decode(body, "application/json; charset=utf-8")["count"] == 1
+
+
+def test_encode_default(json_module):
+    body = rest_encoding.encode({"value": {1, 2}}, default=sorted)
+    assert rest_encoding.decode(body) == {"value": [1, 2]}
+
+
+def test_negotiate_content_type(monkeypatch):
+    assert rest_encoding.negotiate_content_type(None) == rest_encoding.CONTENT_TYPE_JSON
+    assert rest_encoding.negotiate_content_type("text/html, */*") == rest_encoding.CONTENT_TYPE_JSON
+
+    monkeypatch.setattr(rest_encoding, "get_content_types", lambda: ["application/msgpack", "application/json"])
+    assert rest_encoding.negotiate_content_type("Application/MsgPack;q=1.0, application/json") == "application/msgpack"
+
+
+def test_msgpack_round_trip():
+    if rest_encoding.msgpack is None:
+        with pytest.raises(ValueError):
+            rest_encoding.encode(DATA, rest_encoding.CONTENT_TYPE_MSGPACK)
+        return
+
+    body = rest_encoding.encode(DATA, rest_encoding.CONTENT_TYPE_MSGPACK)
+    assert rest_encoding.decode(body, rest_encoding.CONTENT_TYPE_MSGPACK) == DATA
+
+
+def test_accepts_gzip():
+    assert rest_encoding.accepts_gzip("deflate, GZip;q=0.5")
+    assert not rest_encoding.accepts_gzip("deflate, br")
+    assert not rest_encoding.accepts_gzip(None)
+
+
+def test_only_large_bodies_are_compressed():
+    small = b"x" * 10
+    assert rest_encoding.compress(small, "gzip") == (small, None)
+
+    large = b"x" * rest_encoding.GZIP_MIN_SIZE
+    assert rest_encoding.compress(large, "br") == (large, None)
+
+    body, encoding = rest_encoding.compress(large, "gzip, br")
+    assert encoding == "gzip"
+    assert gzip.decompress(body) == large